@@ -0,0 +1,55 @@
+"""
+Throughput and peak memory of exporting a stream of `get_nft_marketplace_analytics` responses with
+`theblockchainapi.export`, per format. The peak stays bounded by `chunk_size` however many rows are exported. The
+Arrow buffers of a chunk are allocated by Arrow's memory pool, which `tracemalloc` does not see.
+
+The Arrow and Parquet formats are skipped if `pyarrow` is not installed.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_export
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import fixtures
+from theblockchainapi import export
+
+
+def _run(responses: list, repeat: int, path: str, measure_memory: bool):
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        # The same responses are exported again and again, so that only the export is measured.
+        rows = export.export_responses(
+            (response for _ in range(repeat) for response in responses), path, export.MARKETPLACE_TRANSACTIONS,
+            chunk_size=10000
+        )
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if measure_memory else None
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    return rows, elapsed, peak
+
+
+def main():
+    responses = [fixtures.marketplace_analytics(mints=100, transactions_per_mint=20, seed=seed) for seed in range(5)]
+    repeat = 50
+    formats = ['ndjson'] if export.pyarrow is None else ['ndjson', 'parquet', 'arrow']
+    with tempfile.TemporaryDirectory() as directory:
+        for format in formats:
+            path = os.path.join(directory, f"analytics.{format}")
+            rows, elapsed, _ = _run(responses, repeat, path, measure_memory=False)
+            _, _, peak = _run(responses, repeat, path, measure_memory=True)
+            print(
+                f"{format:>8}: {rows} rows in {elapsed:.2f}s ({rows / elapsed:9.0f} rows/s), "
+                f"peak Python heap {peak / 2 ** 20:5.1f} MiB, file {os.path.getsize(path) / 2 ** 20:6.1f} MiB"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Memory held by decoded responses as plain dicts versus as `theblockchainapi.models`.
+
+Each response is decoded from its JSON body, as it would be off the wire, so that no string is shared with the
+fixtures.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_models
+"""
+import gc
+import json
+import random
+import tracemalloc
+
+from benchmarks import fixtures
+from theblockchainapi.models import NFTMetadata, TokenHolding, Transaction
+
+
+def _measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0] - start
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+def main():
+    cases = {
+        'NFTMetadata': (NFTMetadata, fixtures.candy_machine_nfts()['minted_nfts']),
+        'Transaction': (Transaction, fixtures.solana_transactions()),
+        'TokenHolding': (TokenHolding, fixtures.token_holdings())
+    }
+    for name, (model, responses) in cases.items():
+        bodies = [json.dumps(response).encode() for response in responses]
+        dicts = _measure(lambda: [json.loads(body) for body in bodies])
+        models = _measure(lambda: [model.from_dict(json.loads(body)) for body in bodies])
+
+        body = random.choice(bodies)
+        if model.from_dict(json.loads(body)).to_dict() != json.loads(body):
+            raise Exception(f"`{name}` does not give back the response it was built from.")
+
+        count = len(bodies)
+        print(
+            f"{name:>12} x {count}: dicts {dicts / count:8.0f} B/item, models {models / count:8.0f} B/item "
+            f"({dicts / models:.1f}x smaller)"
+        )
+
+
+if __name__ == '__main__':
+    main()
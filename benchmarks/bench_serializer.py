@@ -0,0 +1,40 @@
+"""
+Encode/decode time of every installed `Serializer` on large, representative response bodies.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_serializer [repeats]
+"""
+import json
+import sys
+import time
+
+from benchmarks import fixtures
+from theblockchainapi.serializer import get_available_serializers
+
+
+def _best_of(func, repeats: int) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(repeats: int = 5):
+    serializers = get_available_serializers()
+    for name, make in fixtures.ALL.items():
+        response = make()
+        body = json.dumps(response).encode()
+        print(f"{name} ({len(body) / 1e6:.1f} MB)")
+        for serializer in serializers:
+            if serializer.loads(body) != response:
+                raise Exception(f"`{serializer.name}` does not decode like `json`.")
+            loads = _best_of(lambda: serializer.loads(body), repeats)
+            dumps = _best_of(lambda: serializer.dumps(response), repeats)
+            print(f"  {serializer.name:>8}: loads {loads:8.2f} ms, dumps {dumps:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
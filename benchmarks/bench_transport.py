@@ -0,0 +1,52 @@
+"""
+Per-call latency of `SolanaAPIResource.get_balance` with and without a pooled `HTTPTransport`.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_transport [calls]
+"""
+import statistics
+import sys
+import time
+
+import requests
+
+from benchmarks.stub_server import StubServer
+from theblockchainapi import SolanaAPIResource, HTTPTransport
+
+
+class _UnpooledTransport(HTTPTransport):
+    """
+    Reproduces the old behaviour: a fresh connection for every call.
+    """
+
+    def request(self, **kwargs):
+        return requests.request(**kwargs)
+
+
+def _run(resource: SolanaAPIResource, calls: int) -> list:
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        resource.get_balance('11111111111111111111111111111111')
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main(calls: int = 2000):
+    with StubServer() as server:
+        for name, transport in (('unpooled', _UnpooledTransport()), ('pooled', HTTPTransport())):
+            with transport:
+                resource = SolanaAPIResource('key_id', 'secret_key', transport=transport)
+                resource._url = server.url
+                _run(resource, 50)
+                latencies = _run(resource, calls)
+            print(
+                f"{name:>9}: mean {statistics.mean(latencies):.3f} ms, "
+                f"p50 {statistics.median(latencies):.3f} ms, "
+                f"p99 {statistics.quantiles(latencies, n=100)[98]:.3f} ms"
+            )
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,154 @@
+"""
+Deterministic, representative response bodies for the benchmarks, shaped like the API's largest responses.
+"""
+import random
+import string
+
+_B58 = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+
+
+def _address(rng: random.Random) -> str:
+    return ''.join(rng.choice(_B58) for _ in range(44))
+
+
+def _signature(rng: random.Random) -> str:
+    return ''.join(rng.choice(_B58) for _ in range(88))
+
+
+def nft_metadata(rng: random.Random, mint: str = None) -> dict:
+    name = ''.join(rng.choice(string.ascii_letters) for _ in range(12))
+    creators = [_address(rng) for _ in range(rng.randint(1, 4))]
+    return {
+        'data': {
+            'name': f"{name} #{rng.randint(1, 10000)}",
+            'symbol': name[:4].upper(),
+            'uri': f"https://arweave.net/{_address(rng)}",
+            'seller_fee_basis_points': rng.choice([0, 250, 500, 750]),
+            'creators': creators,
+            'share': [100 // len(creators)] * len(creators),
+            'verified': [rng.randint(0, 1) for _ in creators]
+        },
+        'is_mutable': rng.random() < 0.5,
+        'mint': mint or _address(rng),
+        'primary_sale_happened': rng.random() < 0.8,
+        'update_authority': _address(rng),
+        'edition_nonce': rng.randint(0, 255),
+        'off_chain_data': {
+            'image': f"https://arweave.net/{_address(rng)}?ext=png",
+            'attributes': [
+                {'trait_type': f"trait_{i}", 'value': ''.join(rng.choice(string.ascii_lowercase) for _ in range(8))}
+                for i in range(rng.randint(3, 8))
+            ]
+        },
+        'explorer_url': f"https://explorer.solana.com/address/{mint}?cluster=mainnet-beta",
+        'network': 'mainnet-beta'
+    }
+
+
+def candy_machine_nfts(count: int = 5000, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    minted = [nft_metadata(rng) for _ in range(count)]
+    unminted = [
+        {'name': f"Unminted #{i}", 'uri': f"https://arweave.net/{_address(rng)}"} for i in range(count // 5)
+    ]
+    return {
+        'all_nfts': [{'name': nft['data']['name'], 'uri': nft['data']['uri']} for nft in minted] + unminted,
+        'minted_nfts': minted,
+        'unminted_nfts': unminted,
+        'all_nfts_count': count + len(unminted)
+    }
+
+
+def wallet_transactions(count: int = 50000, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    return [_signature(rng) for _ in range(count)]
+
+
+def all_tokens(count: int = 20000, seed: int = 2) -> dict:
+    rng = random.Random(seed)
+    return {
+        _address(rng): {
+            'name': ''.join(rng.choice(string.ascii_letters) for _ in range(10)),
+            'symbol': ''.join(rng.choice(string.ascii_uppercase) for _ in range(4)),
+            'decimals': rng.choice([0, 6, 8, 9]),
+            'logo_uri': f"https://raw.githubusercontent.com/solana-labs/token-list/main/assets/{_address(rng)}.png",
+            'tags': rng.sample(['stablecoin', 'wrapped', 'nft', 'utility-token', 'lp-token'], 2)
+        }
+        for _ in range(count)
+    }
+
+
+def marketplace_analytics(mints: int = 500, transactions_per_mint: int = 20, seed: int = 3) -> dict:
+    rng = random.Random(seed)
+    transaction_history = {}
+    for _ in range(mints):
+        mint = _address(rng)
+        transaction_history[mint] = [
+            {
+                'marketplace': rng.choice(['magic-eden', 'solanart', 'digital-eyes', 'exchange-art']),
+                'operation': rng.choice(['buy', 'list', 'delist', 'update_price']),
+                'price': rng.randint(10 ** 7, 10 ** 11),
+                'block_time': 1640000000 + rng.randint(0, 10 ** 7),
+                'transaction_signature': _signature(rng),
+                'buyer': _address(rng),
+                'seller': _address(rng)
+            }
+            for _ in range(transactions_per_mint)
+        ]
+    return {'transaction_history': transaction_history, 'floor_price': rng.randint(10 ** 8, 10 ** 10)}
+
+
+def solana_transactions(count: int = 5000, seed: int = 4) -> list:
+    rng = random.Random(seed)
+    programs = [_address(rng) for _ in range(5)]
+    transactions = []
+    for _ in range(count):
+        accounts = [_address(rng) for _ in range(rng.randint(2, 6))] + rng.sample(programs, 2)
+        balances = [rng.randint(0, 10 ** 11) for _ in accounts]
+        transactions.append({
+            'slot': rng.randint(10 ** 8, 2 * 10 ** 8),
+            'block_time': 1640000000 + rng.randint(0, 10 ** 7),
+            'meta': {
+                'err': None,
+                'fee': 5000,
+                'pre_balances': balances,
+                'post_balances': [balance - rng.randint(0, 10 ** 6) for balance in balances],
+                'log_messages': [f"Program {program} invoke [1]" for program in accounts[-2:]]
+            },
+            'transaction': {
+                'message': {
+                    'account_keys': accounts,
+                    'recent_blockhash': _address(rng),
+                    'instructions': [
+                        {'program_id_index': len(accounts) - 1, 'accounts': [0, 1], 'data': _signature(rng)[:40]}
+                    ]
+                },
+                'signatures': [_signature(rng)]
+            }
+        })
+    return transactions
+
+
+def token_holdings(count: int = 20000, seed: int = 5) -> list:
+    rng = random.Random(seed)
+    mints = [_address(rng) for _ in range(200)]
+    owners = [_address(rng) for _ in range(1000)]
+    return [
+        {
+            'mint_address': rng.choice(mints),
+            'public_key': rng.choice(owners),
+            'token_account': _address(rng),
+            'amount': str(rng.randint(1, 10 ** 12)),
+            'decimals': rng.choice([0, 6, 9]),
+            'network': 'mainnet-beta'
+        }
+        for _ in range(count)
+    ]
+
+
+ALL = {
+    'get_all_nfts_from_candy_machine': candy_machine_nfts,
+    'get_wallet_transactions': wallet_transactions,
+    'get_all_tokens': all_tokens,
+    'get_nft_marketplace_analytics': marketplace_analytics
+}
@@ -0,0 +1,136 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from theblockchainapi import cache, circuit_breaker, rate_limit, resource, retry
+
+
+class Clock:
+    """
+    A manual clock, standing in for the `time` module of the modules under test.
+    """
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> Clock:
+    clock = Clock()
+    for module in (cache, circuit_breaker, rate_limit, retry):
+        monkeypatch.setattr(module, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def sleeps(clock, monkeypatch) -> list:
+    """
+    :return: The waits of the resources, made on the clock instead of for real
+    """
+    sleeps = []
+
+    class ResourceClock:
+        monotonic = staticmethod(clock.monotonic)
+
+        @staticmethod
+        def sleep(seconds: float):
+            sleeps.append(seconds)
+            clock.sleep(seconds)
+
+    monkeypatch.setattr(resource, 'time', ResourceClock)
+    return sleeps
+
+
+class StubAPI:
+    """
+    A local stand-in for the API. `handler(method, path, body)` returns the `(status, body)` or
+    `(status, body, headers)` of each response, where `body` is JSON serialized unless it is `bytes`, or a generator
+    of `bytes` chunks sent as they come; it may sleep to simulate a slow response. Every request is recorded in
+    `requests` as `(method, path, body)`.
+    """
+
+    def __init__(self):
+        self.handler = lambda method, path, body: (200, {})
+        self.requests = []
+        self.lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def __handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                path = self.path.split('/v1/', 1)[-1]
+                with stub.lock:
+                    stub.requests.append((self.command, path, body))
+                status, response, *headers = stub.handler(self.command, path, body)
+                if hasattr(response, '__next__'):
+                    chunks, length = response, None
+                else:
+                    content = response if isinstance(response, bytes) else json.dumps(response).encode()
+                    chunks, length = [content], len(content)
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Type', 'application/json')
+                    if length is None:
+                        # Streamed until the connection closes.
+                        self.send_header('Connection', 'close')
+                        self.close_connection = True
+                    else:
+                        self.send_header('Content-Length', str(length))
+                    for name, value in (headers[0] if headers else dict()).items():
+                        self.send_header(name, value)
+                    self.end_headers()
+                    for chunk in chunks:
+                        self.wfile.write(chunk)
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            do_GET = do_POST = do_PATCH = do_DELETE = __handle
+
+            def log_message(self, *args):
+                pass
+
+        self.__server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.__server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self.__server.server_address[1]}/v1/'
+        threading.Thread(target=self.__server.serve_forever, daemon=True).start()
+
+    def paths(self, method: str = None) -> list:
+        with self.lock:
+            return [path for request_method, path, _ in self.requests if method is None or request_method == method]
+
+    def close(self):
+        self.__server.shutdown()
+        self.__server.server_close()
+
+
+@pytest.fixture
+def api():
+    stub = StubAPI()
+    yield stub
+    stub.close()
+
+
+@pytest.fixture
+def connect(api):
+    """
+    :return: A function that points a resource at the stub API
+    """
+    def connect(resource):
+        resource._url = api.url
+        return resource
+    return connect
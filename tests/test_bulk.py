@@ -0,0 +1,189 @@
+import asyncio
+import itertools
+import threading
+import time
+
+import pytest
+
+from theblockchainapi import AsyncSolanaAPIResource, SingleFlight, SolanaAPIResource, SolanaNetwork
+from theblockchainapi.bulk import amap_concurrent, map_concurrent
+from theblockchainapi.errors import NotFoundError
+
+TRANSACTION = {'slot': 1, 'block_time': 1650000000, 'meta': {'err': None}}
+
+
+def square(item: int) -> int:
+    # The first items are the slowest, so they complete last.
+    time.sleep(0.01 * (5 - item % 5))
+    if item == 3:
+        raise ValueError('3 is not allowed.')
+    return item * item
+
+
+async def asquare(item: int) -> int:
+    await asyncio.sleep(0.01 * (5 - item % 5))
+    if item == 3:
+        raise ValueError('3 is not allowed.')
+    return item * item
+
+
+def check(results: list, count: int):
+    assert sorted(result.index for result in results) == list(range(count))
+    for result in results:
+        assert result.item == result.index
+        if result.index == 3:
+            assert not result.ok and result.value is None
+            assert isinstance(result.error, ValueError)
+            with pytest.raises(ValueError):
+                result.get()
+        else:
+            assert result.ok and result.get() == result.item ** 2
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_map_concurrent(ordered):
+    results = list(map_concurrent(square, range(10), concurrency=4, ordered=ordered))
+    check(results, 10)
+    if ordered:
+        assert [result.index for result in results] == list(range(10))
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_amap_concurrent(ordered):
+    async def main() -> list:
+        return [result async for result in amap_concurrent(asquare, range(10), concurrency=4, ordered=ordered)]
+
+    results = asyncio.run(main())
+    check(results, 10)
+    if ordered:
+        assert [result.index for result in results] == list(range(10))
+
+
+def test_amap_concurrent_async_items():
+    async def items():
+        for item in range(10):
+            yield item
+
+    async def main() -> list:
+        return [result async for result in amap_concurrent(asquare, items())]
+
+    check(asyncio.run(main()), 10)
+
+
+def test_concurrency():
+    lock = threading.Lock()
+    in_flight = []
+    peak = []
+
+    def func(item):
+        with lock:
+            in_flight.append(item)
+            peak.append(len(in_flight))
+        time.sleep(0.01)
+        with lock:
+            in_flight.remove(item)
+
+    list(map_concurrent(func, range(20), concurrency=3, ordered=False))
+    assert max(peak) == 3
+
+
+@pytest.mark.parametrize('concurrency', [0, -1, 1.5, None])
+def test_validation(concurrency):
+    with pytest.raises(Exception, match='concurrency'):
+        list(map_concurrent(square, range(10), concurrency=concurrency))
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_early_stop(ordered):
+    started = []
+
+    def func(item):
+        started.append(item)
+        time.sleep(0.01)
+        return item
+
+    # The items never run out: stopping early must not consume them all.
+    results = map_concurrent(func, itertools.count(), concurrency=2, ordered=ordered)
+    for i, _ in enumerate(results):
+        if i == 2:
+            break
+    results.close()
+    count = len(started)
+    assert count <= 5
+    time.sleep(0.05)
+    assert len(started) == count
+
+
+def test_async_early_stop():
+    started = []
+    cancelled = []
+
+    async def func(item):
+        started.append(item)
+        try:
+            await asyncio.sleep(0.01 * (item + 1))
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+        return item
+
+    async def main():
+        results = amap_concurrent(func, itertools.count(), concurrency=3)
+        async for result in results:
+            if result.index == 2:
+                break
+        await results.aclose()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+    # The calls still in flight are cancelled and nothing else starts.
+    assert started == [0, 1, 2, 3, 4]
+    assert cancelled == [3, 4]
+
+
+def test_resource_captures_errors(api, connect):
+    def handler(method, path, body):
+        if body['public_key'] == 'missing':
+            return 404, {'error_message': 'Wallet not found.'}
+        return 200, {'balance': len(body['public_key'])}
+
+    api.handler = handler
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey'))
+    results = list(resource.get_balances(['a', 'missing', 'abc'], concurrency=2))
+    assert [result.item for result in results] == ['a', 'missing', 'abc']
+    assert results[0].value['balance'] == 1 and results[2].value['balance'] == 3
+    assert isinstance(results[1].error, NotFoundError)
+
+
+def test_async_early_stop_with_singleflight(api, connect):
+    def handler(method, path, body):
+        time.sleep(0.2)
+        return 200, TRANSACTION
+
+    api.handler = handler
+
+    async def main():
+        singleflight = SingleFlight()
+        async with AsyncSolanaAPIResource('APIKeyID', 'APISecretKey', singleflight=singleflight) as resource:
+            connect(resource)
+            results = resource.map_concurrent(
+                lambda signature: resource.get_solana_transaction(signature, network=SolanaNetwork.MAINNET_BETA),
+                ['abc'] * 4,
+                ordered=False
+            )
+            # The bulk call leads the request that another caller waits on...
+            first = asyncio.ensure_future(results.__anext__())
+            await asyncio.sleep(0.05)
+            other = asyncio.ensure_future(resource.get_solana_transaction('abc', network=SolanaNetwork.MAINNET_BETA))
+            await asyncio.sleep(0.05)
+            assert singleflight.shared == 4
+            # ...and is stopped early, cancelling it.
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            await results.aclose()
+            assert await other == TRANSACTION
+            assert singleflight.in_flight == 0
+
+    asyncio.run(main())
+    assert len(api.requests) == 2
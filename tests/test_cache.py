@@ -0,0 +1,125 @@
+import json
+
+import pytest
+
+from theblockchainapi import SolanaAPIResource, SolanaNetwork
+from theblockchainapi.cache import MemoryCache, ResponseCache, SQLiteCache
+from theblockchainapi.errors import NotFoundError
+
+TRANSACTION = {'slot': 1, 'block_time': 1650000000, 'meta': {'err': None}}
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        yield MemoryCache(max_entries=100)
+    else:
+        backend = SQLiteCache(str(tmp_path / 'cache.db'), max_entries=100)
+        yield backend
+        backend.close()
+
+
+def test_expiry(clock, backend):
+    backend.set('a', b'1', ttl=10)
+    clock.now += 9.9
+    assert backend.get('a') == b'1'
+    clock.now += 0.1
+    assert backend.get('a') is None
+
+
+def test_memory_lru_eviction():
+    backend = MemoryCache(max_entries=2)
+    backend.set('a', b'1', ttl=60)
+    backend.set('b', b'2', ttl=60)
+    # `a` is now the most recently used.
+    assert backend.get('a') == b'1'
+    backend.set('c', b'3', ttl=60)
+    assert backend.get('b') is None
+    assert backend.get('a') == b'1' and backend.get('c') == b'3'
+    assert len(backend) == 2
+
+
+def test_memory_size_eviction():
+    backend = MemoryCache(max_entries=100, max_bytes=10)
+    backend.set('a', b'12345', ttl=60)
+    backend.set('b', b'12345', ttl=60)
+    backend.set('c', b'1', ttl=60)
+    assert backend.get('a') is None
+    assert backend.get('b') == b'12345' and backend.get('c') == b'1'
+    # Larger than the whole cache: never stored.
+    backend.set('d', b'x' * 11, ttl=60)
+    assert backend.get('d') is None
+
+
+def test_sqlite_lru_eviction(clock, tmp_path):
+    backend = SQLiteCache(str(tmp_path / 'cache.db'), max_entries=10)
+    for i in range(64):
+        clock.now += 1
+        backend.set(str(i), str(i).encode(), ttl=3600)
+        if i == 60:
+            clock.now += 1
+            assert backend.get('0') == b'0'
+    # Eviction runs every 64 writes and keeps the most recently used entries.
+    assert backend.get('0') == b'0'
+    assert backend.get('1') is None and backend.get('54') is None
+    assert all(backend.get(str(i)) is not None for i in range(55, 64))
+    backend.close()
+
+
+def test_sqlite_is_shared(tmp_path):
+    first = SQLiteCache(str(tmp_path / 'cache.db'))
+    second = SQLiteCache(str(tmp_path / 'cache.db'))
+    first.set('a', b'1', ttl=60)
+    assert second.get('a') == b'1'
+    second.clear()
+    assert first.get('a') is None
+    first.close()
+    second.close()
+
+
+@pytest.mark.parametrize('endpoint, response, cached', [
+    ('solana/transaction/mainnet-beta/abc', TRANSACTION, True),
+    ('ethereum/transaction/mainnet/0xabc', {'hash': '0xabc', 'block_number': 1}, True),
+    ('solana/transaction/mainnet-beta/abc', dict(TRANSACTION, confirmation_status='processed'), False),
+    ('ethereum/transaction/mainnet/0xabc', {'hash': '0xabc', 'block_number': None}, False),
+    ('solana/transaction/mainnet-beta/abc', None, False),
+    ('solana/transaction/mainnet-beta/abc', {'error_message': 'Not found'}, False),
+    ('solana/nft/mainnet-beta/mint', {'is_mutable': False}, True),
+    ('solana/nft/mainnet-beta/mint', {'is_mutable': True}, False),
+    ('solana/balance', {'balance': 1}, False)
+])
+def test_policies(endpoint, response, cached):
+    response_cache = ResponseCache()
+    response_cache.store(endpoint, 'key', json.dumps(response).encode(), response)
+    assert (response_cache.backend.get('key') is not None) == cached
+
+
+def get_transaction_twice(api, connect, status, body) -> list:
+    api.handler = lambda method, path, request_body: (status, body)
+    response_cache = ResponseCache()
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey', cache=response_cache))
+    results = []
+    for _ in range(2):
+        try:
+            results.append(resource.get_solana_transaction('abc', network=SolanaNetwork.MAINNET_BETA))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def test_caches_final_transaction(api, connect):
+    assert get_transaction_twice(api, connect, 200, TRANSACTION) == [TRANSACTION, TRANSACTION]
+    assert len(api.requests) == 1
+
+
+def test_does_not_cache_pending_transaction(api, connect):
+    transaction = dict(TRANSACTION, confirmation_status='processed')
+    assert get_transaction_twice(api, connect, 200, transaction) == [transaction, transaction]
+    assert len(api.requests) == 2
+
+
+@pytest.mark.parametrize('status', [200, 404])
+def test_does_not_cache_errors(api, connect, status):
+    results = get_transaction_twice(api, connect, status, {'error_message': 'Transaction not found.'})
+    assert all(isinstance(result, NotFoundError if status == 404 else Exception) for result in results)
+    assert len(api.requests) == 2
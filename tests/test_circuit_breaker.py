@@ -0,0 +1,150 @@
+import pytest
+
+from theblockchainapi import SolanaAPIResource
+from theblockchainapi.circuit_breaker import CircuitBreaker, CircuitState
+from theblockchainapi.errors import CircuitOpenError, ServerError
+from theblockchainapi.retry import RetryPolicy
+
+ENDPOINT = 'solana/wallet/balance'
+
+
+@pytest.fixture
+def transitions() -> list:
+    return []
+
+
+@pytest.fixture
+def breaker(clock, transitions) -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_rate_threshold=0.5,
+        window=60,
+        min_calls=4,
+        open_duration=30,
+        on_state_change=lambda family, previous, state: transitions.append((family, previous, state))
+    )
+
+
+def call(circuit, failed: bool, duration: float = 0.0):
+    permit = circuit.acquire()
+    assert permit is not None
+    circuit.release(permit, failed, duration)
+
+
+def open_circuit(circuit):
+    for failed in (False, False, True, True):
+        call(circuit, failed)
+    assert circuit.state == CircuitState.OPEN
+
+
+def test_closed_to_open_to_half_open_to_closed(clock, breaker, transitions):
+    circuit = breaker.get_circuit(ENDPOINT)
+    for failed in (False, False, True):
+        call(circuit, failed)
+    # Below `min_calls`, a high failure rate does not open the circuit.
+    assert circuit.state == CircuitState.CLOSED
+    call(circuit, True)
+    assert circuit.state == CircuitState.OPEN
+    assert circuit.acquire() is None
+    assert circuit.get_retry_after() == 30
+
+    clock.now += 29.9
+    assert circuit.acquire() is None
+    clock.now += 0.1
+    assert circuit.state == CircuitState.HALF_OPEN
+    assert circuit.get_retry_after() is None
+    permit = circuit.acquire()
+    assert permit is not None
+    # Only `half_open_max_calls` probes at a time.
+    assert circuit.acquire() is None
+    circuit.release(permit, False)
+    assert circuit.state == CircuitState.CLOSED
+    assert circuit.get_stats()['calls'] == 0
+
+    family = 'solana/wallet/*'
+    assert transitions == [
+        (family, CircuitState.CLOSED, CircuitState.OPEN),
+        (family, CircuitState.OPEN, CircuitState.HALF_OPEN),
+        (family, CircuitState.HALF_OPEN, CircuitState.CLOSED)
+    ]
+
+
+def test_failed_probe_reopens(clock, breaker):
+    circuit = breaker.get_circuit(ENDPOINT)
+    open_circuit(circuit)
+    clock.now += 30
+    call(circuit, True)
+    assert circuit.state == CircuitState.OPEN
+    # The open duration starts over.
+    assert circuit.get_retry_after() == 30
+    clock.now += 30
+    assert circuit.state == CircuitState.HALF_OPEN
+
+
+def test_slow_probe_reopens(clock):
+    breaker = CircuitBreaker(min_calls=1, open_duration=10, slow_call_duration=1)
+    circuit = breaker.get_circuit(ENDPOINT)
+    call(circuit, False, duration=2)
+    assert circuit.state == CircuitState.OPEN
+    clock.now += 10
+    call(circuit, False, duration=1.5)
+    assert circuit.state == CircuitState.OPEN
+
+
+def test_abandoned_probe(clock, breaker):
+    circuit = breaker.get_circuit(ENDPOINT)
+    open_circuit(circuit)
+    clock.now += 30
+    permit = circuit.acquire()
+    circuit.release(permit, None)
+    # An abandoned probe has no outcome and frees its slot.
+    assert circuit.state == CircuitState.HALF_OPEN
+    assert circuit.acquire() is not None
+
+
+def test_stale_permits_are_ignored(clock, breaker):
+    circuit = breaker.get_circuit(ENDPOINT)
+    stale = circuit.acquire()
+    open_circuit(circuit)
+    clock.now += 30
+    # A call permitted while closed completes after the circuit half-opened.
+    circuit.release(stale, False)
+    assert circuit.state == CircuitState.HALF_OPEN
+
+
+def test_window(clock, breaker):
+    circuit = breaker.get_circuit(ENDPOINT)
+    call(circuit, True)
+    call(circuit, True)
+    clock.now += 60
+    # The failures have left the window.
+    call(circuit, False)
+    call(circuit, False)
+    call(circuit, True)
+    assert circuit.state == CircuitState.CLOSED
+    assert circuit.get_stats()['calls'] == 3
+
+
+def test_families(breaker):
+    assert breaker.get_family('solana/nft/marketplaces/listing/devnet/mint') == 'solana/nft/marketplaces/*'
+    assert breaker.get_family('solana/nft/candy_machine/devnet/id/nfts') == 'solana/nft/candy_machine*'
+    assert breaker.get_family('solana/nft/devnet/mint') == 'solana/nft/*'
+    open_circuit(breaker.get_circuit('solana/nft/devnet/mint'))
+    # Other families keep working.
+    assert breaker.get_circuit('solana/nft/marketplaces/listing/devnet/mint').acquire() is not None
+    assert breaker.get_states()['solana/nft/*'] == CircuitState.OPEN
+
+
+def test_resource_fails_fast(api, connect):
+    api.handler = lambda method, path, body: (503, {'error_message': 'Unavailable'})
+    breaker = CircuitBreaker(min_calls=2, open_duration=60)
+    resource = connect(SolanaAPIResource(
+        'APIKeyID', 'APISecretKey', circuit_breaker=breaker, retry_policy=RetryPolicy(max_retries=0)
+    ))
+    for _ in range(2):
+        with pytest.raises(ServerError):
+            resource.get_nft_owner('mint')
+    with pytest.raises(CircuitOpenError) as info:
+        resource.get_nft_owner('mint')
+    assert info.value.family == 'solana/nft/*'
+    assert 0 < info.value.retry_after <= 60
+    assert len(api.requests) == 2
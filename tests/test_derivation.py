@@ -0,0 +1,193 @@
+import hashlib
+import os
+
+import pytest
+
+from theblockchainapi import DerivationPath, SolanaAPIResource, derivation
+from theblockchainapi.derivation import DerivationEngine
+from theblockchainapi.errors import ServerError
+from theblockchainapi.retry import RetryPolicy
+
+PHRASE = 'abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about'
+SEED = bytes.fromhex('000102030405060708090a0b0c0d0e0f')
+
+
+@pytest.fixture(params=['accelerated', 'pure'])
+def mode(request, monkeypatch):
+    """
+    Runs a test with `cryptography` and `pycryptodome`, where installed, and with the pure Python fallbacks.
+    """
+    if request.param == 'pure':
+        monkeypatch.setattr(derivation, 'serialization', None)
+        monkeypatch.setattr(derivation, 'keccak', None)
+    elif derivation.serialization is None and derivation.keccak is None:
+        pytest.skip('Neither `cryptography` nor `pycryptodome` is installed.')
+    return request.param
+
+
+def get_engine(seed: bytes) -> DerivationEngine:
+    engine = DerivationEngine(PHRASE)
+    # Nothing has been derived yet, so no node of the phrase's own seed is cached.
+    engine.seed = seed
+    return engine
+
+
+# BIP39: https://github.com/trezor/python-mnemonic/blob/master/vectors.json
+@pytest.mark.parametrize('phrase, seed', [
+    (
+        PHRASE,
+        'c55257c360c07c72029aebc1b53c05ed0362ada38ead3e3e9efa3708e5349553'
+        '1f09a6987599d18264c1e1c92f2cf141630c7a3c4ab7c81b2f001698e7463b04'
+    ),
+    (
+        'legal winner thank year wave sausage worth useful legal winner thank yellow',
+        '2e8905819b8723fe2c1d161860e5ee1830318dbf49a83bd451cfb8440c28bd6f'
+        'a457fe1296106559a3c80937a1c1069be3a3a5bd381ee6260e8d9739fce1f607'
+    ),
+    (
+        'zoo zoo zoo zoo zoo zoo zoo zoo zoo zoo zoo wrong',
+        'ac27495480225222079d7be181583751e86f571027b0497b5b5d11218e0a8a13'
+        '332572917f0f8e5a589620c6f15b11c61dee327651a14c34e18231052e48c069'
+    )
+])
+def test_mnemonic_to_seed(phrase, seed):
+    assert derivation.mnemonic_to_seed(phrase, 'TREZOR').hex() == seed
+
+
+# SLIP-0010 test vector 1 for ed25519
+@pytest.mark.parametrize('path, secret, public_key', [
+    (
+        "m/0'",
+        '68e0fe46dfb67e368c75379acec591dad19df3cde26e63b93a8e704f1dade7a3',
+        '8c8a13df77a28f3445213a0f432fde644acaa215fc72dcdf300d5efaa85d350c'
+    ),
+    (
+        "m/0'/1'/2'/2'/1000000000'",
+        '8f94d394a8e8fd6b1bc2f3f49f5c47e385281d5c17e65324b0f62483e37e8793',
+        '3c24da049451555d51a7014a37337aa4e12d41e485abccfa46b47dfb2af54b7a'
+    )
+])
+def test_slip10_ed25519(mode, path, secret, public_key):
+    keypair = get_engine(SEED).get_solana_keypair(path)
+    assert keypair[:32].hex() == secret
+    assert keypair[32:].hex() == public_key
+
+
+# BIP32 test vector 1
+@pytest.mark.parametrize('path, private_key', [
+    ("m/0'", 'edb2e14f9ee77d26dd93b4ecede8d16ed408ce149b6cd80b0715a2d911a0afea'),
+    ("m/0'/1", '3c6cb8d0f6a264c91ea8b5030fadaa8e538b020f0a387421a12de9319dc93368'),
+    ("m/0'/1/2'/2", '0f479245fb19a38a1954c5c7c0ebab2f9bdfd96a17563ef28a6a4b1a2a764ef4'),
+    ("m/0'/1/2'/2/1000000000", '471b76e389e528d6de6d816857e012c5455051cad6660850e58372a6c3e6e7c8')
+])
+def test_bip32_secp256k1(path, private_key):
+    assert get_engine(SEED).derive_evm_private_key(path) == '0x' + private_key
+
+
+def test_solana_address(mode):
+    engine = DerivationEngine(PHRASE)
+    assert engine.derive_public_key("m/44'/501'/0'/0'") == 'HAgk14JpMQLgt6rVgv7cBQFJWFto5Dqxi472uT3DKpqk'
+    # Every index of a Solana path is hardened.
+    assert engine.derive_public_key("m/44/501/0/0") == 'HAgk14JpMQLgt6rVgv7cBQFJWFto5Dqxi472uT3DKpqk'
+
+
+def test_evm_address(mode):
+    engine = DerivationEngine(PHRASE)
+    assert engine.derive_evm_address("m/44'/60'/0'/0/0") == '0x9858EfFD232B4033E47d90003D41EC34EcaEda94'
+
+
+def test_keccak256(mode):
+    assert derivation.keccak256(b'').hex() == 'c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470'
+
+
+def test_ed25519_rfc8032(mode):
+    secret = bytes.fromhex('9d61b19deffd5a60ba844af492ec2cc44449c5697b326919703bac031cae7f60')
+    assert derivation._ed25519_public_key(secret).hex() == \
+        'd75a980182b10ab7d54bfed3c964073a0ee172f3daa62325af021a68f707511a'
+
+
+def test_ed25519_parity(monkeypatch):
+    if derivation.serialization is None:
+        pytest.skip('`cryptography` is not installed.')
+    secrets = [os.urandom(32) for _ in range(50)] + [b'\0' * 32, b'\xff' * 32]
+    accelerated = [derivation._ed25519_public_key(secret) for secret in secrets]
+    monkeypatch.setattr(derivation, 'serialization', None)
+    assert [derivation._ed25519_public_key(secret) for secret in secrets] == accelerated
+
+
+def test_secp256k1_parity():
+    ec = pytest.importorskip('cryptography.hazmat.primitives.asymmetric.ec')
+    private_keys = [int.from_bytes(os.urandom(32), 'big') % (derivation._K_N - 1) + 1 for _ in range(50)]
+    private_keys += [1, 2, derivation._K_N - 1]
+    for private_key in private_keys:
+        numbers = ec.derive_private_key(private_key, ec.SECP256K1()).public_key().public_numbers()
+        assert derivation._secp256k1_public_key(private_key) == (numbers.x, numbers.y)
+
+
+def test_keccak256_parity(monkeypatch):
+    if derivation.keccak is None:
+        pytest.skip('`pycryptodome` is not installed.')
+    # Every length around the 136-byte rate, where the padding changes.
+    messages = [os.urandom(length) for length in range(300)]
+    accelerated = [derivation.keccak256(message) for message in messages]
+    monkeypatch.setattr(derivation, 'keccak', None)
+    assert [derivation.keccak256(message) for message in messages] == accelerated
+
+
+def test_keccak256_is_not_sha3(mode):
+    assert derivation.keccak256(b'abc') != hashlib.sha3_256(b'abc').digest()
+
+
+def scan(api, connect, funded_indices, failed_indices=(), paths=(DerivationPath.PHANTOM_AND_SOLLET_PATH,), **kwargs):
+    """
+    Scans the wallet indices of `PHRASE`, whose Phantom accounts at `funded_indices` hold SOL and at
+    `failed_indices` cannot be checked.
+    """
+    engine = DerivationEngine(PHRASE)
+    template = "m/44/501/{wallet_index}/0"
+    funded = set(engine.derive_public_keys(template.format(wallet_index=i) for i in funded_indices))
+    failed = set(engine.derive_public_keys(template.format(wallet_index=i) for i in failed_indices))
+
+    def handler(method, path, body):
+        if body['public_key'] in failed:
+            return 500, {'error_message': 'Internal error'}
+        return 200, {'balance': 1 if body['public_key'] in funded else 0}
+
+    api.handler = handler
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey', retry_policy=RetryPolicy(max_retries=0)))
+    return list(resource.scan_derivation_paths(engine, paths=paths, **kwargs))
+
+
+def test_scan_stops_at_gap_limit(api, connect):
+    results = scan(api, connect, funded_indices=(0, 2), gap_limit=3, batch_size=1)
+    assert [result.item['wallet_index'] for result in results] == [0, 1, 2, 3, 4, 5]
+    assert [result.item['funded'] for result in results] == [True, False, True, False, False, False]
+    assert results[0].item['derivation_path'] == 'm/44/501/0/0'
+
+
+def test_scan_checks_whole_batches(api, connect):
+    results = scan(api, connect, funded_indices=(1,), gap_limit=3, batch_size=4)
+    # The gap limit is reached at wallet index 4, but the rest of its batch was already checked.
+    assert [result.item['wallet_index'] for result in results] == list(range(8))
+
+
+def test_scan_checks_fixed_path_once(api, connect):
+    paths = (DerivationPath.PHANTOM_AND_SOLLET_PATH, DerivationPath.CLI_PATH)
+    results = scan(api, connect, funded_indices=(1,), paths=paths, gap_limit=2, batch_size=2)
+    fixed = [result.item for result in results if result.item['path'] == DerivationPath.CLI_PATH.value]
+    assert len(fixed) == 1 and fixed[0]['wallet_index'] == 0
+    assert [result.item['wallet_index'] for result in results if result.item not in fixed] == [0, 1, 2, 3]
+
+
+def test_scan_failed_checks(api, connect):
+    results = scan(api, connect, funded_indices=(0,), failed_indices=(1,), gap_limit=2, batch_size=1)
+    # The account that could not be checked neither counts towards the gap nor resets it.
+    assert [result.item['wallet_index'] for result in results] == [0, 1, 2, 3]
+    assert isinstance(results[1].error, ServerError) and results[1].item['funded'] is None
+
+
+@pytest.mark.parametrize('wallet_indices', [[-1], [0, 2 ** 31], [1.5], [True]])
+def test_scan_invalid_wallet_indices(wallet_indices):
+    resource = SolanaAPIResource('APIKeyID', 'APISecretKey')
+    with pytest.raises(Exception, match='wallet index'):
+        resource.scan_derivation_paths(PHRASE, wallet_indices=wallet_indices)
@@ -0,0 +1,85 @@
+import io
+import json
+
+import pytest
+
+from theblockchainapi import MARKETPLACE_TRANSACTIONS, NFT_METADATA, TOKEN_HOLDINGS, ExportWriter, export_responses
+from theblockchainapi.bulk import BulkResult
+from theblockchainapi.errors import NotFoundError
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+NFT = {
+    'mint': 'mint',
+    'data': {'name': 'Name', 'symbol': 'SYM', 'creators': ['creator'], 'seller_fee_basis_points': 500},
+    'is_mutable': True,
+    'off_chain_data': {'image': 'https://example.com/image.png'},
+    'network': 'devnet'
+}
+
+
+def export_ndjson(responses, schema=NFT_METADATA) -> list:
+    f = io.StringIO()
+    rows = export_responses(responses, f, schema, format='ndjson')
+    lines = [json.loads(line) for line in f.getvalue().splitlines()]
+    assert rows == len(lines)
+    return lines
+
+
+def test_ndjson():
+    [row] = export_ndjson([NFT])
+    assert row['mint'] == 'mint' and row['name'] == 'Name' and row['seller_fee_basis_points'] == 500
+    assert row['creators'] == ['creator'] and row['off_chain_data'] == NFT['off_chain_data']
+    # Missing values are null.
+    assert row['update_authority'] is None and row['edition_nonce'] is None
+
+
+def test_skips_none_and_failures():
+    responses = [
+        None,
+        BulkResult(0, 'missing', value=None),
+        BulkResult(1, 'error', error=NotFoundError('Not found.')),
+        [NFT, None],
+        BulkResult(2, 'mint', value=NFT)
+    ]
+    assert [row['mint'] for row in export_ndjson(responses)] == ['mint', 'mint']
+
+
+def test_get_rows():
+    analytics = {'transaction_history': {
+        'a': [{'operation': 'sale', 'price': '10'}, {'operation': 'listing', 'price': '20'}],
+        'b': [{'operation': 'sale', 'price': '30'}]
+    }}
+    rows = export_ndjson([analytics, None], schema=MARKETPLACE_TRANSACTIONS)
+    assert [(row['mint_address'], row['price']) for row in rows] == [('a', 10), ('a', 20), ('b', 30)]
+
+
+def test_large_amounts():
+    holding = {'mint_address': 'mint', 'amount': str(2 ** 64 - 1), 'decimals': 0}
+    [row] = export_ndjson([[holding]], schema=TOKEN_HOLDINGS)
+    assert row['amount'] == 2 ** 64 - 1
+
+
+@pytest.mark.skipif(pyarrow is None, reason='`pyarrow` is not installed.')
+@pytest.mark.parametrize('extension', ['parquet', 'arrow'])
+def test_chunks(tmp_path, extension):
+    path = str(tmp_path / f'nfts.{extension}')
+    responses = [dict(NFT, mint=f'mint{i}') for i in range(5)] + [None]
+    assert export_responses(responses, path, NFT_METADATA, chunk_size=2) == 5
+    if extension == 'parquet':
+        table = pyarrow.parquet.read_table(path)
+    else:
+        table = pyarrow.ipc.open_file(path).read_all()
+    assert table.column('mint').to_pylist() == [f'mint{i}' for i in range(5)]
+    assert table.schema == NFT_METADATA.to_arrow()
+
+
+def test_closed():
+    writer = ExportWriter(io.StringIO(), NFT_METADATA, format='ndjson')
+    writer.close()
+    with pytest.raises(Exception, match='closed'):
+        writer.write(NFT)
@@ -0,0 +1,55 @@
+import asyncio
+
+from theblockchainapi import AsyncBlockchainAPIHub, Blockchain, BlockchainAPIHub, RateLimiter, RetryPolicy
+from theblockchainapi.cache import ResponseCache
+
+CHAINS = [(Blockchain.ETHEREUM, 'mainnet'), (Blockchain.BINANCE, 'mainnet'), (Blockchain.SOLANA, 'mainnet-beta')]
+
+
+def components(resource) -> tuple:
+    return resource._transport, resource._rate_limiter, resource._retry_policy, resource._cache
+
+
+def test_defaults_are_shared():
+    with BlockchainAPIHub('APIKeyID', 'APISecretKey') as hub:
+        assert isinstance(hub.rate_limiter, RateLimiter)
+        assert isinstance(hub.retry_policy, RetryPolicy)
+        assert isinstance(hub.cache, ResponseCache)
+        resources = [hub.get_resource(*chain) for chain in CHAINS]
+        assert all(
+            components(resource) == (hub.transport, hub.rate_limiter, hub.retry_policy, hub.cache)
+            for resource in resources
+        )
+        assert hub.get_resource(Blockchain.ETHEREUM, 'mainnet') is resources[0]
+
+
+def test_given_components_are_used():
+    limiter = RateLimiter(5)
+    policy = RetryPolicy(max_retries=0)
+    cache = ResponseCache()
+    with BlockchainAPIHub('APIKeyID', 'APISecretKey', rate_limiter=limiter, retry_policy=policy, cache=cache) as hub:
+        assert (hub.rate_limiter, hub.retry_policy, hub.cache) == (limiter, policy, cache)
+        assert components(hub.get_resource(*CHAINS[0]))[1:] == (limiter, policy, cache)
+
+
+def test_rate_limiter_is_shared(api, connect, clock):
+    api.handler = lambda method, path, body: (200, {'balance': 1})
+    with BlockchainAPIHub('APIKeyID', 'APISecretKey') as hub:
+        for chain in CHAINS:
+            connect(hub.get_resource(*chain))
+        results = list(hub.map(CHAINS, 'get_balance', ('address',)))
+        assert all(result.ok for result in results)
+        # Every chain took its credit from the one bucket of the API key.
+        assert hub.rate_limiter.get_levels() == {'*': hub.DEFAULT_CAPACITY - len(CHAINS)}
+
+
+def test_async_defaults_are_shared():
+    async def main():
+        async with AsyncBlockchainAPIHub('APIKeyID', 'APISecretKey') as hub:
+            resources = [hub.get_resource(*chain) for chain in CHAINS]
+            assert all(
+                components(resource) == (hub.transport, hub.rate_limiter, hub.retry_policy, hub.cache)
+                for resource in resources
+            )
+
+    asyncio.run(main())
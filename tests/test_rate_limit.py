@@ -0,0 +1,66 @@
+import pytest
+
+from theblockchainapi import SolanaAPIResource
+from theblockchainapi.rate_limit import RateLimiter, TokenBucket
+
+
+def test_burst(clock):
+    bucket = TokenBucket(rate=2, capacity=5)
+    assert [bucket.reserve() for _ in range(5)] == [0] * 5
+    # Past the burst, reservations queue up behind each other.
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1
+    assert bucket.level == -2
+
+
+def test_refill(clock):
+    bucket = TokenBucket(rate=2, capacity=5)
+    for _ in range(5):
+        bucket.reserve()
+    clock.now += 1
+    assert bucket.level == 2
+    assert bucket.reserve(2) == 0
+    assert bucket.reserve() == 0.5
+    # Never refilled beyond the capacity.
+    clock.now += 60
+    assert bucket.level == 5
+
+
+def test_default_capacity(clock):
+    assert TokenBucket(rate=3).capacity == 3
+    # A bucket always holds at least one token.
+    assert TokenBucket(rate=0.5).capacity == 1
+
+
+@pytest.mark.parametrize('kwargs', [dict(rate=0), dict(rate=-1), dict(rate=1, capacity=0.5)])
+def test_validation(kwargs):
+    with pytest.raises(Exception):
+        TokenBucket(**kwargs)
+
+
+def test_families(clock):
+    limiter = RateLimiter(rate=10, families={'solana/nft/marketplaces/*': (1, 2)})
+    endpoint = 'solana/nft/marketplaces/listing/devnet/mint'
+    assert [limiter.reserve(endpoint) for _ in range(3)] == [0, 0, 1]
+    # The family bucket does not slow the rest of the key.
+    assert limiter.reserve('solana/wallet/balance') == 0
+    assert limiter.get_levels() == {'*': 6, 'solana/nft/marketplaces/*': -1}
+
+
+def test_costs(clock):
+    limiter = RateLimiter(rate=4, costs={'solana/nft/candy_machine/*': 3})
+    assert limiter.get_cost('solana/nft/candy_machine/devnet/id/nfts') == 3
+    assert limiter.get_cost('solana/wallet/balance') == 1
+    assert limiter.reserve('solana/nft/candy_machine/devnet/id/nfts') == 0
+    assert limiter.reserve('solana/nft/candy_machine/devnet/id/nfts') == 0.5
+
+
+def test_resource_is_paced(api, connect, sleeps):
+    api.handler = lambda method, path, body: (200, {'balance': 1})
+    limiter = RateLimiter(rate=2, capacity=2)
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey', rate_limiter=limiter))
+    for _ in range(4):
+        resource.get_balance('public_key')
+    # The waits move the clock, which refills the bucket.
+    assert sleeps == [0.5, 0.5]
+    assert len(api.requests) == 4
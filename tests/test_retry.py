@@ -0,0 +1,160 @@
+import email.utils
+
+import pytest
+import requests
+from requests import Response
+
+from theblockchainapi import SolanaAPIResource, SolanaWallet
+from theblockchainapi.errors import ServerError
+from theblockchainapi.retry import RetryBudget, RetryPolicy
+
+
+def make_response(status_code: int, headers: dict = None) -> Response:
+    response = Response()
+    response.status_code = status_code
+    response.headers.update(headers or dict())
+    return response
+
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    # The ceiling of the backoff, instead of a random delay below it.
+    monkeypatch.setattr('random.uniform', lambda low, high: high)
+
+
+def test_idempotent_only(clock):
+    policy = RetryPolicy()
+    assert policy.get_retry_delay(0, True, response=make_response(503)) is not None
+    assert policy.get_retry_delay(0, False, response=make_response(503)) is None
+    assert policy.get_retry_delay(0, False, error=requests.ConnectionError()) is None
+    assert RetryPolicy(retry_non_idempotent=True).get_retry_delay(0, False, response=make_response(503)) is not None
+
+
+@pytest.mark.parametrize('status_code, retried', [
+    (429, True), (500, True), (502, True), (503, True), (504, True),
+    (400, False), (401, False), (404, False), (501, False)
+])
+def test_retryable_statuses(clock, status_code, retried):
+    assert (RetryPolicy().get_retry_delay(0, True, response=make_response(status_code)) is not None) == retried
+
+
+def test_retryable_errors(clock):
+    policy = RetryPolicy()
+    assert policy.get_retry_delay(0, True, error=requests.ConnectionError()) is not None
+    assert policy.get_retry_delay(0, True, error=requests.Timeout()) is not None
+    assert policy.get_retry_delay(0, True, error=ValueError()) is None
+
+
+def test_max_retries(clock):
+    policy = RetryPolicy(max_retries=2)
+    assert policy.get_retry_delay(1, True, response=make_response(503)) is not None
+    assert policy.get_retry_delay(2, True, response=make_response(503)) is None
+    assert RetryPolicy(max_retries=0).get_retry_delay(0, True, response=make_response(503)) is None
+
+
+def test_backoff(clock, no_jitter):
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=3)
+    assert [policy.get_backoff(attempt) for attempt in range(5)] == [0.5, 1, 2, 3, 3]
+
+
+def test_retry_after_seconds(clock, no_jitter):
+    policy = RetryPolicy()
+    assert policy.get_retry_delay(0, True, response=make_response(429, {'Retry-After': '7'})) == 7
+    # Too long a wait: give up rather than block.
+    assert policy.get_retry_delay(0, True, response=make_response(429, {'Retry-After': '61'})) is None
+    # An unparsable header falls back to the backoff.
+    assert policy.get_retry_delay(0, True, response=make_response(429, {'Retry-After': 'soon'})) == 0.5
+    assert RetryPolicy(respect_retry_after=False).get_retry_delay(
+        0, True, response=make_response(429, {'Retry-After': '7'})
+    ) == 0.5
+
+
+def test_retry_after_date(clock):
+    clock.now = 1650000000.0
+    date = email.utils.formatdate(clock.now + 12, usegmt=True)
+    assert RetryPolicy.get_retry_after(make_response(503, {'Retry-After': date})) == 12
+    # A date in the past asks for no wait at all.
+    clock.now += 20
+    assert RetryPolicy.get_retry_after(make_response(503, {'Retry-After': date})) == 0
+
+
+def test_budget_exhaustion(clock):
+    budget = RetryBudget(ratio=0.5, min_retries_per_second=0, max_tokens=2)
+    policy = RetryPolicy(budget=budget)
+    response = make_response(503)
+    assert policy.get_retry_delay(0, True, response=response) is not None
+    assert policy.get_retry_delay(0, True, response=response) is not None
+    assert budget.level == 0
+    assert policy.get_retry_delay(0, True, response=response) is None
+    # Two requests pay for one more retry.
+    budget.deposit()
+    budget.deposit()
+    assert policy.get_retry_delay(0, True, response=response) is not None
+    assert policy.get_retry_delay(0, True, response=response) is None
+
+
+def test_budget_refill(clock):
+    budget = RetryBudget(ratio=0, min_retries_per_second=1, max_tokens=3)
+    for _ in range(3):
+        assert budget.withdraw()
+    assert not budget.withdraw()
+    clock.now += 1.5
+    assert budget.withdraw()
+    assert not budget.withdraw()
+    clock.now += 60
+    assert budget.level == 3
+
+
+def test_budget_validation():
+    with pytest.raises(Exception, match='ratio'):
+        RetryBudget(ratio=-1)
+    with pytest.raises(Exception, match='budget'):
+        RetryPolicy(budget=object())
+
+
+def responses(*statuses):
+    statuses = list(statuses)
+
+    def handler(method, path, body):
+        return statuses.pop(0)
+    return handler
+
+
+def test_resource_retries_idempotent_requests(api, connect, sleeps, no_jitter):
+    api.handler = responses((503, {}), (502, {}), (200, {'balance': 1}))
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey'))
+    # A POST, but a read-only one.
+    assert resource.get_balance('public_key')['balance'] == 1
+    assert len(api.requests) == 3
+    assert sleeps == [0.5, 1]
+
+
+def test_resource_does_not_retry_transfers(api, connect, sleeps):
+    api.handler = responses((503, {'error_message': 'Unavailable'}), (200, {'transaction_signature': 'abc'}))
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey'))
+    wallet = SolanaWallet(b58_private_key='private_key')
+    with pytest.raises(ServerError) as info:
+        resource.transfer(wallet, 'recipient')
+    assert not info.value.retryable
+    assert len(api.requests) == 1
+    assert sleeps == []
+
+
+def test_resource_honors_retry_after(api, connect, sleeps):
+    api.handler = responses((429, {}, {'Retry-After': '5'}), (200, {'balance': 1}))
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey'))
+    assert resource.get_balance('public_key')['balance'] == 1
+    assert sleeps == [5]
+
+
+def test_resource_stops_when_budget_is_exhausted(api, connect, sleeps):
+    api.handler = lambda method, path, body: (503, {'error_message': 'Unavailable'})
+    budget = RetryBudget(ratio=0, min_retries_per_second=0, max_tokens=2)
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey', retry_policy=RetryPolicy(budget=budget)))
+    with pytest.raises(ServerError):
+        resource.get_balance('public_key')
+    # 2 retries out of the 3 allowed by `max_retries`.
+    assert len(api.requests) == 3
+    with pytest.raises(ServerError):
+        resource.get_balance('public_key')
+    assert len(api.requests) == 4
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from theblockchainapi import (
+    AsyncBlockchainAPIResource, AsyncRPCBatcher, Blockchain, BlockchainAPIResource, BlockchainNetwork, RPCBatcher
+)
+from theblockchainapi.errors import RPCError, ServerError
+
+NETWORK = BlockchainNetwork.SolanaNetwork.DEVNET
+
+
+def node(method, path, body):
+    """
+    Answers `echo` calls with their params and `fail` calls with an error, in reverse order as a node may.
+    """
+    if isinstance(body, dict):
+        return 200, {'jsonrpc': '2.0', 'id': body.get('id'), 'result': body['params']}
+    responses = []
+    for call in reversed(body):
+        if call['method'] == 'fail':
+            responses.append({'jsonrpc': '2.0', 'id': call['id'], 'error': {'code': -32602, 'message': 'Invalid'}})
+        else:
+            responses.append({'jsonrpc': '2.0', 'id': call['id'], 'result': call['params']})
+    return 200, responses
+
+
+@pytest.fixture
+def resource(api, connect):
+    api.handler = node
+    return connect(BlockchainAPIResource('APIKeyID', 'APISecretKey', Blockchain.SOLANA, NETWORK))
+
+
+def batch_sizes(api) -> list:
+    return [len(body) for method, path, body in api.requests if path == 'solana/devnet/rpc']
+
+
+def test_make_rpc_batch(resource):
+    results = resource.make_rpc_batch([('echo', [i]) for i in range(3)] + [('fail', [])])
+    assert [result.value for result in results[:3]] == [[0], [1], [2]]
+    assert [result.item for result in results] == [('echo', [0]), ('echo', [1]), ('echo', [2]), ('fail', [])]
+    assert isinstance(results[3].error, RPCError) and results[3].error.code == -32602
+
+
+def test_batches_calls_from_threads(api, resource):
+    count = 10
+    barrier = threading.Barrier(count)
+
+    with RPCBatcher(resource, max_delay=0.2) as batcher:
+        def call(i):
+            barrier.wait()
+            return batcher.call('echo', [i])
+
+        with ThreadPoolExecutor(count) as pool:
+            # Each caller gets the result of its own call, whatever the order of the responses.
+            assert list(pool.map(call, range(count))) == [[i] for i in range(count)]
+    assert batch_sizes(api) == [count]
+
+
+def test_max_batch_size(api, resource):
+    with RPCBatcher(resource, max_batch_size=2, max_delay=10) as batcher:
+        futures = [batcher.submit('echo', [i]) for i in range(5)]
+    # Closing sends the last, partial batch without waiting for `max_delay`.
+    assert [future.result() for future in futures] == [[i] for i in range(5)]
+    assert sorted(batch_sizes(api)) == [1, 2, 2]
+
+
+def test_per_call_errors(resource):
+    with RPCBatcher(resource) as batcher:
+        futures = [batcher.submit('echo', [0]), batcher.submit('fail', []), batcher.submit('echo', [2])]
+    assert futures[0].result() == [0] and futures[2].result() == [2]
+    with pytest.raises(RPCError) as info:
+        futures[1].result()
+    assert info.value.code == -32602
+
+
+def test_batch_errors(api, resource):
+    api.handler = lambda method, path, body: (500, {'error_message': 'Internal error'})
+    with RPCBatcher(resource) as batcher:
+        futures = [batcher.submit('echo', [i]) for i in range(3)]
+    for future in futures:
+        with pytest.raises(ServerError):
+            future.result()
+
+
+def test_leftover_calls_keep_their_deadline(api, resource):
+    with RPCBatcher(resource, max_batch_size=2, max_delay=1.0) as batcher:
+        start = time.monotonic()
+        first = batcher.submit('echo', [0])
+        time.sleep(0.5)
+        # Fills the batch of the first call: the third call is left over.
+        batcher.submit('echo', [1])
+        third = batcher.submit('echo', [2])
+        assert first.result() == [0]
+        assert third.result() == [2]
+        # Sent `max_delay` after the first call at the latest, not `max_delay` after the first batch.
+        assert time.monotonic() - start < 1.3
+    assert batch_sizes(api) == [2, 1]
+
+
+def test_submit_after_close(resource):
+    batcher = RPCBatcher(resource)
+    batcher.close()
+    with pytest.raises(Exception, match='closed'):
+        batcher.submit('echo', [])
+
+
+def test_async_batcher(api, connect):
+    api.handler = node
+
+    async def main():
+        async with AsyncBlockchainAPIResource('APIKeyID', 'APISecretKey', Blockchain.SOLANA, NETWORK) as resource:
+            connect(resource)
+            async with AsyncRPCBatcher(resource, max_batch_size=4, max_delay=0.05) as batcher:
+                calls = [batcher.call('echo', [i]) for i in range(6)] + [batcher.call('fail', [])]
+                return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert results[:6] == [[i] for i in range(6)]
+    assert isinstance(results[6], RPCError)
+    assert batch_sizes(api) == [4, 3]
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from theblockchainapi import models
+from theblockchainapi.serializer import Serializer, get_available_serializers
+
+BIG = {'amount': 2 ** 64 + 1, 'negative': -2 ** 63 - 1, 'items': [1, 'a', None, 2.5]}
+
+
+@pytest.fixture(params=get_available_serializers(), ids=lambda serializer: serializer.name)
+def serializer(request) -> Serializer:
+    return request.param
+
+
+def test_dumps_big_integers(serializer):
+    assert json.loads(serializer.dumps(BIG)) == BIG
+
+
+def test_loads_big_integers(serializer):
+    assert serializer.loads(json.dumps(BIG)) == BIG
+    assert serializer.loads(json.dumps(BIG).encode()) == BIG
+
+
+@pytest.mark.parametrize('value', [
+    -2 ** 63 - 1, -9999999999999999999, {'a': -9223372036854775809}, [-9300000000000000000], 2 ** 64 - 1, -2 ** 63
+])
+def test_loads_64_bit_limits(serializer, value):
+    decoded = serializer.loads(json.dumps(value))
+    assert decoded == value
+    assert json.dumps(decoded) == json.dumps(value)
+
+
+def test_dumps_error(serializer):
+    with pytest.raises(TypeError):
+        serializer.dumps({'value': object()})
+
+
+def test_loads_error(serializer):
+    with pytest.raises(ValueError):
+        serializer.loads(b'{"value": ')
+
+
+def test_encode_big_integers():
+    assert models._decode(models._encode(BIG)) == BIG
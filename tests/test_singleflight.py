@@ -0,0 +1,100 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from theblockchainapi import AsyncSolanaAPIResource, SingleFlight, SolanaAPIResource, SolanaNetwork
+from theblockchainapi.errors import NotFoundError
+from theblockchainapi.singleflight import Call
+
+TRANSACTION = {'slot': 1, 'block_time': 1650000000, 'meta': {'err': None}}
+
+
+def slow(status, body, delay=0.3):
+    def handler(method, path, request_body):
+        time.sleep(delay)
+        return status, body
+    return handler
+
+
+def get_all(resource, count: int) -> list:
+    barrier = threading.Barrier(count)
+
+    def get(_):
+        barrier.wait()
+        try:
+            return resource.get_solana_transaction('abc', network=SolanaNetwork.MAINNET_BETA)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(count) as pool:
+        return list(pool.map(get, range(count)))
+
+
+def test_coalesces(api, connect):
+    api.handler = slow(200, TRANSACTION)
+    singleflight = SingleFlight()
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey', singleflight=singleflight))
+    assert get_all(resource, 5) == [TRANSACTION] * 5
+    assert len(api.requests) == 1
+    assert singleflight.shared == 4
+    assert singleflight.in_flight == 0
+
+
+def test_shares_errors(api, connect):
+    api.handler = slow(404, {'error_message': 'Transaction not found.'})
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey', singleflight=SingleFlight()))
+    errors = get_all(resource, 5)
+    assert len(api.requests) == 1
+    assert all(isinstance(error, NotFoundError) and str(error) == 'Transaction not found.' for error in errors)
+    # Every waiter raises its own copy.
+    assert len({id(error) for error in errors}) == 5
+
+
+def test_cancelled_leader(api, connect):
+    api.handler = slow(200, TRANSACTION)
+
+    async def main():
+        singleflight = SingleFlight()
+        async with AsyncSolanaAPIResource('APIKeyID', 'APISecretKey', singleflight=singleflight) as resource:
+            connect(resource)
+            leader = asyncio.ensure_future(resource.get_solana_transaction('abc'))
+            await asyncio.sleep(0.05)
+            follower = asyncio.ensure_future(resource.get_solana_transaction('abc'))
+            await asyncio.sleep(0.05)
+            assert singleflight.shared == 1
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            # The follower is not cancelled: it sends the request itself.
+            assert await follower == TRANSACTION
+            assert singleflight.in_flight == 0
+
+    asyncio.run(main())
+    assert len(api.requests) == 2
+
+
+def test_abandoned_call():
+    singleflight = SingleFlight()
+    call, leader = singleflight.join('key')
+    assert leader
+    assert singleflight.join('key') == (call, False)
+    singleflight.abandon('key', call)
+    assert call.abandoned and call.wait() is None
+    new_call, leader = singleflight.join('key')
+    assert leader and new_call is not call
+
+
+def test_error_copies():
+    call = Call()
+    call.finish(error=NotFoundError('Not found.', status_code=404, endpoint='solana/transaction'))
+    errors = []
+    for _ in range(2):
+        with pytest.raises(NotFoundError) as info:
+            call.wait()
+        errors.append(info.value)
+    assert errors[0] is not errors[1]
+    assert errors[0].status_code == 404 and errors[0].endpoint == 'solana/transaction'
+    assert errors[0].__cause__ is call.error
@@ -0,0 +1,114 @@
+import asyncio
+import json
+
+import pytest
+
+from theblockchainapi import AsyncSolanaAPIResource, SolanaAPIResource
+
+MINTS = [f'mint{i}' for i in range(10)]
+
+
+def handler(method, path, body):
+    parts = path.split('/')
+    if path.startswith('solana/nft/candy_machine/'):
+        return 200, {'minted_nfts': MINTS, 'unminted_nfts': []}
+    if path.startswith('solana/nft/marketplaces/listing/'):
+        if parts[-1] == 'mint3':
+            return 200, {'price': 1}
+        return 404, {'error_message': 'The NFT is not listed.'}
+    if path.endswith('/owner'):
+        return 200, {'nft_owner': f'owner of {parts[-2]}'}
+    return 200, {'mint': parts[-1], 'is_mutable': True}
+
+
+def snapshot(resource, tmp_path, **kwargs):
+    return resource.snapshot_candy_machine(
+        'candy', output=str(tmp_path / 'snapshot.jsonl'), checkpoint=str(tmp_path / 'checkpoint'), **kwargs
+    )
+
+
+def read_output(tmp_path) -> list:
+    with open(tmp_path / 'snapshot.jsonl') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records(api, connect, tmp_path):
+    api.handler = handler
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey'))
+    results = list(snapshot(resource, tmp_path, ordered=True))
+    assert [result.item for result in results] == MINTS
+    assert results[3].value == {
+        'mint_address': 'mint3',
+        'metadata': {'mint': 'mint3', 'is_mutable': True},
+        'owner': 'owner of mint3',
+        'listing': {'price': 1}
+    }
+    assert results[0].value['listing'] is None
+    assert read_output(tmp_path) == [result.value for result in results]
+
+
+def test_resume(api, connect, tmp_path):
+    api.handler = handler
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey'))
+    results = snapshot(resource, tmp_path, ordered=True, concurrency=2)
+    for i, result in enumerate(results):
+        if i == 3:
+            break
+    # Interrupted after the fourth NFT.
+    results.close()
+    assert [record['mint_address'] for record in read_output(tmp_path)] == MINTS[:4]
+
+    progress = []
+    results = list(snapshot(resource, tmp_path, ordered=True, on_progress=progress.append))
+    assert [result.item for result in results] == MINTS[4:]
+    assert progress[-1].skipped == 4 and progress[-1].completed == 6
+    records = read_output(tmp_path)
+    assert sorted(record['mint_address'] for record in records) == MINTS
+    # Nothing is hydrated twice but the NFTs in flight when the first run stopped.
+    metadata_requests = [path for path in api.paths() if path.count('/') == 3 and path.startswith('solana/nft/devnet')]
+    assert len(metadata_requests) <= len(MINTS) + 2
+
+    # A third run has nothing left to do.
+    assert list(snapshot(resource, tmp_path)) == []
+
+
+def test_resume_after_cut_off_line(api, connect, tmp_path):
+    api.handler = handler
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey'))
+    with open(tmp_path / 'checkpoint', 'w') as f:
+        # The last line was cut off by a crash.
+        f.write('mint0\nmint1\nmin')
+    assert [result.item for result in snapshot(resource, tmp_path, ordered=True)] == MINTS[2:]
+
+
+def test_files_are_opened_lazily(tmp_path):
+    resource = SolanaAPIResource('APIKeyID', 'APISecretKey')
+    snapshot(resource, tmp_path)
+    assert not (tmp_path / 'checkpoint').exists()
+    assert not (tmp_path / 'snapshot.jsonl').exists()
+
+
+def test_unminted_nfts_are_refused(tmp_path):
+    resource = SolanaAPIResource('APIKeyID', 'APISecretKey')
+    with pytest.raises(Exception, match='unminted'):
+        snapshot(resource, tmp_path, nfts='unminted_nfts')
+
+
+def test_async_resume(api, connect, tmp_path):
+    api.handler = handler
+
+    async def run(stop=None) -> list:
+        async with AsyncSolanaAPIResource('APIKeyID', 'APISecretKey') as resource:
+            connect(resource)
+            items = []
+            results = snapshot(resource, tmp_path, ordered=True)
+            async for result in results:
+                items.append(result.item)
+                if len(items) == stop:
+                    break
+            await results.aclose()
+            return items
+
+    assert asyncio.run(run(stop=5)) == MINTS[:5]
+    assert asyncio.run(run()) == MINTS[5:]
+    assert sorted(record['mint_address'] for record in read_output(tmp_path)) == MINTS
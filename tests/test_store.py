@@ -0,0 +1,53 @@
+import pytest
+from requests import Response
+
+from theblockchainapi import MemoryTransactionStore, SolanaAPIResource, SolanaNetwork
+from theblockchainapi.store import is_final
+
+TRANSACTION = {'slot': 1, 'block_time': 1650000000, 'meta': {'err': None}, 'transaction': {'signatures': ['abc']}}
+
+
+@pytest.mark.parametrize('transaction, final', [
+    (TRANSACTION, True),
+    (dict(TRANSACTION, confirmation_status='finalized'), True),
+    (dict(TRANSACTION, confirmationStatus='confirmed'), True),
+    (dict(TRANSACTION, confirmation_status='processed'), False),
+    ({'hash': '0xabc', 'block_number': 123}, True),
+    ({'hash': '0xabc', 'blockNumber': None}, False),
+    ({'error_message': 'Not found'}, False),
+    (None, False),
+    (Response(), False)
+])
+def test_is_final(transaction, final):
+    assert is_final(transaction) == final
+
+
+def get_resource(response):
+    store = MemoryTransactionStore()
+    resource = SolanaAPIResource('APIKeyID', 'APISecretKey', transaction_store=store)
+    requests = []
+
+    def request(**kwargs):
+        requests.append(kwargs['endpoint'])
+        return response
+        yield
+
+    resource._request = request
+    return resource, store, requests
+
+
+def test_stores_final_transaction():
+    resource, store, requests = get_resource(TRANSACTION)
+    assert resource.get_solana_transaction('abc', network=SolanaNetwork.MAINNET_BETA) == TRANSACTION
+    assert resource.get_solana_transaction('abc', network=SolanaNetwork.MAINNET_BETA) == TRANSACTION
+    assert len(requests) == 1
+    assert store.get('solana/mainnet-beta', 'abc') == TRANSACTION
+
+
+@pytest.mark.parametrize('response', [dict(TRANSACTION, confirmation_status='processed'), Response()])
+def test_does_not_store_other_responses(response):
+    resource, store, requests = get_resource(response)
+    resource.get_solana_transaction('abc', network=SolanaNetwork.MAINNET_BETA)
+    resource.get_solana_transaction('abc', network=SolanaNetwork.MAINNET_BETA)
+    assert len(requests) == 2
+    assert len(store) == 0
@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from theblockchainapi.errors import APIError, InsufficientCreditError
+from theblockchainapi.streaming import JSONItemParser
+
+DOCUMENT = b'{"items": [1, 2.5, -3e10, 4.25E-3, 0, -0.5e+2, {"a": 1e5, "b": [7, "x"]}, true, null, 60]}'
+
+
+def parse(chunks, path=('items',)):
+    parser = JSONItemParser(path)
+    items = []
+    for chunk in chunks:
+        items += parser.feed(chunk)
+    items += parser.close()
+    return items
+
+
+@pytest.mark.parametrize('split', range(len(DOCUMENT) + 1))
+def test_every_split(split):
+    assert parse([DOCUMENT[:split], DOCUMENT[split:]]) == json.loads(DOCUMENT)['items']
+
+
+def test_every_byte_separately():
+    assert parse([DOCUMENT[i:i + 1] for i in range(len(DOCUMENT))]) == json.loads(DOCUMENT)['items']
+
+
+@pytest.mark.parametrize('chunks, expected', [
+    ([b'[1, 2.', b'5]'], [1, 2.5]),
+    ([b'[1e', b'5]'], [1e5]),
+    ([b'[-', b'1]'], [-1]),
+    ([b'12'], [12])
+])
+def test_number_at_end_of_chunk(chunks, expected):
+    assert parse(chunks, path=()) == expected
+
+
+def test_top_level_number():
+    parser = JSONItemParser()
+    assert parser.feed(b'12') == []
+    assert parser.feed(b'3') == []
+    assert parser.close() == [123]
+
+
+def test_object_members():
+    assert parse([b'{"a": 1, "b": ', b'[2]}'], path=()) == [('a', 1), ('b', [2])]
+
+
+def test_error_message():
+    parser = JSONItemParser(('items',), status_code=200, endpoint='solana/nft')
+    with pytest.raises(APIError) as info:
+        parser.feed(b'{"error_message": "Something went wrong."}')
+    assert type(info.value) is APIError
+    assert str(info.value) == 'Something went wrong.'
+    assert info.value.status_code == 200
+    assert info.value.endpoint == 'solana/nft'
+
+
+def test_error_message_mapping():
+    parser = JSONItemParser(('items',), status_code=402)
+    with pytest.raises(InsufficientCreditError):
+        parser.feed(b'{"error_message": "Out of credits."}')
+
+
+def test_truncated_response():
+    parser = JSONItemParser(('items',))
+    parser.feed(b'{"items": [1, 2')
+    with pytest.raises(Exception, match='expected `]`'):
+        parser.close()
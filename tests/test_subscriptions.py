@@ -0,0 +1,219 @@
+import asyncio
+import itertools
+import json
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+
+from theblockchainapi import AsyncBlockchainAPIResource
+from theblockchainapi.errors import APIConnectionError, RPCError
+from theblockchainapi.subscriptions import Overflow
+
+TIMEOUT = 5
+
+
+class StandInNode:
+    """
+    A local stand-in for the WebSocket RPC endpoint of a Solana node.
+    """
+
+    def __init__(self, refused=()):
+        self.refused = set(refused)
+        self.subscriptions = dict()
+        self.unsubscribed = []
+        self.connections = []
+        self.__ids = itertools.count(1)
+        self.__runner = None
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get('/', self.__handle)
+        self.__runner = web.AppRunner(app)
+        await self.__runner.setup()
+        site = web.TCPSite(self.__runner, '127.0.0.1', 0)
+        await site.start()
+        host, port = self.__runner.addresses[0][:2]
+        return f'ws://{host}:{port}/'
+
+    async def stop(self):
+        await self.__runner.cleanup()
+
+    async def __handle(self, request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.connections.append(ws)
+        try:
+            async for message in ws:
+                request = json.loads(message.data)
+                method = request['method']
+                if method in self.refused:
+                    response = {'code': -32602, 'message': f'Invalid params for `{method}`'}
+                    await ws.send_str(json.dumps({'jsonrpc': '2.0', 'id': request['id'], 'error': response}))
+                elif method.endswith('Unsubscribe'):
+                    self.subscriptions.pop(request['params'][0], None)
+                    self.unsubscribed.append((method, request['params'][0]))
+                    await ws.send_str(json.dumps({'jsonrpc': '2.0', 'id': request['id'], 'result': True}))
+                else:
+                    subscription_id = next(self.__ids)
+                    self.subscriptions[subscription_id] = (ws, method)
+                    await ws.send_str(json.dumps({'jsonrpc': '2.0', 'id': request['id'], 'result': subscription_id}))
+        finally:
+            for subscription_id, (subscription_ws, _) in list(self.subscriptions.items()):
+                if subscription_ws is ws:
+                    del self.subscriptions[subscription_id]
+        return ws
+
+    async def notify(self, method: str, result):
+        notification = method.replace('Subscribe', 'Notification')
+        for subscription_id, (ws, subscription_method) in list(self.subscriptions.items()):
+            if subscription_method == method:
+                await ws.send_str(json.dumps({
+                    'jsonrpc': '2.0',
+                    'method': notification,
+                    'params': {'subscription': subscription_id, 'result': result}
+                }))
+
+    async def drop(self):
+        for ws in self.connections:
+            await ws.close()
+        self.connections = []
+
+    async def wait_for(self, condition):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+def run(test, **kwargs):
+    async def main():
+        node = StandInNode(**kwargs.pop('node', dict()))
+        url = await node.start()
+        try:
+            async with AsyncBlockchainAPIResource('APIKeyID', 'APISecretKey', 'solana', 'devnet') as resource:
+                async with resource.get_subscription_client(url=url, reconnect_delay=0.01, **kwargs) as client:
+                    await asyncio.wait_for(test(node, client), TIMEOUT)
+        finally:
+            await node.stop()
+
+    asyncio.run(main())
+
+
+async def take(subscription, count: int) -> list:
+    return [await subscription.__anext__() for _ in range(count)]
+
+
+async def barrier(client):
+    # The acceptance of a new subscription arrives after every notification sent before it.
+    subscription = await client.account_subscribe('barrier')
+    await subscription.unsubscribe()
+
+
+def test_subscribe_and_deliver():
+    async def test(node, client):
+        subscription = await client.slot_subscribe()
+        assert subscription.subscribed
+        for slot in range(3):
+            await node.notify('slotSubscribe', {'slot': slot})
+        assert await take(subscription, 3) == [{'slot': 0}, {'slot': 1}, {'slot': 2}]
+
+    run(test)
+
+
+def test_callback():
+    async def test(node, client):
+        received = []
+        done = asyncio.Event()
+
+        async def callback(event):
+            received.append(event)
+            if len(received) == 2:
+                done.set()
+
+        await client.slot_subscribe(callback=callback)
+        await node.notify('slotSubscribe', {'slot': 1})
+        await node.notify('slotSubscribe', {'slot': 2})
+        await done.wait()
+        assert received == [{'slot': 1}, {'slot': 2}]
+
+    run(test)
+
+
+def test_refused():
+    async def test(node, client):
+        with pytest.raises(RPCError, match='Invalid params'):
+            await client.signature_subscribe('signature')
+
+    run(test, node=dict(refused=['signatureSubscribe']))
+
+
+def test_signature_once():
+    async def test(node, client):
+        subscription = await client.signature_subscribe('signature')
+        await node.notify('signatureSubscribe', {'err': None})
+        await node.notify('signatureSubscribe', {'err': 'ignored'})
+        assert [event async for event in subscription] == [{'err': None}]
+        assert subscription.done
+        assert subscription.dropped == 0
+
+    # The end of the subscription must not take the place of its event in a full queue.
+    run(test, max_queue=1)
+
+
+def test_unsubscribe_keeps_queued_events():
+    async def test(node, client):
+        subscription = await client.slot_subscribe()
+        for slot in range(3):
+            await node.notify('slotSubscribe', {'slot': slot})
+        await barrier(client)
+        await subscription.unsubscribe()
+        assert [event async for event in subscription] == [{'slot': 0}, {'slot': 1}, {'slot': 2}]
+        await node.wait_for(lambda: ('slotUnsubscribe', subscription.id) in node.unsubscribed)
+
+    run(test, max_queue=3)
+
+
+def test_overflow_block():
+    async def test(node, client):
+        subscription = await client.slot_subscribe()
+        for slot in range(5):
+            await node.notify('slotSubscribe', {'slot': slot})
+        assert await take(subscription, 5) == [{'slot': slot} for slot in range(5)]
+        assert subscription.dropped == 0
+
+    run(test, max_queue=2, overflow=Overflow.BLOCK)
+
+
+def test_overflow_drop_oldest():
+    async def test(node, client):
+        subscription = await client.slot_subscribe()
+        for slot in range(5):
+            await node.notify('slotSubscribe', {'slot': slot})
+        await barrier(client)
+        assert await take(subscription, 2) == [{'slot': 3}, {'slot': 4}]
+        assert subscription.dropped == 3
+
+    run(test, max_queue=2, overflow=Overflow.DROP_OLDEST)
+
+
+def test_reconnect_and_resubscribe():
+    async def test(node, client):
+        subscription = await client.slot_subscribe()
+        first_id = subscription.id
+        await node.drop()
+        await node.wait_for(lambda: client.connects == 2 and subscription.id != first_id)
+        await node.notify('slotSubscribe', {'slot': 1})
+        assert await take(subscription, 1) == [{'slot': 1}]
+
+    run(test)
+
+
+def test_unreachable():
+    async def main():
+        async with AsyncBlockchainAPIResource('APIKeyID', 'APISecretKey', 'solana', 'devnet') as resource:
+            # Nothing listens on port 9 (discard) locally.
+            async with resource.get_subscription_client(url='ws://127.0.0.1:9/') as client:
+                with pytest.raises(APIConnectionError):
+                    await asyncio.wait_for(client.slot_subscribe(), TIMEOUT)
+
+    asyncio.run(main())
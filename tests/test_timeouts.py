@@ -0,0 +1,100 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from theblockchainapi import AsyncSolanaAPIResource, SolanaAPIResource
+from theblockchainapi.errors import DeadlineExceededError
+from theblockchainapi.timeouts import TimeoutPolicy
+
+
+def test_defaults():
+    policy = TimeoutPolicy()
+    assert policy.get_timeout() == (10, 300)
+    assert policy.get_deadline('get_balance') is None
+
+
+@pytest.mark.parametrize('kwargs', [dict(read=None), dict(connect=None), dict(connect=None, read=None)])
+def test_no_timeout(kwargs):
+    policy = TimeoutPolicy(**kwargs)
+    assert policy.get_timeout() == (kwargs.get('connect', 10), kwargs.get('read', 300))
+
+
+@pytest.mark.parametrize('kwargs', [dict(read=301), dict(read=0), dict(connect=-1), dict(deadline='2')])
+def test_invalid(kwargs):
+    with pytest.raises(Exception):
+        TimeoutPolicy(**kwargs)
+
+
+def test_deadlines():
+    policy = TimeoutPolicy(deadline=30, deadlines={'get_balance': 2, 'get_*': 10, 'deploy_project': None})
+    assert policy.get_deadline('get_balance') == 2
+    assert policy.get_deadline('get_nft_metadata') == 10
+    assert policy.get_deadline('deploy_project') is None
+    assert policy.get_deadline('transfer') == 30
+
+
+def test_fit_to_deadline_without_read_timeout():
+    resource = SolanaAPIResource('APIKeyID', 'APISecretKey', timeouts=TimeoutPolicy(read=None))
+    args = resource._fit_to_deadline({'timeout': (10, None)}, time.monotonic() + 5)
+    connect, read = args['timeout']
+    assert 0 < connect <= 5 and 0 < read <= 5
+
+
+def long_signature(i: int) -> str:
+    return f'sig{i}'.ljust(SolanaAPIResource._STREAM_CHUNK_SIZE)
+
+
+def trickle(method, path, body):
+    """
+    A list of long signatures that takes about 4 seconds to arrive, one read chunk at a time.
+    """
+    def chunks():
+        yield b'['
+        for i in range(20):
+            time.sleep(0.2)
+            yield json.dumps(long_signature(i)).encode() + b', '
+        yield b'"last"]'
+    return 200, chunks()
+
+
+@pytest.mark.parametrize('prefetch', [0, 1])
+def test_streaming_default_deadline(api, connect, prefetch):
+    api.handler = trickle
+    timeouts = TimeoutPolicy(deadlines={'iter_wallet_transactions': 0.5})
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey', timeouts=timeouts))
+    signatures = []
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceededError):
+        for signature in resource.iter_wallet_transactions('public_key', prefetch=prefetch):
+            signatures.append(signature)
+    assert time.monotonic() - start < 1.5
+    # The signatures that arrived before the deadline.
+    assert 0 < len(signatures) < 20 and signatures[0] == long_signature(0)
+
+
+def test_streaming_deadline_starts_with_the_first_item(api, connect):
+    api.handler = lambda method, path, body: (200, {'minted_nfts': ['mint']})
+    resource = connect(SolanaAPIResource('APIKeyID', 'APISecretKey'))
+    nfts = resource.iter_all_nfts_from_candy_machine('candy', nfts='minted_nfts', deadline=0.2)
+    time.sleep(0.3)
+    assert list(nfts) == ['mint']
+
+
+def test_async_streaming_deadline(api, connect):
+    api.handler = trickle
+
+    async def main() -> list:
+        signatures = []
+        async with AsyncSolanaAPIResource('APIKeyID', 'APISecretKey') as resource:
+            connect(resource)
+            with pytest.raises(DeadlineExceededError):
+                async for signature in resource.iter_wallet_transactions('public_key', deadline=0.5):
+                    signatures.append(signature)
+        return signatures
+
+    start = time.monotonic()
+    signatures = asyncio.run(main())
+    assert time.monotonic() - start < 1.5
+    assert 0 < len(signatures) < 20
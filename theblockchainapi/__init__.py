@@ -1,6 +1,37 @@
 from theblockchainapi.resource import SolanaAPIResource, \
     SolanaNetwork, SolanaCurrencyUnit, SolanaNFTUploadMethod, SolanaMintAddresses, \
-    SearchMethod, SolanaWallet, DerivationPath
+    SearchMethod, SolanaWallet, DerivationPath, ScanCheck
 from theblockchainapi.developer_program_resource import Group, DeveloperProgramResource, Specification, Type
 from theblockchainapi.api_resource import \
     Blockchain, BlockchainNetwork, AvalancheChain, BlockchainAPIResource, Wallet, CurrencyUnit
+from theblockchainapi.errors import \
+    APIError, AuthenticationError, InsufficientCreditError, NotFoundError, RateLimitError, ServerError, \
+    RequestTimeoutError, DeadlineExceededError, APIConnectionError, CircuitOpenError, RPCError
+from theblockchainapi.transport import HTTPTransport, AsyncHTTPTransport
+from theblockchainapi.bulk import BulkResult, map_concurrent, amap_concurrent
+from theblockchainapi.rate_limit import RateLimiter, TokenBucket
+from theblockchainapi.retry import RetryPolicy, RetryBudget
+from theblockchainapi.timeouts import TimeoutPolicy
+from theblockchainapi.cache import ResponseCache, CacheBackend, MemoryCache, SQLiteCache
+from theblockchainapi.singleflight import SingleFlight
+from theblockchainapi.snapshot import SnapshotProgress
+from theblockchainapi.store import \
+    TransactionStore, MemoryTransactionStore, FileTransactionStore, SQLiteTransactionStore
+from theblockchainapi.streaming import JSONItemParser
+from theblockchainapi.circuit_breaker import CircuitBreaker, CircuitState
+from theblockchainapi.metrics import \
+    Instrumentation, RequestEvent, HistogramAggregator, OpenTelemetryExporter, PrometheusExporter, \
+    get_endpoint_template
+from theblockchainapi.models import Model, Balance, TokenHolding, NFTData, NFTMetadata, Transaction, CandyMachine
+from theblockchainapi.serializer import \
+    Serializer, OrjsonSerializer, MsgspecSerializer, UjsonSerializer, get_available_serializers, get_default_serializer
+from theblockchainapi.async_resource import \
+    AsyncAPIResource, AsyncSolanaAPIResource, AsyncBlockchainAPIResource, AsyncDeveloperProgramResource
+from theblockchainapi.hub import BlockchainAPIHub, AsyncBlockchainAPIHub
+from theblockchainapi.rpc import RPCBatcher, AsyncRPCBatcher
+from theblockchainapi.subscriptions import SubscriptionClient, Subscription, Overflow
+from theblockchainapi.export import \
+    ExportSchema, ExportWriter, export_responses, TOKEN_HOLDINGS, NFT_METADATA, MARKETPLACE_TRANSACTIONS
+from theblockchainapi.units import \
+    convert, convert_many, to_base_units, from_base_units, get_decimals, split_base_units
+from theblockchainapi.derivation import DerivationEngine
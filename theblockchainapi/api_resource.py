@@ -1,5 +1,17 @@
-from typing import Optional, List, Union
-from theblockchainapi.resource import APIResource
+from typing import Optional, List, Union, Iterable, Tuple
+from theblockchainapi.resource import APIResource, _api_method
+from theblockchainapi.bulk import BulkResult
+from theblockchainapi.errors import RPCError
+from theblockchainapi.transport import HTTPTransport, AsyncHTTPTransport
+from theblockchainapi.rate_limit import RateLimiter
+from theblockchainapi.retry import RetryPolicy
+from theblockchainapi.cache import ResponseCache
+from theblockchainapi.singleflight import SingleFlight
+from theblockchainapi.serializer import Serializer
+from theblockchainapi.metrics import Instrumentation
+from theblockchainapi.circuit_breaker import CircuitBreaker
+from theblockchainapi.timeouts import TimeoutPolicy
+from theblockchainapi.store import TransactionStore
 from enum import Enum
 
 
@@ -154,10 +166,34 @@ class BlockchainAPIResource(APIResource):
             str
         ],
         avalanche_chain: Optional[AvalancheChain] = None,
-        timeout=None
+        timeout=None,
+        transport: Optional[Union[HTTPTransport, AsyncHTTPTransport]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        singleflight: Optional[SingleFlight] = None,
+        serializer: Optional[Serializer] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeouts: Optional[TimeoutPolicy] = None,
+        transaction_store: Optional[TransactionStore] = None
     ):
 
-        super().__init__(api_key_id=api_key_id, api_secret_key=api_secret_key, timeout=timeout)
+        super().__init__(
+            api_key_id=api_key_id,
+            api_secret_key=api_secret_key,
+            timeout=timeout,
+            transport=transport,
+            rate_limiter=rate_limiter,
+            retry_policy=retry_policy,
+            cache=cache,
+            singleflight=singleflight,
+            serializer=serializer,
+            instrumentation=instrumentation,
+            circuit_breaker=circuit_breaker,
+            timeouts=timeouts,
+            transaction_store=transaction_store
+        )
 
         if isinstance(blockchain, str):
             try:
@@ -275,57 +311,127 @@ class BlockchainAPIResource(APIResource):
     def get_rpc_url(
         self
     ) -> str:
-        return f"{self._url}/{self.blockchain.value}/{self.network.value}/rpc"
+        return f"{self._url}{self.__get_rpc_endpoint()}"
+
+    def get_rpc_websocket_url(
+        self
+    ) -> str:
+        """
+        :return: The WebSocket URL of the RPC endpoint, for subscriptions. See `SubscriptionClient`
+        """
+        url = self.get_rpc_url()
+        if url.startswith('https://'):
+            return 'wss://' + url[len('https://'):]
+        if url.startswith('http://'):
+            return 'ws://' + url[len('http://'):]
+        return url
+
+    def __get_rpc_endpoint(self) -> str:
+        return f"{self.blockchain.value}/{self.network.value}/rpc"
 
+    @_api_method
     def make_rpc_request(
         self,
         method: str,
         params: object
     ) -> str:
-        response = self._request(
-            endpoint=self.get_rpc_url(),
+        response = yield from self._request(
+            endpoint=self.__get_rpc_endpoint(),
             payload={
                 'method': method,
                 'params': params
             },
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
+    def make_rpc_batch(
+        self,
+        calls: List[Tuple[str, object]],
+        idempotent: bool = False
+    ) -> List[BulkResult]:
+        """
+        Sends several JSON-RPC calls in one request, as a JSON-RPC batch. A call the node answers with an error does
+        not fail the others: its `RPCError` is captured in its `BulkResult`. See `RPCBatcher` to batch calls made
+        independently, e.g. from several threads.
+
+        :param calls: The calls, as `(method, params)` tuples, e.g. `[('getSlot', []), ('getBalance', [address])]`
+        :param idempotent: Whether the calls only read, so that the request is safe to retry
+        :return: A `BulkResult` per call, in the order of `calls`, whose `item` is the call and `value` its result
+        """
+        if len(calls) == 0:
+            return []
+        payload = [
+            {'jsonrpc': '2.0', 'id': index, 'method': method, 'params': params}
+            for index, (method, params) in enumerate(calls)
+        ]
+        endpoint = self.__get_rpc_endpoint()
+        response = yield from self._request(
+            endpoint=endpoint,
+            payload=payload,
+            request_method=self._RequestMethod.POST,
+            idempotent=idempotent
+        )
+        if isinstance(response, dict):
+            # The node rejected the batch as a whole.
+            error = self.__get_rpc_error(response.get('error'), endpoint)
+            return [BulkResult(index, call, error=error) for index, call in enumerate(calls)]
+
+        responses = {item.get('id'): item for item in response if isinstance(item, dict)}
+        results = []
+        for index, call in enumerate(calls):
+            item = responses.get(index)
+            if item is None:
+                results.append(BulkResult(index, call, error=RPCError("No response to the call.", endpoint=endpoint)))
+            elif item.get('error') is not None:
+                results.append(BulkResult(index, call, error=self.__get_rpc_error(item['error'], endpoint)))
+            else:
+                results.append(BulkResult(index, call, value=item.get('result')))
+        return results
+
+    @staticmethod
+    def __get_rpc_error(error, endpoint: str) -> RPCError:
+        if not isinstance(error, dict):
+            return RPCError(f"Invalid JSON-RPC response: {error}", endpoint=endpoint)
+        return RPCError(
+            str(error.get('message', 'Unknown error')),
+            code=error.get('code'),
+            data=error.get('data'),
+            endpoint=endpoint
+        )
+
     # -------------------------------------------------------------------------------------------- BEGIN: WALLET
 
+    @_api_method
     def generate_seed_phrase(
         self
     ) -> str:
         """
         https://docs.blockchainapi.com/#tag/Wallet/operation/generateSeedPhrase
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(),
             endpoint=f"{self.blockchain.value}/wallet/generate/secret_recovery_phrase",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['secret_recovery_phrase']
 
+    @_api_method
     def generate_private_key(
         self
     ) -> dict:
         """
         https://docs.blockchainapi.com/#tag/Wallet/operation/generatePrivateKey
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(),
             endpoint=f"{self.blockchain.value}/wallet/generate/private_key",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def derive_blockchain_identifier(
         self,
         wallet: Wallet
@@ -334,13 +440,12 @@ class BlockchainAPIResource(APIResource):
         https://docs.blockchainapi.com/#tag/Wallet/operation/derivePrivateKey
         """
 
-        response = self._request(
+        response = yield from self._request(
             payload=wallet.get_formatted_request_payload(),
             endpoint=f"{self.blockchain.value}/wallet/identifier",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
 
         if self.blockchain.value == Blockchain.SOLANA.value:
             return response['public_key']
@@ -352,6 +457,7 @@ class BlockchainAPIResource(APIResource):
         else:
             return response['hex_public_address']
 
+    @_api_method
     def derive_private_key(
         self,
         wallet: Wallet
@@ -359,15 +465,15 @@ class BlockchainAPIResource(APIResource):
         """
         https://docs.blockchainapi.com/#tag/Wallet/operation/deriveWalletIdentifier
         """
-        response = self._request(
+        response = yield from self._request(
             payload=wallet.get_formatted_request_payload(),
             endpoint=f"{self.blockchain.value}/wallet/private_key",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_balance(
         self,
         blockchain_identifier: str,
@@ -401,15 +507,43 @@ class BlockchainAPIResource(APIResource):
         if token_blockchain_identifier is not None:
             payload['token_blockchain_identifier'] = token_blockchain_identifier
 
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint=f"{self.blockchain.value}/wallet/balance",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    def get_balances(
+        self,
+        blockchain_identifiers: Iterable[str],
+        unit: Optional[Union[CurrencyUnit.SolanaCurrencyUnit, CurrencyUnit.EthereumCurrencyUnit, str]] = None,
+        token_blockchain_identifier: str = None,
+        concurrency: int = 10,
+        ordered: bool = True
+    ):
+        """
+        Calls `get_balance` for many blockchain identifiers concurrently. A failure for one identifier is captured in
+        its `BulkResult` instead of aborting the batch.
+        :param blockchain_identifiers:
+        :param unit:
+        :param token_blockchain_identifier:
+        :param concurrency: The maximum number of requests in flight
+        :param ordered: If True, yield results in input order. Otherwise, yield them as they complete.
+        :return: An iterator of `BulkResult` whose `item` is the blockchain identifier (an async iterator for async
+        resources)
+        """
+        return self.map_concurrent(
+            lambda blockchain_identifier: self.get_balance(
+                blockchain_identifier, unit=unit, token_blockchain_identifier=token_blockchain_identifier
+            ),
+            blockchain_identifiers,
+            concurrency=concurrency,
+            ordered=ordered
+        )
+
+    @_api_method
     def transfer(
         self,
         wallet: Optional[Wallet],
@@ -442,17 +576,15 @@ class BlockchainAPIResource(APIResource):
         if fee_payer_wallet is not None:
             payload["fee_payer_wallet"] = fee_payer_wallet.get_formatted_request_payload()['wallet']
 
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint=f"{self.blockchain.value}/wallet/transfer",
             request_method=self._RequestMethod.POST
         )
 
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
-
         return response
 
+    @_api_method
     def get_airdrop(
         self,
         recipient_address: str
@@ -460,21 +592,20 @@ class BlockchainAPIResource(APIResource):
         """
         https://docs.blockchainapi.com/#tag/Wallet/operation/getAirdrop
         """
-        response = self._request(
+        response = yield from self._request(
             payload={
                 "recipient_blockchain_identifier": recipient_address
             },
             endpoint=f"{self.blockchain.value}/wallet/airdrop",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['transaction_blockchain_identifier']
 
     # -------------------------------------------------------------------------------------------- END: WALLET
 
     # -------------------------------------------------------------------------------------------- BEGIN: TRANSACTION
 
+    @_api_method
     def get_transaction(
         self,
         transaction_blockchain_identifier: str
@@ -486,75 +617,91 @@ class BlockchainAPIResource(APIResource):
               f"transaction/" \
               f"{self.network.value}/" \
               f"{transaction_blockchain_identifier}"
-        response = self._request(
-            endpoint=url,
-            request_method=self._RequestMethod.GET
+        response = yield from self._request_transaction(
+            network=f"{self.blockchain.value}/{self.network.value}",
+            signature=transaction_blockchain_identifier,
+            endpoint=url
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
     # -------------------------------------------------------------------------------------------- END: TRANSACTION
 
     # -------------------------------------------------------------------------------------------- BEGIN: NAME SERVICE
 
+    @_api_method
     def get_name_from_blockchain_identifier(self, token_blockchain_identifier: str):
         url = f"{self.blockchain.value}/" \
               f"{self.network.value}/" \
               f"name_service/blockchain_identifier_to_name"
-        response = self._request(
+        response = yield from self._request(
             endpoint=url,
             payload={
                 'blockchain_identifier': token_blockchain_identifier
             },
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['name']
 
+    @_api_method
     def get_blockchain_identifier_from_name(self, name: str):
         url = f"{self.blockchain.value}/" \
               f"{self.network.value}/" \
               f"name_service/name_to_blockchain_identifier"
-        response = self._request(
+        response = yield from self._request(
             endpoint=url,
             payload={
                 'name': name
             },
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['blockchain_identifier']
 
     # -------------------------------------------------------------------------------------------- END: NAME SERVICE
 
     # -------------------------------------------------------------------------------------------- BEGIN: TOKENS
 
+    @_api_method
     def get_all_tokens(self):
         url = f"{self.blockchain.value}/" \
               f"{self.network.value}/" \
               f"all_tokens"
-        response = self._request(
+        response = yield from self._request(
             endpoint=url,
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    def iter_all_tokens(self, deadline: Optional[float] = None):
+        """
+        Like `get_all_tokens`, but streams the tokens one at a time as the response arrives, so that memory stays
+        bounded however many tokens there are. A list of tokens yields each token; a mapping yields
+        `(key, token)` pairs.
+        :param deadline: OPTIONAL: The number of seconds the whole stream may take, from the first item asked for.
+        Defaults to the method's default deadline. See `TimeoutPolicy`
+        :return: A generator of tokens (an async generator for async resources)
+        """
+        url = f"{self.blockchain.value}/" \
+              f"{self.network.value}/" \
+              f"all_tokens"
+        return self._iter_json_items(
+            endpoint=url,
+            request_method=self._RequestMethod.GET,
+            method_name='iter_all_tokens',
+            deadline=deadline
+        )
+
+    @_api_method
     def get_token_metadata(self, token_blockchain_identifier: str):
         url = f"{self.blockchain.value}/" \
               f"{self.network.value}/" \
               f"token/" \
               f"{token_blockchain_identifier}"
-        response = self._request(
+        response = yield from self._request(
             endpoint=url,
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
     # -------------------------------------------------------------------------------------------- END: WALLET
@@ -0,0 +1,278 @@
+import asyncio
+import time
+
+from theblockchainapi import bulk, streaming
+from theblockchainapi.api_resource import BlockchainAPIResource
+from theblockchainapi.developer_program_resource import DeveloperProgramResource
+from theblockchainapi.errors import DeadlineExceededError
+from theblockchainapi.resource import APIResource, SolanaAPIResource
+from theblockchainapi.streaming import JSONItemParser
+from theblockchainapi.subscriptions import SubscriptionClient
+from theblockchainapi.transport import AsyncHTTPTransport
+
+
+class AsyncAPIResource(APIResource):
+    """
+    Runs the request steps of every API method on the event loop instead of blocking a thread.
+
+    Combine it with a resource class to get an awaitable client with the same method surface, e.g.
+    `await AsyncSolanaAPIResource(...).get_balance(public_key)`. The payload building and response handling are the
+    ones of the sync class; only the I/O differs.
+    """
+
+    _transport_class = AsyncHTTPTransport
+
+    async def _perform(self, step, deadline=None):
+        """
+        Carries out a single request step on the event loop. Unlike the sync resource, a request in flight is cut off
+        when the deadline passes.
+        """
+        if isinstance(step, APIResource._Send):
+            if deadline is None:
+                return await self._transport.request(**step.args)
+            args = self._fit_to_deadline(step.args, deadline)
+            try:
+                return await asyncio.wait_for(self._transport.request(**args), self._get_remaining(deadline))
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError("The deadline of the call has passed.")
+        elif isinstance(step, APIResource._Sleep):
+            self._check_sleep(step.seconds, deadline)
+            await asyncio.sleep(step.seconds)
+            return None
+        elif isinstance(step, APIResource._Wait):
+            if deadline is None:
+                return await step.call.wait_async()
+            try:
+                return await asyncio.wait_for(step.call.wait_async(), self._get_remaining(deadline))
+            except asyncio.TimeoutError:
+                raise DeadlineExceededError("The deadline of the call has passed.")
+        elif isinstance(step, APIResource._Read):
+            if step.response._content is False:
+                # A streamed response: its body is still in the aiohttp response.
+                step.response._content = await step.response.raw.read()
+            return step.response.content
+        raise NotImplementedError(f"Unknown request step: `{type(step).__name__}`.")
+
+    async def _run(self, steps, deadline=None):
+        """
+        Drives a generator of request steps (see `_api_method`) to completion and returns its result.
+        """
+        try:
+            step = next(steps)
+            while True:
+                try:
+                    result = await self._perform(step, deadline)
+                except Exception as e:
+                    step = steps.throw(e)
+                else:
+                    step = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    def map_concurrent(self, func, items, concurrency: int = 10, ordered: bool = True):
+        """
+        Awaits `func(item)` for every item with at most `concurrency` calls in flight on the event loop. See
+        `APIResource.map_concurrent`.
+
+        :return: An async iterator of `BulkResult`
+        """
+        return bulk.amap_concurrent(func, items, concurrency=concurrency, ordered=ordered)
+
+    async def _iter_json_pages(
+        self,
+        endpoint,
+        request_method,
+        path=(),
+        payload=None,
+        params=None,
+        idempotent=None,
+        deadline=None
+    ):
+        """
+        Makes an API request and streams the items of a large list in its response. See
+        `APIResource._iter_json_pages`. A read in flight is cut off when the deadline passes.
+        :return: An async generator of pages
+        """
+        args = self._get_request_args(endpoint, request_method, payload=payload, params=params)
+        args['stream'] = True
+        if idempotent is None:
+            idempotent = request_method == self._RequestMethod.GET
+
+        event = self._start_event(args, endpoint)
+        try:
+            r = await self._run(self._send(endpoint, args, idempotent, event), deadline=deadline)
+            download_start = time.monotonic()
+            try:
+                parser = JSONItemParser(path, status_code=r.status_code, endpoint=endpoint)
+                while True:
+                    chunk = await self.__read_chunk(r, deadline)
+                    if not chunk:
+                        break
+                    if event is not None:
+                        event.bytes_in += len(chunk)
+                    page = parser.feed(chunk)
+                    if page:
+                        yield page
+                    if parser.done:
+                        return
+                page = parser.close()
+                if page:
+                    yield page
+            finally:
+                r.close()
+                if event is not None:
+                    event.add('download', time.monotonic() - download_start)
+        except Exception as e:
+            if event is not None:
+                event.error = type(e).__name__
+            raise
+        finally:
+            if event is not None:
+                self._finish_event(event)
+
+    async def __read_chunk(self, r, deadline) -> bytes:
+        """
+        :return: The next chunk of the body of the streamed response `r`, or `b''` at its end
+        """
+        if deadline is None:
+            return await r.raw.content.read(self._STREAM_CHUNK_SIZE)
+        remaining = self._get_remaining(deadline)
+        try:
+            return await asyncio.wait_for(r.raw.content.read(self._STREAM_CHUNK_SIZE), remaining)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("The deadline of the call has passed.")
+
+    async def _iter_json_items(
+        self,
+        endpoint,
+        request_method,
+        path=(),
+        payload=None,
+        params=None,
+        idempotent=None,
+        transform=None,
+        prefetch=0,
+        method_name=None,
+        deadline=None
+    ):
+        """
+        Streams the items of a large list in a response one at a time. See `APIResource._iter_json_items`.
+        :return: An async generator of items
+        """
+        pages = self._iter_json_pages(
+            endpoint,
+            request_method,
+            path=path,
+            payload=payload,
+            params=params,
+            idempotent=idempotent,
+            deadline=self._get_deadline(method_name, deadline)
+        )
+        if prefetch:
+            pages = streaming.aprefetch(pages, prefetch)
+        try:
+            async for page in pages:
+                done = False
+                if transform is not None:
+                    page, done = transform(page)
+                for item in page:
+                    yield item
+                if done:
+                    return
+        finally:
+            await pages.aclose()
+
+    async def _pipeline(self, tracker, items, func, concurrency, ordered):
+        """
+        Streams the items of an async iterator through `func`. See `APIResource._pipeline`.
+        :return: An async generator of `BulkResult`
+        """
+        async def select():
+            async for item in items:
+                if tracker.select(item):
+                    yield item
+
+        selected = select()
+        results = self.map_concurrent(func, selected, concurrency=concurrency, ordered=ordered)
+        try:
+            tracker.open()
+            async for result in results:
+                tracker.record(result)
+                yield result
+        finally:
+            await results.aclose()
+            await selected.aclose()
+            await items.aclose()
+            tracker.close()
+        tracker.finish()
+
+    async def close(self):
+        """
+        Closes the resource's transport. A transport passed in by the caller is left open, since it may be shared
+        with other resources.
+        """
+        if self._owns_transport:
+            await self._transport.close()
+
+    def __enter__(self):
+        raise Exception("Use `async with` for async resources.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class AsyncSolanaAPIResource(AsyncAPIResource, SolanaAPIResource):
+    """
+    The asyncio version of `SolanaAPIResource`. Every API method returns an awaitable.
+    """
+
+    async def _sync(self, results):
+        """
+        See `SolanaAPIResource.sync_wallet`.
+        """
+        signatures = []
+        error = None
+        async for result in results:
+            if result.ok:
+                signatures.append(result.item)
+            elif error is None:
+                error = result.error
+        if error is not None:
+            raise error
+        return signatures
+
+    async def _scan(self, scan, func, concurrency):
+        """
+        See `SolanaAPIResource.scan_derivation_paths`.
+        """
+        while not scan.done:
+            results = self.map_concurrent(func, scan.next_batch(), concurrency=concurrency, ordered=True)
+            try:
+                async for result in results:
+                    scan.record(result)
+                    yield result
+            finally:
+                await results.aclose()
+
+
+class AsyncBlockchainAPIResource(AsyncAPIResource, BlockchainAPIResource):
+    """
+    The asyncio version of `BlockchainAPIResource`. Every API method returns an awaitable.
+    """
+
+    def get_subscription_client(self, **kwargs) -> SubscriptionClient:
+        """
+        :param kwargs: The arguments of `SubscriptionClient`, e.g. `max_queue`
+        :return: A client for account, signature and slot subscriptions over a WebSocket to the chain's RPC endpoint.
+        It is asyncio only; the sync resources have no subscription client
+        """
+        return SubscriptionClient(self, **kwargs)
+
+
+class AsyncDeveloperProgramResource(AsyncAPIResource, DeveloperProgramResource):
+    """
+    The asyncio version of `DeveloperProgramResource`. Every API method returns an awaitable.
+    """
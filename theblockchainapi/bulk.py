@@ -0,0 +1,196 @@
+import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Optional, Tuple, Union
+
+
+class BulkResult:
+
+    def __init__(self, index: int, item: Any, value: Any = None, error: Optional[BaseException] = None):
+        """
+        The outcome of one call of a bulk operation.
+
+        :param index: The position of `item` in the input
+        :param item: The input the call was made with, e.g. a public key or a mint address
+        :param value: What the call returned. `None` if it failed
+        :param error: The exception the call raised, if it failed
+        """
+        self.index = index
+        self.item = item
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def get(self) -> Any:
+        """
+        Returns the value, or raises the captured error.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def __repr__(self):
+        if self.error is not None:
+            return f"BulkResult(index={self.index}, item={self.item!r}, error={self.error!r})"
+        return f"BulkResult(index={self.index}, item={self.item!r}, value={self.value!r})"
+
+
+class _PipelineTracker:
+    """
+    The bookkeeping of a pipeline, i.e. a lazy stream of items processed concurrently. See `APIResource._pipeline`.
+    """
+
+    def open(self):
+        """
+        Called when the pipeline starts, i.e. when its first result is asked for, e.g. to open files. `close` is
+        called even if it fails.
+        """
+
+    def select(self, item: Any) -> bool:
+        """
+        :return: Whether `item` must be processed, e.g. it was not processed by an earlier run
+        """
+        return True
+
+    def record(self, result: BulkResult):
+        """
+        Called with every result, before it is yielded.
+        """
+
+    def finish(self):
+        """
+        Called once every item has been processed and its result yielded.
+        """
+
+    def close(self):
+        """
+        Called when the pipeline stops, whether it finished or not.
+        """
+
+
+def _validate(concurrency: int):
+    if not isinstance(concurrency, int) or concurrency < 1:
+        raise Exception("`concurrency` must be an integer greater than or equal to 1.")
+
+
+def _call(func: Callable, index: int, item: Any) -> BulkResult:
+    try:
+        return BulkResult(index, item, value=func(item))
+    except Exception as e:
+        return BulkResult(index, item, error=e)
+
+
+def map_concurrent(
+    func: Callable[[Any], Any],
+    items: Iterable,
+    concurrency: int = 10,
+    ordered: bool = True
+) -> Iterator[BulkResult]:
+    """
+    Calls `func(item)` for every item on a pool of `concurrency` threads.
+
+    A failing call does not abort the batch: its exception is captured in the `BulkResult`. Items are consumed
+    lazily, so `items` may be a generator of any length. Stopping the iteration early cancels the calls that have not
+    started yet.
+
+    :param func: Any callable taking one item, e.g. `resource.get_nft_owner` or a `functools.partial` of it
+    :param items: The inputs
+    :param concurrency: The maximum number of calls in flight
+    :param ordered: If True, yield results in input order. Otherwise, yield them as they complete.
+    :return: An iterator of `BulkResult`
+    """
+    _validate(concurrency)
+    items = enumerate(items)
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        if ordered:
+            window = collections.deque()
+            for index, item in items:
+                window.append(executor.submit(_call, func, index, item))
+                if len(window) >= concurrency:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+        else:
+            pending = set()
+            for index, item in items:
+                pending.add(executor.submit(_call, func, index, item))
+                if len(pending) >= concurrency:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+async def _acall(func: Callable, index: int, item: Any) -> BulkResult:
+    try:
+        return BulkResult(index, item, value=await func(item))
+    except Exception as e:
+        return BulkResult(index, item, error=e)
+
+
+async def _aenumerate(items: Union[Iterable, AsyncIterable]) -> AsyncIterator[Tuple[int, Any]]:
+    if hasattr(items, '__aiter__'):
+        index = 0
+        async for item in items:
+            yield index, item
+            index += 1
+    else:
+        for index, item in enumerate(items):
+            yield index, item
+
+
+async def amap_concurrent(
+    func: Callable[[Any], Any],
+    items: Union[Iterable, AsyncIterable],
+    concurrency: int = 10,
+    ordered: bool = True
+) -> AsyncIterator[BulkResult]:
+    """
+    The asyncio version of `map_concurrent`: awaits `func(item)` for every item, with at most `concurrency` calls in
+    flight on the running event loop.
+
+    :param func: Any callable taking one item and returning an awaitable, e.g. `async_resource.get_nft_owner`
+    :param items: The inputs, possibly an async iterable
+    :param concurrency: The maximum number of calls in flight
+    :param ordered: If True, yield results in input order. Otherwise, yield them as they complete.
+    :return: An async iterator of `BulkResult`
+    """
+    _validate(concurrency)
+    items = _aenumerate(items)
+    if ordered:
+        window = collections.deque()
+    else:
+        window = set()
+    try:
+        async for index, item in items:
+            task = asyncio.ensure_future(_acall(func, index, item))
+            if ordered:
+                window.append(task)
+                if len(window) >= concurrency:
+                    yield await window.popleft()
+            else:
+                window.add(task)
+                if len(window) >= concurrency:
+                    done, window = await asyncio.wait(window, return_when=asyncio.FIRST_COMPLETED)
+                    for task_ in done:
+                        yield task_.result()
+        while window:
+            if ordered:
+                yield await window.popleft()
+            else:
+                done, window = await asyncio.wait(window, return_when=asyncio.FIRST_COMPLETED)
+                for task_ in done:
+                    yield task_.result()
+    finally:
+        for task in window:
+            task.cancel()
+        await items.aclose()
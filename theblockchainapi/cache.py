@@ -0,0 +1,289 @@
+import collections
+import fnmatch
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Union
+
+from theblockchainapi.store import is_final
+
+
+class CacheBackend:
+    """
+    Stores raw response bodies by key. Subclass it to plug in another store.
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        :return: The value stored under `key`, or `None` if it is missing or expired
+        """
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: float):
+        """
+        Stores `value` under `key` for `ttl` seconds.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = 64 * 1024 * 1024):
+        """
+        A thread-safe, in-process LRU cache.
+
+        :param max_entries: The maximum number of responses kept
+        :param max_bytes: OPTIONAL: The maximum total size of the responses kept, in bytes
+        """
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise Exception("`max_entries` must be an integer greater than or equal to 1.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.__entries = collections.OrderedDict()
+        self.__size = 0
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __pop(self, key: str):
+        value, _ = self.__entries.pop(key)
+        self.__size -= len(value)
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                self.__pop(key)
+                return None
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: float):
+        if self.max_bytes is not None and len(value) > self.max_bytes:
+            return
+        with self.__lock:
+            if key in self.__entries:
+                self.__pop(key)
+            self.__entries[key] = (value, time.monotonic() + ttl)
+            self.__size += len(value)
+            while len(self.__entries) > self.max_entries \
+                    or (self.max_bytes is not None and self.__size > self.max_bytes):
+                self.__pop(next(iter(self.__entries)))
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__size = 0
+
+
+class SQLiteCache(CacheBackend):
+
+    __EVICTION_INTERVAL = 64
+
+    def __init__(self, path: str, max_entries: int = 100000):
+        """
+        An LRU cache in a SQLite database, so that several worker processes on a machine share their results.
+
+        :param path: The path of the database file. It is created if it does not exist
+        :param max_entries: The maximum number of responses kept
+        """
+        if not isinstance(max_entries, int) or max_entries < 1:
+            raise Exception("`max_entries` must be an integer greater than or equal to 1.")
+        self.path = path
+        self.max_entries = max_entries
+        self.__lock = threading.Lock()
+        self.__writes = 0
+        self.__connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS response_cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self.__connection.execute(
+            "CREATE INDEX IF NOT EXISTS response_cache_accessed_at ON response_cache (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT value FROM response_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                return None
+            self.__connection.execute("UPDATE response_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return bytes(row[0])
+
+    def set(self, key: str, value: bytes, ttl: float):
+        now = time.time()
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO response_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, value, now + ttl, now)
+            )
+            self.__writes += 1
+            if self.__writes % SQLiteCache.__EVICTION_INTERVAL == 0:
+                self.__evict(now)
+
+    def __evict(self, now: float):
+        self.__connection.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+        self.__connection.execute(
+            "DELETE FROM response_cache WHERE key IN ("
+            "SELECT key FROM response_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def clear(self):
+        with self.__lock:
+            self.__connection.execute("DELETE FROM response_cache")
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
+
+
+def _immutable_nft_ttl(response: Any) -> Optional[float]:
+    """
+    NFT metadata can only be cached once it can no longer change.
+    """
+    if isinstance(response, dict) and response.get('is_mutable') is False:
+        return 24 * 60 * 60
+    return None
+
+
+def _final_transaction_ttl(response: Any) -> Optional[float]:
+    """
+    A transaction can only be cached once it is confirmed or finalized: a pending transaction, or one not found yet,
+    will change.
+    """
+    if is_final(response):
+        return 24 * 60 * 60
+    return None
+
+
+class ResponseCache:
+
+    # Patterns are shell-style and matched against the endpoint path, in order. `*` also matches `/`.
+    DEFAULT_TTLS = {
+        'solana/transaction/*': _final_transaction_ttl,
+        '*/transaction/*': _final_transaction_ttl,
+        'solana/nft/candy_machine_id': 24 * 60 * 60,
+        'solana/nft/candy_machine/list': 10 * 60,
+        '*/all_tokens': 10 * 60,
+        'solana/nft/mint/fee': 10 * 60,
+        'solana/nft/marketplaces/*': None,
+        'solana/nft/*/*/*': None,
+        'solana/nft/*/*': _immutable_nft_ttl
+    }
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        ttls: Optional[Dict[str, Union[float, Callable[[Any], Optional[float]], None]]] = None
+    ):
+        """
+        Caches the responses of idempotent requests, such as `get_solana_transaction` or `get_all_tokens`.
+
+        Only endpoints matching a TTL policy are cached. A policy is a number of seconds, a callable that receives
+        the decoded response and returns a number of seconds (or `None` not to cache it), or `None` to never cache.
+        Error responses are never cached.
+
+        Cache keys include the API key ID (hashed), the endpoint, which contains the network for GET requests, and
+        the canonical payload and query parameters, which contain it for POST requests.
+
+        :param backend: OPTIONAL: Where responses are stored. Defaults to `MemoryCache()`. Use `SQLiteCache` to share
+        the cache between processes
+        :param ttls: OPTIONAL: The TTL policy per endpoint pattern. Defaults to `ResponseCache.DEFAULT_TTLS`
+        """
+        if backend is None:
+            backend = MemoryCache()
+        elif not isinstance(backend, CacheBackend):
+            raise Exception("`backend` must be an instance of `CacheBackend`, e.g. `MemoryCache` or `SQLiteCache`.")
+        if ttls is not None and not isinstance(ttls, dict):
+            raise Exception("`ttls` must be a `dict` mapping an endpoint pattern to a TTL policy.")
+
+        self.backend = backend
+        self.ttls = dict(ResponseCache.DEFAULT_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self.__lock = threading.Lock()
+
+    def get_policy(self, endpoint: str):
+        """
+        :return: The TTL policy of `endpoint`, or `None` if it is never cached
+        """
+        for pattern, policy in self.ttls.items():
+            if fnmatch.fnmatchcase(endpoint, pattern):
+                return policy
+        return None
+
+    @staticmethod
+    def get_key(
+        api_key_id: str,
+        request_method: str,
+        endpoint: str,
+        payload: Optional[dict] = None,
+        params: Optional[dict] = None
+    ) -> str:
+        canonical = json.dumps(
+            [
+                hashlib.sha256(api_key_id.encode()).hexdigest(),
+                request_method,
+                endpoint,
+                payload or None,
+                params or None
+            ],
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def lookup(self, endpoint: str, key: str) -> Optional[bytes]:
+        """
+        :return: The cached body of a response, or `None`. Counts a hit or a miss for cacheable endpoints.
+        """
+        if self.get_policy(endpoint) is None:
+            return None
+        value = self.backend.get(key)
+        with self.__lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def store(self, endpoint: str, key: str, content: bytes, response: Any):
+        """
+        Stores the body `content` of a response, whose decoded form is `response`, if its endpoint's policy allows.
+        """
+        if isinstance(response, dict) and 'error_message' in response:
+            return
+        policy = self.get_policy(endpoint)
+        ttl = policy(response) if callable(policy) else policy
+        if ttl is not None and ttl > 0:
+            self.backend.set(key, content, ttl)
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+    def clear(self):
+        self.backend.clear()
+        with self.__lock:
+            self.hits = 0
+            self.misses = 0
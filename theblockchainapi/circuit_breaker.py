@@ -0,0 +1,293 @@
+import collections
+import fnmatch
+import threading
+import time
+from enum import Enum
+from typing import Callable, Dict, Optional, Sequence
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class Circuit:
+
+    def __init__(
+        self,
+        family: str,
+        failure_rate_threshold: float,
+        slow_call_duration: Optional[float],
+        slow_call_rate_threshold: float,
+        window: int,
+        min_calls: int,
+        open_duration: float,
+        half_open_max_calls: int,
+        on_state_change: Optional[Callable[[str, CircuitState, CircuitState], None]] = None
+    ):
+        """
+        The circuit of one endpoint family. See `CircuitBreaker`.
+        """
+        self.family = family
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.window = window
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+
+        self.__state = CircuitState.CLOSED
+        # One `[second, calls, failures, slow_calls]` per second of the window with any call.
+        self.__buckets = collections.deque()
+        self.__opened_at = None
+        self.__probes = 0
+        self.__probe_successes = 0
+        # Bumped on every transition, so that outcomes of calls permitted in an earlier state are ignored.
+        self.__generation = 0
+        self.__lock = threading.Lock()
+
+    def __transition(self, state: CircuitState, now: float):
+        previous, self.__state = self.__state, state
+        self.__generation += 1
+        self.__buckets.clear()
+        self.__probes = 0
+        self.__probe_successes = 0
+        self.__opened_at = now if state == CircuitState.OPEN else None
+        return previous
+
+    def __notify(self, previous: Optional[CircuitState], state: CircuitState):
+        if previous is not None and previous != state and self.on_state_change is not None:
+            self.on_state_change(self.family, previous, state)
+
+    def __update(self, now: float) -> Optional[CircuitState]:
+        """
+        Half-opens the circuit once it has been open long enough.
+        :return: The previous state, if it changed
+        """
+        if self.__state == CircuitState.OPEN and now - self.__opened_at >= self.open_duration:
+            return self.__transition(CircuitState.HALF_OPEN, now)
+        return None
+
+    @property
+    def state(self) -> CircuitState:
+        with self.__lock:
+            previous = self.__update(time.monotonic())
+            state = self.__state
+        self.__notify(previous, state)
+        return state
+
+    def acquire(self) -> Optional[int]:
+        """
+        Asks to send a request.
+        :return: A permit to pass to `release`, or `None` if the request must fail fast
+        """
+        with self.__lock:
+            previous = self.__update(time.monotonic())
+            state = self.__state
+            if state == CircuitState.OPEN:
+                permit = None
+            elif state == CircuitState.HALF_OPEN and self.__probes >= self.half_open_max_calls:
+                permit = None
+            else:
+                if state == CircuitState.HALF_OPEN:
+                    self.__probes += 1
+                permit = self.__generation
+        self.__notify(previous, state)
+        return permit
+
+    def get_retry_after(self) -> Optional[float]:
+        """
+        :return: The number of seconds until the circuit half-opens, or `None` if it is not open
+        """
+        with self.__lock:
+            if self.__state != CircuitState.OPEN:
+                return None
+            return max(0.0, self.__opened_at + self.open_duration - time.monotonic())
+
+    def release(self, permit: int, failed: Optional[bool], duration: float = 0.0):
+        """
+        Records the outcome of a request sent with `permit`.
+
+        :param failed: Whether the API failed to handle the request, or `None` if it was abandoned without an outcome
+        :param duration: The time the request took, in seconds
+        """
+        now = time.monotonic()
+        slow = self.slow_call_duration is not None and duration >= self.slow_call_duration
+        previous = None
+        with self.__lock:
+            if permit != self.__generation:
+                return
+            if self.__state == CircuitState.HALF_OPEN:
+                self.__probes -= 1
+                if failed is None:
+                    return
+                if failed or slow:
+                    previous = self.__transition(CircuitState.OPEN, now)
+                else:
+                    self.__probe_successes += 1
+                    if self.__probe_successes >= self.half_open_max_calls:
+                        previous = self.__transition(CircuitState.CLOSED, now)
+            elif self.__state == CircuitState.CLOSED and failed is not None:
+                previous = self.__record(now, failed, slow)
+            state = self.__state
+        self.__notify(previous, state)
+
+    def __record(self, now: float, failed: bool, slow: bool) -> Optional[CircuitState]:
+        second = int(now)
+        while self.__buckets and self.__buckets[0][0] <= second - self.window:
+            self.__buckets.popleft()
+        if not self.__buckets or self.__buckets[-1][0] != second:
+            self.__buckets.append([second, 0, 0, 0])
+        bucket = self.__buckets[-1]
+        bucket[1] += 1
+        bucket[2] += failed
+        bucket[3] += slow
+
+        calls, failures, slow_calls = self.__count()
+        if calls < self.min_calls:
+            return None
+        if failures / calls >= self.failure_rate_threshold or (
+            self.slow_call_duration is not None and slow_calls / calls >= self.slow_call_rate_threshold
+        ):
+            return self.__transition(CircuitState.OPEN, now)
+        return None
+
+    def __count(self):
+        calls = failures = slow_calls = 0
+        for _, bucket_calls, bucket_failures, bucket_slow_calls in self.__buckets:
+            calls += bucket_calls
+            failures += bucket_failures
+            slow_calls += bucket_slow_calls
+        return calls, failures, slow_calls
+
+    def get_stats(self) -> dict:
+        with self.__lock:
+            previous = self.__update(time.monotonic())
+            state = self.__state
+            calls, failures, slow_calls = self.__count()
+            stats = {
+                'state': state.value,
+                'calls': calls,
+                'failure_rate': failures / calls if calls else 0.0,
+                'slow_call_rate': slow_calls / calls if calls else 0.0
+            }
+        self.__notify(previous, state)
+        return stats
+
+
+class CircuitBreaker:
+
+    # Families that degrade independently of the rest of their path. Other endpoints belong to the family of their
+    # first two path segments, e.g. `solana/wallet/*`.
+    DEFAULT_FAMILIES = (
+        'solana/nft/marketplaces/*',
+        'solana/nft/candy_machine*'
+    )
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        slow_call_duration: Optional[float] = None,
+        slow_call_rate_threshold: float = 0.5,
+        window: int = 60,
+        min_calls: int = 20,
+        open_duration: float = 30,
+        half_open_max_calls: int = 1,
+        families: Sequence[str] = DEFAULT_FAMILIES,
+        on_state_change: Optional[Callable[[str, CircuitState, CircuitState], None]] = None
+    ):
+        """
+        A circuit breaker per endpoint family, so that one degraded group of endpoints fails fast with a
+        `CircuitOpenError` instead of tying up threads until it times out, while the others keep working.
+
+        Each family's circuit is CLOSED at first and counts the outcome of every attempt over the last `window`
+        seconds. Server errors (5xx), timeouts and connection failures count as failures; other errors, such as 404s
+        or 429s, do not. Once there were at least `min_calls` calls and the failure rate, or the rate of calls
+        slower than `slow_call_duration`, reaches its threshold, the circuit OPENs: requests fail fast for
+        `open_duration` seconds. It then goes HALF_OPEN and lets `half_open_max_calls` probe requests through. It
+        CLOSEs if they all succeed quickly, and OPENs again otherwise.
+
+        Share one instance between resources to share the circuits.
+
+        :param failure_rate_threshold: The failure rate, between 0 and 1, at which a circuit opens
+        :param slow_call_duration: OPTIONAL: The number of seconds from which a call counts as slow. Slow calls are
+        not counted by default
+        :param slow_call_rate_threshold: The rate of slow calls, between 0 and 1, at which a circuit opens
+        :param window: The number of seconds over which outcomes are counted
+        :param min_calls: The minimum number of calls in the window before a circuit may open
+        :param open_duration: The number of seconds a circuit stays open before probing
+        :param half_open_max_calls: The number of probe requests let through when half-open
+        :param families: Shell-style endpoint patterns, e.g. `solana/nft/marketplaces/*`, each forming a family.
+        The first matching pattern wins
+        :param on_state_change: OPTIONAL: Called with the family, the previous state and the new state on every
+        transition
+        """
+        if not 0 < failure_rate_threshold <= 1 or not 0 < slow_call_rate_threshold <= 1:
+            raise Exception("`failure_rate_threshold` and `slow_call_rate_threshold` must be between 0 and 1.")
+        if slow_call_duration is not None and slow_call_duration <= 0:
+            raise Exception("`slow_call_duration` must be greater than 0.")
+        if not isinstance(window, int) or window < 1:
+            raise Exception("`window` must be an integer greater than or equal to 1.")
+        if not isinstance(min_calls, int) or min_calls < 1:
+            raise Exception("`min_calls` must be an integer greater than or equal to 1.")
+        if open_duration < 0:
+            raise Exception("`open_duration` must be greater than or equal to 0.")
+        if not isinstance(half_open_max_calls, int) or half_open_max_calls < 1:
+            raise Exception("`half_open_max_calls` must be an integer greater than or equal to 1.")
+
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.window = window
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        self.families = tuple(families)
+        self.on_state_change = on_state_change
+        self.__circuits: Dict[str, Circuit] = dict()
+        self.__lock = threading.Lock()
+
+    def get_family(self, endpoint: str) -> str:
+        for pattern in self.families:
+            if fnmatch.fnmatchcase(endpoint, pattern):
+                return pattern
+        return '/'.join(endpoint.split('/')[:2]) + '/*'
+
+    def get_circuit(self, endpoint: str) -> Circuit:
+        family = self.get_family(endpoint)
+        circuit = self.__circuits.get(family)
+        if circuit is None:
+            with self.__lock:
+                circuit = self.__circuits.get(family)
+                if circuit is None:
+                    circuit = self.__circuits[family] = Circuit(
+                        family,
+                        failure_rate_threshold=self.failure_rate_threshold,
+                        slow_call_duration=self.slow_call_duration,
+                        slow_call_rate_threshold=self.slow_call_rate_threshold,
+                        window=self.window,
+                        min_calls=self.min_calls,
+                        open_duration=self.open_duration,
+                        half_open_max_calls=self.half_open_max_calls,
+                        on_state_change=self.on_state_change
+                    )
+        return circuit
+
+    def get_states(self) -> Dict[str, CircuitState]:
+        """
+        :return: The state of every family called so far
+        """
+        with self.__lock:
+            circuits = list(self.__circuits.values())
+        return {circuit.family: circuit.state for circuit in circuits}
+
+    def get_stats(self) -> Dict[str, dict]:
+        """
+        :return: The state, number of calls, failure rate and slow call rate in the window of every family
+        """
+        with self.__lock:
+            circuits = list(self.__circuits.values())
+        return {circuit.family: circuit.get_stats() for circuit in circuits}
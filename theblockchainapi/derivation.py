@@ -0,0 +1,525 @@
+"""
+Local wallet key derivation: BIP39 secret recovery phrases to ed25519 keys for Solana (SLIP-0010) and secp256k1 keys
+for EVM chains (BIP32), with the same answers as the API's `derive_public_key`, `derive_private_key` and
+`derive_blockchain_identifier`, but without sending the secret over the network.
+
+Everything is implemented in Python. If they are installed, `cryptography` computes ed25519 public keys and
+`pycryptodome` Keccak-256 hashes, several times faster.
+"""
+import hashlib
+import hmac
+import os
+import unicodedata
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519
+except ImportError:
+    serialization = None
+
+try:
+    from Crypto.Hash import keccak
+except ImportError:
+    keccak = None
+
+
+_PHANTOM_PATH = "m/44/501/0/0"
+_EVM_PATH = "m/44'/60'/0'/0/0"
+_HARDENED = 0x80000000
+_B58_ALPHABET = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+_B58_INDEX = {character: index for index, character in enumerate(_B58_ALPHABET)}
+
+
+def b58encode(data: bytes) -> str:
+    number = int.from_bytes(data, 'big')
+    encoded = []
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded.append(_B58_ALPHABET[remainder])
+    # Each leading zero byte is a leading '1'.
+    zeros = len(data) - len(data.lstrip(b'\0'))
+    return '1' * zeros + ''.join(reversed(encoded))
+
+
+def b58decode(data: str) -> bytes:
+    number = 0
+    for character in data:
+        if character not in _B58_INDEX:
+            raise Exception(f"`{character}` is not a base58 character.")
+        number = number * 58 + _B58_INDEX[character]
+    zeros = len(data) - len(data.lstrip('1'))
+    return b'\0' * zeros + number.to_bytes((number.bit_length() + 7) // 8, 'big')
+
+
+def mnemonic_to_seed(secret_recovery_phrase: str, passphrase: str = str()) -> bytes:
+    """
+    :param secret_recovery_phrase: A BIP39 secret recovery phrase. Its checksum is not verified
+    :param passphrase: OPTIONAL: The BIP39 passphrase
+    :return: The 64-byte BIP39 seed
+    """
+    if not isinstance(secret_recovery_phrase, str):
+        raise Exception("`secret_recovery_phrase` must be a `str`.")
+    phrase = unicodedata.normalize('NFKD', ' '.join(secret_recovery_phrase.split()))
+    salt = unicodedata.normalize('NFKD', 'mnemonic' + (passphrase or str()))
+    return hashlib.pbkdf2_hmac('sha512', phrase.encode(), salt.encode(), 2048)
+
+
+def parse_derivation_path(derivation_path: str) -> Tuple[int, ...]:
+    """
+    :param derivation_path: e.g. `m/44'/60'/0'/0/0`. Indices marked with `'` or `h` are hardened
+    :return: The child indices, with `0x80000000` added to hardened ones
+    """
+    parts = derivation_path.strip().split('/')
+    if parts[0] != 'm':
+        raise Exception(f"`{derivation_path}` is not a derivation path. Example: `m/44'/501'/0'/0'`.")
+    indices = []
+    for part in parts[1:]:
+        hardened = part[-1:] in ("'", 'h', 'H')
+        number = part[:-1] if hardened else part
+        if not number.isdigit() or int(number) >= _HARDENED:
+            raise Exception(f"`{part}` is not a valid index of the derivation path `{derivation_path}`.")
+        indices.append(int(number) + _HARDENED if hardened else int(number))
+    return tuple(indices)
+
+
+def _get_path(derivation_path) -> str:
+    if isinstance(derivation_path, Enum):
+        derivation_path = derivation_path.value
+    if not isinstance(derivation_path, str):
+        raise Exception("`derivation_path` must be a `str` or instance of the enum `DerivationPath`.")
+    return derivation_path
+
+
+# ed25519 (RFC 8032)
+
+_ED_P = 2 ** 255 - 19
+_ED_D = -121665 * pow(121666, _ED_P - 2, _ED_P) % _ED_P
+_ED_D2 = 2 * _ED_D % _ED_P
+_ED_B = (
+    15112221349535400772501151409588531511454012693041857206046113283949847762202,
+    46316835694926478169428394003475163141307993866256225615783033603165251855960
+)
+_ed_table = None
+
+
+def _ed_add(p1: tuple, p2: tuple) -> tuple:
+    # Extended coordinates. The formula is complete: it also doubles.
+    x1, y1, z1, t1 = p1
+    x2, y2, z2, t2 = p2
+    a = (y1 - x1) * (y2 - x2) % _ED_P
+    b = (y1 + x1) * (y2 + x2) % _ED_P
+    c = t1 * _ED_D2 * t2 % _ED_P
+    d = 2 * z1 * z2 % _ED_P
+    e, f, g, h = b - a, d - c, d + c, b + a
+    return e * f % _ED_P, g * h % _ED_P, f * g % _ED_P, e * h % _ED_P
+
+
+def _get_ed_table() -> list:
+    # `table[i][j]` is `j * 16 ** i * B`, as `(y + x, y - x, 2 * d * x * y)`, so that a public key takes 64 additions.
+    global _ed_table
+    if _ed_table is None:
+        table = []
+        base = (_ED_B[0], _ED_B[1], 1, _ED_B[0] * _ED_B[1] % _ED_P)
+        for _ in range(64):
+            row = [None, base]
+            for _ in range(14):
+                row.append(_ed_add(row[-1], base))
+            base = _ed_add(row[-1], base)
+            for j in range(1, 16):
+                x, y, z, _ = row[j]
+                inverse = pow(z, -1, _ED_P)
+                x, y = x * inverse % _ED_P, y * inverse % _ED_P
+                row[j] = ((y + x) % _ED_P, (y - x) % _ED_P, _ED_D2 * x * y % _ED_P)
+            table.append(row)
+        _ed_table = table
+    return _ed_table
+
+
+def _ed25519_public_key(secret: bytes) -> bytes:
+    if serialization is not None:
+        return ed25519.Ed25519PrivateKey.from_private_bytes(secret).public_key().public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        )
+    digest = hashlib.sha512(secret).digest()
+    scalar = int.from_bytes(digest[:32], 'little')
+    scalar &= (1 << 254) - 8
+    scalar |= 1 << 254
+    table = _get_ed_table()
+    x, y, z, t = 0, 1, 1, 0
+    for i in range(64):
+        j = (scalar >> (4 * i)) & 15
+        if j:
+            sum_yx, diff_yx, t2d = table[i][j]
+            a = (y - x) * diff_yx % _ED_P
+            b = (y + x) * sum_yx % _ED_P
+            c = t * t2d % _ED_P
+            d = 2 * z % _ED_P
+            e, f, g, h = b - a, d - c, d + c, b + a
+            x, y, z, t = e * f % _ED_P, g * h % _ED_P, f * g % _ED_P, e * h % _ED_P
+    inverse = pow(z, -1, _ED_P)
+    x, y = x * inverse % _ED_P, y * inverse % _ED_P
+    return (y | (x & 1) << 255).to_bytes(32, 'little')
+
+
+# secp256k1 (SEC 2)
+
+_K_P = 2 ** 256 - 2 ** 32 - 977
+_K_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+_K_G = (
+    0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+    0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8
+)
+_k_table = None
+
+
+def _k_double(point: Optional[tuple]) -> Optional[tuple]:
+    # Jacobian coordinates. `None` is the point at infinity.
+    if point is None or point[1] == 0:
+        return None
+    x, y, z = point
+    yy = y * y % _K_P
+    s = 4 * x * yy % _K_P
+    m = 3 * x * x % _K_P
+    x3 = (m * m - 2 * s) % _K_P
+    return x3, (m * (s - x3) - 8 * yy * yy) % _K_P, 2 * y * z % _K_P
+
+
+def _k_add_affine(point: Optional[tuple], affine: tuple) -> Optional[tuple]:
+    if point is None:
+        return affine[0], affine[1], 1
+    x1, y1, z1 = point
+    zz = z1 * z1 % _K_P
+    h = (affine[0] * zz - x1) % _K_P
+    r = (affine[1] * zz * z1 - y1) % _K_P
+    if h == 0:
+        return _k_double(point) if r == 0 else None
+    hh = h * h % _K_P
+    hhh = h * hh % _K_P
+    v = x1 * hh % _K_P
+    x3 = (r * r - hhh - 2 * v) % _K_P
+    return x3, (r * (v - x3) - y1 * hhh) % _K_P, z1 * h % _K_P
+
+
+def _k_to_affine(point: tuple) -> tuple:
+    x, y, z = point
+    inverse = pow(z, -1, _K_P)
+    zz = inverse * inverse % _K_P
+    return x * zz % _K_P, y * zz * inverse % _K_P
+
+
+def _get_k_table() -> list:
+    # `table[i][j]` is `j * 16 ** i * G` in affine coordinates.
+    global _k_table
+    if _k_table is None:
+        table = []
+        base = _K_G
+        for _ in range(64):
+            row = [None, base]
+            for _ in range(14):
+                row.append(_k_to_affine(_k_add_affine((row[-1][0], row[-1][1], 1), base)))
+            table.append(row)
+            base = _k_to_affine(_k_add_affine((row[-1][0], row[-1][1], 1), base))
+        _k_table = table
+    return _k_table
+
+
+def _secp256k1_public_key(private_key: int) -> Tuple[int, int]:
+    # Faster than `cryptography`'s `ec.derive_private_key`, which validates the key it builds.
+    table = _get_k_table()
+    point = None
+    for i in range(64):
+        j = (private_key >> (4 * i)) & 15
+        if j:
+            point = _k_add_affine(point, table[i][j])
+    return _k_to_affine(point)
+
+
+def _compress(public_key: Tuple[int, int]) -> bytes:
+    return bytes([2 + (public_key[1] & 1)]) + public_key[0].to_bytes(32, 'big')
+
+
+# Keccak-256, as used by Ethereum. It pads differently from `hashlib.sha3_256`.
+
+_KECCAK_ROUND_CONSTANTS = (
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A, 0x8000000080008000,
+    0x000000000000808B, 0x0000000080000001, 0x8000000080008081, 0x8000000000008009,
+    0x000000000000008A, 0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089, 0x8000000000008003,
+    0x8000000000008002, 0x8000000000000080, 0x000000000000800A, 0x800000008000000A,
+    0x8000000080008081, 0x8000000000008080, 0x0000000080000001, 0x8000000080008008
+)
+_KECCAK_ROTATIONS = (
+    (0, 36, 3, 41, 18), (1, 44, 10, 45, 2), (62, 6, 43, 15, 61), (28, 55, 25, 21, 56), (27, 20, 39, 8, 14)
+)
+# The destination lane and rotation of every lane in the rho and pi steps.
+_KECCAK_MOVES = tuple(
+    (x + 5 * y, y + 5 * ((2 * x + 3 * y) % 5), _KECCAK_ROTATIONS[x][y]) for x in range(5) for y in range(5)
+)
+_MASK = 2 ** 64 - 1
+
+
+# The rho and pi steps, with the theta column of each lane, and the chi step, with the lanes each lane is mixed with.
+_KECCAK_RHO_PI = tuple((source, destination, rotation, 64 - rotation, source % 5)
+                       for source, destination, rotation in _KECCAK_MOVES)
+_KECCAK_CHI = tuple((i, i // 5 * 5 + (i + 1) % 5, i // 5 * 5 + (i + 2) % 5) for i in range(25))
+
+
+def _keccak_f(lanes: list) -> list:
+    for round_constant in _KECCAK_ROUND_CONSTANTS:
+        c0 = lanes[0] ^ lanes[5] ^ lanes[10] ^ lanes[15] ^ lanes[20]
+        c1 = lanes[1] ^ lanes[6] ^ lanes[11] ^ lanes[16] ^ lanes[21]
+        c2 = lanes[2] ^ lanes[7] ^ lanes[12] ^ lanes[17] ^ lanes[22]
+        c3 = lanes[3] ^ lanes[8] ^ lanes[13] ^ lanes[18] ^ lanes[23]
+        c4 = lanes[4] ^ lanes[9] ^ lanes[14] ^ lanes[19] ^ lanes[24]
+        d = (
+            c4 ^ ((c1 << 1 | c1 >> 63) & _MASK),
+            c0 ^ ((c2 << 1 | c2 >> 63) & _MASK),
+            c1 ^ ((c3 << 1 | c3 >> 63) & _MASK),
+            c2 ^ ((c4 << 1 | c4 >> 63) & _MASK),
+            c3 ^ ((c0 << 1 | c0 >> 63) & _MASK)
+        )
+        b = [0] * 25
+        for source, destination, left, right, column in _KECCAK_RHO_PI:
+            lane = lanes[source] ^ d[column]
+            b[destination] = (lane << left | lane >> right) & _MASK
+        lanes = [b[i] ^ (~b[j] & b[k]) for i, j, k in _KECCAK_CHI]
+        lanes[0] ^= round_constant
+    return lanes
+
+
+def keccak256(data: bytes) -> bytes:
+    if keccak is not None:
+        return keccak.new(data=data, digest_bits=256).digest()
+    rate = 136
+    padded = bytearray(data) + b'\x01' + b'\0' * ((-len(data) - 1) % rate)
+    padded[-1] |= 0x80
+    lanes = [0] * 25
+    for offset in range(0, len(padded), rate):
+        for i in range(rate // 8):
+            lanes[i] ^= int.from_bytes(padded[offset + 8 * i:offset + 8 * i + 8], 'little')
+        lanes = _keccak_f(lanes)
+    return b''.join(lane.to_bytes(8, 'little') for lane in lanes[:4])
+
+
+def to_checksum_address(address: bytes) -> str:
+    """
+    :param address: The 20 bytes of an EVM address
+    :return: The address in hex with the EIP-55 checksum, e.g. `0x9858EfFD232B4033E47d90003D41EC34EcaEda94`
+    """
+    hex_address = address.hex()
+    digest = keccak256(hex_address.encode()).hex()
+    return '0x' + ''.join(
+        character.upper() if int(digest[i], 16) >= 8 else character for i, character in enumerate(hex_address)
+    )
+
+
+def _get_evm_address(private_key: int) -> str:
+    x, y = _secp256k1_public_key(private_key)
+    return to_checksum_address(keccak256(x.to_bytes(32, 'big') + y.to_bytes(32, 'big'))[-20:])
+
+
+class DerivationEngine:
+
+    def __init__(self, secret_recovery_phrase: str, passphrase: str = str()):
+        """
+        Derives the keys of one secret recovery phrase locally, with the same answers as the API. The seed is
+        computed once and the parent keys of each path are cached, so deriving many wallet indices of one phrase
+        costs little more than the last derivation step and the public key of each.
+
+        Solana keys follow SLIP-0010 for ed25519, where every index is hardened, so `m/44/501/0/0`
+        (`DerivationPath.PHANTOM_AND_SOLLET_PATH`) is `m/44'/501'/0'/0'`. An empty path
+        (`DerivationPath.CLI_PATH`) is the Solana CLI's key: the first 32 bytes of the seed. EVM keys follow BIP32.
+
+        :param secret_recovery_phrase: A BIP39 secret recovery phrase
+        :param passphrase: OPTIONAL: The BIP39 passphrase
+        """
+        self.seed = mnemonic_to_seed(secret_recovery_phrase, passphrase)
+        self.__nodes: Dict[tuple, Tuple[bytes, bytes]] = dict()
+        self.__public_keys: Dict[bytes, bytes] = dict()
+
+    def __get_child(self, curve: str, parent: Tuple[bytes, bytes], index: int) -> Tuple[bytes, bytes]:
+        key, chain_code = parent
+        if index >= _HARDENED:
+            data = b'\0' + key
+        else:
+            # Every non-hardened child of a parent, e.g. every EVM account index, hashes the parent's public key.
+            data = self.__public_keys.get(key)
+            if data is None:
+                data = _compress(_secp256k1_public_key(int.from_bytes(key, 'big')))
+                if len(self.__public_keys) >= 4096:
+                    self.__public_keys.clear()
+                self.__public_keys[key] = data
+        digest = hmac.new(chain_code, data + index.to_bytes(4, 'big'), hashlib.sha512).digest()
+        if curve == 'ed25519':
+            return digest[:32], digest[32:]
+        key = (int.from_bytes(digest[:32], 'big') + int.from_bytes(key, 'big')) % _K_N
+        return key.to_bytes(32, 'big'), digest[32:]
+
+    def __get_node(self, curve: str, indices: Tuple[int, ...]) -> Tuple[bytes, bytes]:
+        node = self.__nodes.get((curve, indices))
+        if node is None:
+            if indices:
+                node = self.__get_child(curve, self.__get_node(curve, indices[:-1]), indices[-1])
+            else:
+                key = b'ed25519 seed' if curve == 'ed25519' else b'Bitcoin seed'
+                digest = hmac.new(key, self.seed, hashlib.sha512).digest()
+                node = digest[:32], digest[32:]
+            if len(self.__nodes) >= 4096:
+                self.__nodes.clear()
+            self.__nodes[(curve, indices)] = node
+        return node
+
+    def __get_key(self, curve: str, indices: Tuple[int, ...]) -> bytes:
+        if not indices:
+            return self.__get_node(curve, indices)[0]
+        # Only the parents are cached: the last index is usually different for every wallet.
+        return self.__get_child(curve, self.__get_node(curve, indices[:-1]), indices[-1])[0]
+
+    def __get_solana_secret(self, derivation_path) -> bytes:
+        derivation_path = _get_path(derivation_path)
+        if derivation_path == str():
+            return self.seed[:32]
+        # ed25519 only has hardened children.
+        return self.__get_key('ed25519', tuple(index | _HARDENED for index in parse_derivation_path(derivation_path)))
+
+    def get_solana_keypair(self, derivation_path=_PHANTOM_PATH) -> bytes:
+        """
+        :param derivation_path: A `DerivationPath` or a path, e.g.
+        `DerivationPath.get_phantom_wallet_derivation_path(1)`
+        :return: The 64-byte Solana keypair: the 32-byte secret key followed by the public key
+        """
+        secret = self.__get_solana_secret(derivation_path)
+        return secret + _ed25519_public_key(secret)
+
+    def derive_public_key(self, derivation_path=_PHANTOM_PATH) -> str:
+        """
+        :return: The Solana public key, as `SolanaAPIResource.derive_public_key` returns it
+        """
+        return b58encode(_ed25519_public_key(self.__get_solana_secret(derivation_path)))
+
+    def derive_private_key(self, derivation_path=_PHANTOM_PATH) -> dict:
+        """
+        :return: The Solana keypair, as `SolanaAPIResource.derive_private_key` returns it
+        """
+        return _format_keypair(self.get_solana_keypair(derivation_path))
+
+    def derive_public_keys(self, derivation_paths: Iterable) -> List[str]:
+        """
+        Bulk version of `derive_public_key`, e.g.
+        `engine.derive_public_keys(DerivationPath.get_phantom_wallet_derivation_path(i) for i in range(1000))`.
+        """
+        return [self.derive_public_key(derivation_path) for derivation_path in derivation_paths]
+
+    def derive_evm_private_key(self, derivation_path: str = _EVM_PATH) -> str:
+        """
+        :param derivation_path: A BIP32 path. Defaults to the first account, `m/44'/60'/0'/0/0`
+        :return: The private key, in hex
+        """
+        indices = parse_derivation_path(_get_path(derivation_path))
+        return '0x' + self.__get_key('secp256k1', indices).hex()
+
+    def derive_evm_address(self, derivation_path: str = _EVM_PATH) -> str:
+        """
+        :return: The EVM address (Ethereum, Binance Smart Chain and Avalanche's C-Chain), as
+        `BlockchainAPIResource.derive_blockchain_identifier` returns it
+        """
+        indices = parse_derivation_path(_get_path(derivation_path))
+        return _get_evm_address(int.from_bytes(self.__get_key('secp256k1', indices), 'big'))
+
+    def derive_evm_addresses(self, derivation_paths: Iterable[str]) -> List[str]:
+        """
+        Bulk version of `derive_evm_address`, e.g.
+        `engine.derive_evm_addresses(f"m/44'/60'/0'/0/{i}" for i in range(1000))`.
+        """
+        return [self.derive_evm_address(derivation_path) for derivation_path in derivation_paths]
+
+
+def _format_keypair(keypair: bytes) -> dict:
+    return {
+        'private_key': list(keypair),
+        'b58_private_key': b58encode(keypair)
+    }
+
+
+def _get_solana_keypair(wallet) -> bytes:
+    if wallet.secret_recovery_phrase is not None:
+        derivation_path = wallet.derivation_path if wallet.derivation_path is not None else _PHANTOM_PATH
+        return DerivationEngine(wallet.secret_recovery_phrase, wallet.passphrase).get_solana_keypair(derivation_path)
+    if wallet.private_key is not None:
+        keypair = bytes(wallet.private_key)
+    elif wallet.b58_private_key is not None:
+        keypair = b58decode(wallet.b58_private_key)
+    else:
+        keypair = bytes.fromhex(wallet.hex_private_key[2:] if wallet.hex_private_key.startswith('0x')
+                                else wallet.hex_private_key)
+    if len(keypair) not in (32, 64):
+        raise Exception("A Solana private key must be 64 bytes, or the 32-byte secret key.")
+    return keypair[:32] + _ed25519_public_key(keypair[:32])
+
+
+def derive_public_key(wallet) -> str:
+    """
+    Derives a Solana public key locally, with the same answer as `SolanaAPIResource.derive_public_key`.
+
+    :param wallet: A `SolanaWallet`, or a `Wallet`
+    """
+    return b58encode(_get_solana_keypair(wallet)[32:])
+
+
+def derive_private_key(wallet) -> dict:
+    """
+    Derives a Solana keypair locally, with the same answer as `SolanaAPIResource.derive_private_key`.
+
+    :param wallet: A `SolanaWallet`, or a `Wallet`
+    """
+    return _format_keypair(_get_solana_keypair(wallet))
+
+
+def generate_private_key() -> dict:
+    """
+    Generates a random Solana keypair locally, in the format of `SolanaAPIResource.generate_private_key`.
+    """
+    secret = os.urandom(32)
+    return _format_keypair(secret + _ed25519_public_key(secret))
+
+
+def derive_blockchain_identifier(
+    wallet,
+    blockchain: Union[Enum, str],
+    avalanche_chain: Optional[Union[Enum, str]] = None
+) -> str:
+    """
+    Derives the identifier of a wallet locally, with the same answer as
+    `BlockchainAPIResource.derive_blockchain_identifier`, for Solana and the EVM chains: Ethereum, Binance Smart Chain
+    and Avalanche's C-Chain.
+
+    :param wallet: A `Wallet`
+    :param blockchain: A `Blockchain`
+    :param avalanche_chain: The `AvalancheChain`, for Avalanche
+    """
+    blockchain = blockchain.value if isinstance(blockchain, Enum) else blockchain
+    avalanche_chain = avalanche_chain.value if isinstance(avalanche_chain, Enum) else avalanche_chain
+    if blockchain == 'solana':
+        return derive_public_key(wallet)
+    is_evm = blockchain in ('ethereum', 'binance_smart_chain') or (blockchain == 'avalanche' and avalanche_chain == 'C')
+    if not is_evm:
+        raise Exception(
+            f"Local derivation supports Solana, Ethereum, Binance Smart Chain and Avalanche's C-Chain, "
+            f"not `{blockchain}`{f' `{avalanche_chain}`' if avalanche_chain else ''}. "
+            f"Use `derive_blockchain_identifier` of `BlockchainAPIResource`."
+        )
+    if wallet.secret_recovery_phrase is not None:
+        derivation_path = wallet.derivation_path if wallet.derivation_path is not None else _EVM_PATH
+        return DerivationEngine(wallet.secret_recovery_phrase, wallet.passphrase).derive_evm_address(derivation_path)
+    if wallet.hex_private_key is not None:
+        private_key = bytes.fromhex(wallet.hex_private_key[2:] if wallet.hex_private_key.startswith('0x')
+                                    else wallet.hex_private_key)
+    elif wallet.private_key is not None:
+        private_key = bytes(wallet.private_key)
+    else:
+        private_key = b58decode(wallet.b58_private_key)
+    if len(private_key) != 32:
+        raise Exception("An EVM private key must be 32 bytes.")
+    return _get_evm_address(int.from_bytes(private_key, 'big'))
@@ -1,8 +1,6 @@
-from theblockchainapi.resource import APIResource
+from theblockchainapi.resource import APIResource, _api_method
 from typing import List, Optional
-import requests
 import platform
-import time
 from enum import Enum
 
 
@@ -63,6 +61,7 @@ class DeveloperProgramResource(APIResource):
     ACCEPTED_PLATFORMS = ['Darwin', 'Windows', 'Linux']
     ACCEPTED_ARCHITECTURES = ['64bit']
 
+    @_api_method
     def __modify_project(
         self,
         project_id: Optional[str],
@@ -84,13 +83,11 @@ class DeveloperProgramResource(APIResource):
             payload['contact_email'] = contact_email
         if project_id is not None:
             payload['project_id'] = project_id
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint="project" if project_id is None else f"project/{project_id}",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
     def create_project(
@@ -131,6 +128,7 @@ class DeveloperProgramResource(APIResource):
         """
         return self.__modify_project(project_id, project_name, project_description, contact_email, groups)
 
+    @_api_method
     def get_project(self, project_id: str):
         """
         More info available here: https://docs.blockchainapi.com/#operation/getProject
@@ -138,26 +136,24 @@ class DeveloperProgramResource(APIResource):
         :param project_id:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(), endpoint=f"project/{project_id}", request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def delete_project(self, project_id: str):
         """
         More info available here: https://docs.blockchainapi.com/#operation/deleteProject
         :param project_id:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(), endpoint=f"project/{project_id}", request_method=self._RequestMethod.DELETE
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def create_project_version(self, project_id: str, version: str):
         """
         More info available here: https://docs.blockchainapi.com/#operation/createProjectVersion
@@ -166,13 +162,12 @@ class DeveloperProgramResource(APIResource):
         :param version:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(), endpoint=f"project/{project_id}/{version}", request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def delete_project_version(self, project_id: str, version: str):
         """
         More info available here: https://docs.blockchainapi.com/#operation/deleteProjectVersion
@@ -181,13 +176,12 @@ class DeveloperProgramResource(APIResource):
         :param version:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(), endpoint=f"project/{project_id}/{version}", request_method=self._RequestMethod.DELETE
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def deploy_project(self, project_id: str, binary_file_path: str):
         """
         More info available here: https://docs.blockchainapi.com/#operation/deployProject
@@ -211,7 +205,7 @@ class DeveloperProgramResource(APIResource):
                 f"{arch}. If you want support for this platform, please contact us."
             )
 
-        response = self._request(
+        response = yield from self._request(
             payload={
                 'platform': platform.system()
             },
@@ -229,8 +223,9 @@ class DeveloperProgramResource(APIResource):
                 'file': open(binary_file_path, 'rb')
             }
             print("Uploading...")
-            r = requests.post(
-                url,
+            r = yield self._Send(
+                method='POST',
+                url=url,
                 data=fields,
                 files=files
             )
@@ -241,22 +236,22 @@ class DeveloperProgramResource(APIResource):
 
             # Check status
             while True:
-                status_ = self.get_project_deployment_status(project_id)
+                status_ = yield from DeveloperProgramResource.get_project_deployment_status.__wrapped__(
+                    self, project_id
+                )
                 print(status_['status'])
                 if status_['status_code'] == 1:
                     break
                 else:
                     print(f"Checking... ")
-                    time.sleep(5)
+                    yield self._Sleep(5)
             return status_
 
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
-
-        status = upload(response)
+        status = yield from upload(response)
 
         return status
 
+    @_api_method
     def get_project_deployment_status(self, project_id: str):
         """
         More info available here: https://docs.blockchainapi.com/#operation/deployProject
@@ -265,15 +260,15 @@ class DeveloperProgramResource(APIResource):
         :return:
         """
 
-        response = self._request(
+        response = yield from self._request(
             payload=dict(),
             endpoint=f"project/{project_id}/deploy/status",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_project_stats(self, project_id: str):
         """
         More info available here: https://docs.blockchainapi.com/#operation/getProjectStats
@@ -281,25 +276,23 @@ class DeveloperProgramResource(APIResource):
         :param project_id:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(), endpoint=f"project/{project_id}/stats", request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def list_projects(self):
         """
         More info available here: https://docs.blockchainapi.com/#operation/listProjects
 
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(), endpoint=f"project/list", request_method=self._RequestMethod.GET)
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def update_project_documentation(self, project_id: str, version: str):
         """
         More info available here: https://docs.blockchainapi.com/#operation/updateProjectDocumentation
@@ -308,15 +301,14 @@ class DeveloperProgramResource(APIResource):
         :param version:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(),
             endpoint=f"project/{project_id}/{version}/documentation",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def create_endpoint(
         self,
         project_id: str,
@@ -375,15 +367,14 @@ class DeveloperProgramResource(APIResource):
             payload['input_specification'].append(spec.get_dict())
         for spec in output_specification:
             payload['output_specification'].append(spec.get_dict())
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint=f"endpoint",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def update_endpoint(
         self,
         project_id: str,
@@ -451,15 +442,14 @@ class DeveloperProgramResource(APIResource):
             payload['description'] = description
         if group_name is not None:
             payload['group_name'] = group_name
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint=f"endpoint",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_endpoint(
         self,
         project_id: str,
@@ -479,15 +469,15 @@ class DeveloperProgramResource(APIResource):
             'version': version,
             'path': path
         }
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint=f"endpoint/metadata",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def delete_endpoint(
         self,
         project_id: str,
@@ -507,26 +497,23 @@ class DeveloperProgramResource(APIResource):
             'version': version,
             'path': path
         }
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint=f"endpoint/delete",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def list_endpoints(self):
         """
         More info available here: https://docs.blockchainapi.com/#operation/listEndpoints
 
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(),
             endpoint=f"endpoint/list",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
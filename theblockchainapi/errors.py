@@ -0,0 +1,136 @@
+from typing import Any, Optional
+
+import requests
+
+
+class APIError(Exception):
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        endpoint: Optional[str] = None,
+        elapsed: Optional[float] = None,
+        retryable: bool = False
+    ):
+        """
+        An API request that failed. `str(e)` is the API's `error_message`, as with the plain `Exception`s raised
+        before, so existing handlers keep working; the attributes below make automated handling cheap.
+
+        :param message: The error message
+        :param status_code: The HTTP status code, or `None` if no response was received
+        :param endpoint: The endpoint requested, e.g. `solana/nft/mainnet-beta/<mint>`
+        :param elapsed: The time spent on the request, including retries, in seconds
+        :param retryable: Whether sending the request again may succeed and is safe, i.e. the failure is transient
+        and the request is idempotent
+        """
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.endpoint = endpoint
+        self.elapsed = elapsed
+        self.retryable = retryable
+
+    def __str__(self):
+        return self.message
+
+
+class AuthenticationError(APIError):
+    """
+    The API key pair is missing, invalid, or not allowed to call the endpoint (401, 403).
+    """
+
+
+class InsufficientCreditError(APIError):
+    """
+    The account has run out of credits (402).
+    """
+
+
+class NotFoundError(APIError):
+    """
+    The requested resource does not exist (404).
+    """
+
+
+class RateLimitError(APIError):
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, **kwargs):
+        """
+        Too many requests (429).
+
+        :param retry_after: The number of seconds the API asked to wait before retrying, if it said so
+        """
+        super().__init__(message, **kwargs)
+        self.retry_after = retry_after
+
+
+class ServerError(APIError):
+    """
+    The API failed to handle the request (5xx).
+    """
+
+
+class RequestTimeoutError(APIError, requests.Timeout):
+    """
+    No response arrived in time. Also a `requests.Timeout`, which was raised before.
+    """
+
+
+class DeadlineExceededError(RequestTimeoutError):
+    """
+    The call's deadline passed before it could complete, possibly across several attempts. See `TimeoutPolicy`.
+    """
+
+
+class APIConnectionError(APIError, requests.ConnectionError):
+    """
+    The API could not be reached. Also a `requests.ConnectionError`, which was raised before.
+    """
+
+
+class CircuitOpenError(APIError):
+
+    def __init__(self, message: str, family: str, retry_after: Optional[float] = None, **kwargs):
+        """
+        The request was not sent because the circuit of its endpoint family is open. See `CircuitBreaker`.
+
+        :param family: The endpoint family, e.g. `solana/nft/marketplaces/*`
+        :param retry_after: The number of seconds until the circuit lets a probe request through, if known
+        """
+        super().__init__(message, **kwargs)
+        self.family = family
+        self.retry_after = retry_after
+
+
+class RPCError(APIError):
+
+    def __init__(self, message: str, code: Optional[int] = None, data: Any = None, **kwargs):
+        """
+        A JSON-RPC call that the node answered with an error, e.g. in a batch whose other calls succeeded.
+
+        :param code: The JSON-RPC error code, e.g. -32602 for invalid params
+        :param data: OPTIONAL: The additional information the node gave about the error
+        """
+        super().__init__(message, **kwargs)
+        self.code = code
+        self.data = data
+
+
+def get_error_class(status_code: int, message: str = '') -> type:
+    """
+    :return: The `APIError` subclass for a response with `status_code` and error message `message`
+    """
+    if status_code == 402 or (400 <= status_code < 500 and 'credit' in message.lower()):
+        return InsufficientCreditError
+    if status_code in (401, 403):
+        return AuthenticationError
+    if status_code == 404:
+        return NotFoundError
+    if status_code == 408:
+        return RequestTimeoutError
+    if status_code == 429:
+        return RateLimitError
+    if status_code >= 500:
+        return ServerError
+    return APIError
@@ -0,0 +1,316 @@
+import json
+from typing import Any, Callable, IO, Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+from theblockchainapi.bulk import BulkResult
+from theblockchainapi.models import Model
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+def _to_int(value: Any) -> int:
+    # Raw token amounts are sent as strings, since they may not fit in a double.
+    return int(value)
+
+
+_CONVERTERS = {
+    'string': str,
+    'int64': _to_int,
+    'uint64': _to_int,
+    'float64': float,
+    'bool': bool,
+    'list<string>': lambda value: [None if item is None else str(item) for item in value],
+    'json': lambda value: json.dumps(value, separators=(',', ':'))
+}
+
+
+class ExportSchema:
+
+    TYPES = tuple(_CONVERTERS)
+
+    def __init__(
+        self,
+        name: str,
+        columns: Sequence[Tuple[str, str, Tuple[str, ...]]],
+        get_rows: Optional[Callable[[Any], Iterable[dict]]] = None
+    ):
+        """
+        The fixed columns that the rows of a response type are exported to. A fixed schema keeps every chunk of an
+        export compatible, whatever fields a given response happens to have.
+
+        :param name: The name of the schema, e.g. `token_holdings`
+        :param columns: The `(name, type, path)` of every column. `type` is one of `ExportSchema.TYPES`. `path` is the
+        keys leading to the value in a row, e.g. `('data', 'name')`. A missing value is exported as null. `json`
+        columns hold nested objects, as JSON text in Arrow and Parquet
+        :param get_rows: OPTIONAL: Splits a response into rows. By default, a list response is a list of rows, and
+        any other response is a single row
+        """
+        for column_name, column_type, _ in columns:
+            if column_type not in _CONVERTERS:
+                raise Exception(
+                    f"Unknown type `{column_type}` for the column `{column_name}`. See `ExportSchema.TYPES`."
+                )
+        self.name = name
+        self.columns = tuple(columns)
+        self.get_rows = get_rows
+
+    def iter_rows(self, response: Any) -> Iterator[dict]:
+        """
+        :param response: A response, a `Model`, a list of either, or a `BulkResult` of any. Failed `BulkResult`s and
+        `None`, e.g. the response for an NFT that was not found, have no rows
+        """
+        if isinstance(response, BulkResult):
+            if not response.ok:
+                return
+            response = response.value
+        if response is None:
+            return
+        if self.get_rows is not None:
+            rows = self.get_rows(response)
+        elif isinstance(response, list):
+            rows = response
+        else:
+            rows = (response,)
+        for row in rows:
+            if row is not None:
+                yield row.to_dict() if isinstance(row, Model) else row
+
+    def get_values(self, row: dict) -> list:
+        """
+        :return: The value of every column in `row`, converted to the column's type
+        """
+        values = []
+        for _, column_type, path in self.columns:
+            value = row
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            values.append(None if value is None else _CONVERTERS[column_type](value))
+        return values
+
+    def to_arrow(self):
+        """
+        :return: The `pyarrow.Schema`
+        """
+        _check_pyarrow()
+        types = {
+            'string': pyarrow.string(),
+            'int64': pyarrow.int64(),
+            'uint64': pyarrow.uint64(),
+            'float64': pyarrow.float64(),
+            'bool': pyarrow.bool_(),
+            'list<string>': pyarrow.list_(pyarrow.string()),
+            'json': pyarrow.string()
+        }
+        return pyarrow.schema([(name, types[column_type]) for name, column_type, _ in self.columns])
+
+
+def _get_analytics_rows(response: dict) -> Iterator[dict]:
+    history = response.get('transaction_history') or dict()
+    for mint_address, transactions in history.items():
+        for transaction in transactions:
+            yield dict(transaction, mint_address=mint_address)
+
+
+# `get_wallet_token_holdings`
+TOKEN_HOLDINGS = ExportSchema('token_holdings', [
+    ('mint_address', 'string', ('mint_address',)),
+    ('public_key', 'string', ('public_key',)),
+    ('token_account', 'string', ('token_account',)),
+    ('amount', 'uint64', ('amount',)),
+    ('decimals', 'int64', ('decimals',)),
+    ('ui_amount', 'float64', ('ui_amount',)),
+    ('is_nft', 'bool', ('is_nft',)),
+    ('network', 'string', ('network',))
+])
+
+# `search_nfts`, `get_nft_metadata` and `get_nft_metadata_many`
+NFT_METADATA = ExportSchema('nft_metadata', [
+    ('mint', 'string', ('mint',)),
+    ('update_authority', 'string', ('update_authority',)),
+    ('name', 'string', ('data', 'name')),
+    ('symbol', 'string', ('data', 'symbol')),
+    ('uri', 'string', ('data', 'uri')),
+    ('seller_fee_basis_points', 'int64', ('data', 'seller_fee_basis_points')),
+    ('creators', 'list<string>', ('data', 'creators')),
+    ('is_mutable', 'bool', ('is_mutable',)),
+    ('primary_sale_happened', 'bool', ('primary_sale_happened',)),
+    ('edition_nonce', 'int64', ('edition_nonce',)),
+    ('explorer_url', 'string', ('explorer_url',)),
+    ('off_chain_data', 'json', ('off_chain_data',)),
+    ('network', 'string', ('network',))
+])
+
+# `get_nft_marketplace_analytics`: one row per transaction of `transaction_history`
+MARKETPLACE_TRANSACTIONS = ExportSchema('marketplace_transactions', [
+    ('mint_address', 'string', ('mint_address',)),
+    ('marketplace', 'string', ('marketplace',)),
+    ('operation', 'string', ('operation',)),
+    ('price', 'uint64', ('price',)),
+    ('block_time', 'int64', ('block_time',)),
+    ('transaction_signature', 'string', ('transaction_signature',)),
+    ('buyer', 'string', ('buyer',)),
+    ('seller', 'string', ('seller',))
+], get_rows=_get_analytics_rows)
+
+
+_FORMATS = {'parquet': 'parquet', 'arrow': 'arrow', 'feather': 'arrow', 'ndjson': 'ndjson', 'jsonl': 'ndjson'}
+
+
+def _check_pyarrow():
+    if pyarrow is None:
+        raise Exception("Arrow and Parquet exports require `pyarrow`. Install it with `pip install pyarrow`.")
+
+
+class ExportWriter:
+
+    def __init__(
+        self,
+        destination: Union[str, IO],
+        schema: ExportSchema,
+        format: Optional[str] = None,
+        chunk_size: int = 65536,
+        compression: str = 'zstd'
+    ):
+        """
+        Writes responses to a file incrementally, one chunk of rows at a time, so that exports of any size run in
+        bounded memory. Call `write` with each response as it arrives, e.g. from `async for`, then `close`, or use it
+        as a context manager.
+
+        Formats:
+        - `parquet`: one row group per chunk.
+        - `arrow`: the Arrow IPC file format (Feather v2). Open it with `pyarrow.memory_map` to load it into pandas or
+        polars without copying.
+        - `ndjson`: one JSON object per line, with the schema's columns. Does not require `pyarrow`.
+
+        :param destination: A path, or for `ndjson`, a text file object
+        :param schema: The `ExportSchema` of the responses, e.g. `TOKEN_HOLDINGS`, `NFT_METADATA` or
+        `MARKETPLACE_TRANSACTIONS`
+        :param format: OPTIONAL: `parquet`, `arrow` or `ndjson`. Defaults to the extension of the path
+        :param chunk_size: The maximum number of rows held in memory
+        :param compression: The Parquet compression codec
+        """
+        if format is None:
+            if not isinstance(destination, str):
+                raise Exception("Provide `format` when exporting to a file object.")
+            format = _FORMATS.get(destination.rsplit('.', 1)[-1].lower())
+            if format is None:
+                raise Exception(f"Unknown export format for `{destination}`. Provide `format`.")
+        if format not in ('parquet', 'arrow', 'ndjson'):
+            raise Exception("`format` must be `parquet`, `arrow` or `ndjson`.")
+        if not isinstance(chunk_size, int) or chunk_size < 1:
+            raise Exception("`chunk_size` must be an integer greater than or equal to 1.")
+        if not isinstance(schema, ExportSchema):
+            raise Exception(
+                "`schema` must be an instance of `ExportSchema`. "
+                "See `from theblockchainapi.export import ExportSchema`."
+            )
+
+        self.schema = schema
+        self.format = format
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.__columns = [[] for _ in schema.columns]
+        self.__count = 0
+        self.__closed = False
+
+        if format == 'ndjson':
+            self.__file = open(destination, 'w') if isinstance(destination, str) else destination
+            self.__owns_file = isinstance(destination, str)
+            self.__names = [name for name, _, _ in schema.columns]
+            self.__json_columns = [
+                index for index, (_, column_type, _) in enumerate(schema.columns) if column_type == 'json'
+            ]
+            return
+
+        _check_pyarrow()
+        self.__arrow_schema = schema.to_arrow()
+        if format == 'parquet':
+            self.__writer = pyarrow.parquet.ParquetWriter(destination, self.__arrow_schema, compression=compression)
+        else:
+            self.__writer = pyarrow.ipc.new_file(destination, self.__arrow_schema)
+
+    def write(self, response: Any):
+        """
+        Writes the rows of a response.
+
+        :param response: A response, a `Model`, a list of either, or a `BulkResult` of any. Failed `BulkResult`s and
+        `None` are skipped
+        """
+        if self.__closed:
+            raise Exception("This `ExportWriter` has been closed.")
+        if self.format == 'ndjson':
+            for row in self.schema.iter_rows(response):
+                values = self.schema.get_values(row)
+                for index in self.__json_columns:
+                    # Nested objects stay nested in JSON.
+                    if values[index] is not None:
+                        values[index] = json.loads(values[index])
+                self.__file.write(json.dumps(dict(zip(self.__names, values)), separators=(',', ':')) + '\n')
+                self.rows += 1
+            return
+        for row in self.schema.iter_rows(response):
+            for column, value in zip(self.__columns, self.schema.get_values(row)):
+                column.append(value)
+            self.__count += 1
+            if self.__count == self.chunk_size:
+                self.__flush()
+
+    def __flush(self):
+        batch = pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array(column, type=field.type) for column, field in zip(self.__columns, self.__arrow_schema)],
+            schema=self.__arrow_schema
+        )
+        if self.format == 'parquet':
+            self.__writer.write_batch(batch, row_group_size=self.chunk_size)
+        else:
+            self.__writer.write_batch(batch)
+        self.rows += self.__count
+        self.__columns = [[] for _ in self.schema.columns]
+        self.__count = 0
+
+    def close(self):
+        """
+        Writes the last chunk and closes the file.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        if self.format == 'ndjson':
+            if self.__owns_file:
+                self.__file.close()
+            return
+        try:
+            if self.__count:
+                self.__flush()
+        finally:
+            self.__writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def export_responses(
+    responses: Iterable[Any],
+    destination: Union[str, IO],
+    schema: ExportSchema,
+    format: Optional[str] = None,
+    chunk_size: int = 65536,
+    compression: str = 'zstd'
+) -> int:
+    """
+    Writes a stream of responses to a file with an `ExportWriter`, e.g.
+    `export_responses(resource.get_nft_metadata_many(mints), 'nfts.parquet', NFT_METADATA)`.
+
+    :param responses: Responses, `Model`s or `BulkResult`s. Failed `BulkResult`s and `None` are skipped
+    :return: The number of rows written
+    """
+    with ExportWriter(destination, schema, format=format, chunk_size=chunk_size, compression=compression) as writer:
+        for response in responses:
+            writer.write(response)
+    return writer.rows
@@ -0,0 +1,204 @@
+import functools
+import threading
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+from theblockchainapi import bulk
+from theblockchainapi.api_resource import AvalancheChain, Blockchain, BlockchainAPIResource
+from theblockchainapi.async_resource import AsyncBlockchainAPIResource
+from theblockchainapi.cache import ResponseCache
+from theblockchainapi.circuit_breaker import CircuitBreaker
+from theblockchainapi.metrics import Instrumentation
+from theblockchainapi.rate_limit import RateLimiter
+from theblockchainapi.retry import RetryPolicy
+from theblockchainapi.serializer import Serializer
+from theblockchainapi.singleflight import SingleFlight
+from theblockchainapi.store import TransactionStore
+from theblockchainapi.timeouts import TimeoutPolicy
+from theblockchainapi.transport import HTTPTransport, AsyncHTTPTransport
+
+
+def _get_key(chain: tuple) -> tuple:
+    return tuple(value.value if isinstance(value, Enum) else value for value in chain)
+
+
+class BlockchainAPIHub:
+
+    _resource_class = BlockchainAPIResource
+
+    # The API credits per second, and the burst, of the rate limiter a hub creates when it is given none.
+    DEFAULT_RATE = 20
+    DEFAULT_CAPACITY = 40
+
+    def __init__(
+        self,
+        api_key_id: str,
+        api_secret_key: str,
+        transport: Optional[Union[HTTPTransport, AsyncHTTPTransport]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        singleflight: Optional[SingleFlight] = None,
+        serializer: Optional[Serializer] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeouts: Optional[TimeoutPolicy] = None,
+        transaction_store: Optional[TransactionStore] = None
+    ):
+        """
+        One client for every blockchain and network. It hands out a `BlockchainAPIResource` per chain, i.e. per
+        `(blockchain, network)` or `(blockchain, network, avalanche_chain)`, that all share one connection pool and
+        the rate limiter, cache and other components given here. Each chain's resource is created, and its arguments
+        validated, once.
+
+        The arguments are those of `BlockchainAPIResource`. If no `transport` is given, the hub creates one, which is
+        closed by `close()`. Likewise, the hub creates the `rate_limiter` (`DEFAULT_RATE` credits per second, with
+        bursts of `DEFAULT_CAPACITY`), `retry_policy` and in-memory `cache` shared by its resources if they are not
+        given. They are available as `hub.rate_limiter`, `hub.retry_policy` and `hub.cache`.
+        """
+        transport_class = self._resource_class._transport_class
+        if transport is None:
+            transport = transport_class()
+            self._owns_transport = True
+        elif isinstance(transport, transport_class):
+            self._owns_transport = False
+        else:
+            raise Exception(
+                f"`transport` must be an instance of `{transport_class.__name__}`. "
+                f"See `from theblockchainapi.transport import {transport_class.__name__}`."
+            )
+        self.transport = transport
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(self.DEFAULT_RATE, self.DEFAULT_CAPACITY)
+        self.rate_limiter = rate_limiter
+        self.retry_policy = RetryPolicy() if retry_policy is None else retry_policy
+        self.cache = ResponseCache() if cache is None else cache
+
+        self.__kwargs = dict(
+            api_key_id=api_key_id,
+            api_secret_key=api_secret_key,
+            transport=transport,
+            rate_limiter=self.rate_limiter,
+            retry_policy=self.retry_policy,
+            cache=self.cache,
+            singleflight=singleflight,
+            serializer=serializer,
+            instrumentation=instrumentation,
+            circuit_breaker=circuit_breaker,
+            timeouts=timeouts,
+            transaction_store=transaction_store
+        )
+        self.__resources: Dict[tuple, BlockchainAPIResource] = dict()
+        self.__lock = threading.Lock()
+
+    def get_resource(
+        self,
+        blockchain: Union[Blockchain, str],
+        network: Union[Enum, str],
+        avalanche_chain: Optional[Union[AvalancheChain, str]] = None
+    ) -> BlockchainAPIResource:
+        """
+        :return: The resource of a chain, e.g. `hub.get_resource(Blockchain.ETHEREUM, 'mainnet')`. The same instance
+        is returned for the same chain
+        """
+        chain = (blockchain, network) if avalanche_chain is None else (blockchain, network, avalanche_chain)
+        key = _get_key(chain)
+        resource = self.__resources.get(key)
+        if resource is None:
+            with self.__lock:
+                resource = self.__resources.get(key)
+                if resource is None:
+                    resource = self.__resources[key] = self._resource_class(
+                        blockchain=blockchain, network=network, avalanche_chain=avalanche_chain, **self.__kwargs
+                    )
+        return resource
+
+    def map(
+        self,
+        chains: Iterable[tuple],
+        method: Union[str, Callable],
+        args: Union[tuple, Dict[tuple, tuple]] = (),
+        kwargs: Optional[dict] = None,
+        concurrency: int = 10,
+        ordered: bool = True
+    ):
+        """
+        Calls the same method on the resources of several chains concurrently, e.g. to get the balances of one
+        identity across chains:
+
+        `hub.map([(Blockchain.ETHEREUM, 'mainnet'), (Blockchain.BINANCE, 'mainnet')], 'get_balance', (address,))`
+
+        A failure on one chain is captured in its `BulkResult` instead of aborting the others.
+
+        :param chains: The chains, as `(blockchain, network)` or `(blockchain, network, avalanche_chain)` tuples
+        :param method: The name of a `BlockchainAPIResource` method, e.g. `get_balance`, or a callable taking a
+        resource followed by `args`
+        :param args: The positional arguments of every call, or a `dict` mapping each chain to its own, e.g. to pass
+        each chain's address
+        :param kwargs: OPTIONAL: The keyword arguments of every call
+        :param concurrency: The maximum number of calls in flight
+        :param ordered: If True, yield results in the order of `chains`. Otherwise, yield them as they complete.
+        :return: An iterator of `BulkResult` whose `item` is the chain (an async iterator for async hubs)
+        """
+        if not isinstance(args, (tuple, list, dict)):
+            raise Exception("`args` must be a `tuple` of arguments, or a `dict` mapping a chain to its arguments.")
+        kwargs = kwargs or dict()
+        chain_args = {_get_key(chain): value for chain, value in args.items()} if isinstance(args, dict) else None
+        chains = list(chains)
+        # Creates the resources up front, so that an invalid chain fails before any request is sent.
+        for chain in chains:
+            self.get_resource(*chain)
+            if chain_args is not None and _get_key(chain) not in chain_args:
+                raise Exception(f"`args` has no arguments for the chain `{chain}`.")
+
+        def call(chain: tuple):
+            resource = self.get_resource(*chain)
+            call_args = args if chain_args is None else chain_args[_get_key(chain)]
+            func = getattr(resource, method) if isinstance(method, str) else functools.partial(method, resource)
+            return func(*call_args, **kwargs)
+
+        return self._map_concurrent(call, chains, concurrency, ordered)
+
+    def _map_concurrent(self, func: Callable[[Any], Any], items: list, concurrency: int, ordered: bool):
+        return bulk.map_concurrent(func, items, concurrency=concurrency, ordered=ordered)
+
+    def close(self):
+        """
+        Closes the hub's transport, unless it was passed in by the caller.
+        """
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncBlockchainAPIHub(BlockchainAPIHub):
+    """
+    The asyncio version of `BlockchainAPIHub`, handing out `AsyncBlockchainAPIResource`s that share one
+    `AsyncHTTPTransport`. Use it from a single event loop.
+    """
+
+    _resource_class = AsyncBlockchainAPIResource
+
+    def _map_concurrent(self, func: Callable[[Any], Any], items: list, concurrency: int, ordered: bool):
+        return bulk.amap_concurrent(func, items, concurrency=concurrency, ordered=ordered)
+
+    async def close(self):
+        """
+        Closes the hub's transport, unless it was passed in by the caller.
+        """
+        if self._owns_transport:
+            await self.transport.close()
+
+    def __enter__(self):
+        raise Exception("Use `async with` for async hubs.")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,384 @@
+import bisect
+import re
+import threading
+import time
+import warnings
+from typing import Callable, Dict, Optional, Sequence
+
+try:
+    from opentelemetry import metrics as otel_metrics
+except ImportError:
+    otel_metrics = None
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+
+# The endpoints with path parameters, in the order they are tried. `{network}` matches a network name, and any other
+# placeholder matches an ID-like segment: one containing a digit or at least 32 characters long.
+ENDPOINT_TEMPLATES = (
+    'solana/nft/candy_machine/{network}/{candy_machine_id}/nfts',
+    'solana/nft/marketplaces/magic-eden/buy/{network}/{mint_address}',
+    'solana/nft/marketplaces/magic-eden/delist/{network}/{mint_address}',
+    'solana/nft/marketplaces/magic-eden/list/{network}/{mint_address}',
+    'solana/nft/marketplaces/listing/{network}/{mint_address}',
+    'solana/account/{network}/{public_key}/is_candy_machine',
+    'solana/account/{network}/{public_key}/is_nft',
+    'solana/account/{network}/{public_key}',
+    'solana/wallet/{network}/{public_key}/nfts',
+    'solana/wallet/{network}/{public_key}/tokens',
+    'solana/wallet/{network}/{public_key}/transactions',
+    'solana/wallet/{public_key}/associated_token_account/{mint_address}',
+    'solana/nft/{network}/{mint_address}/owner',
+    'solana/nft/{network}/{mint_address}',
+    'solana/spl-token/{network}/{public_key}',
+    'solana/transaction/{network}/{tx_signature}',
+    'project/{project_id}/deploy/status',
+    'project/{project_id}/deploy/url',
+    'project/{project_id}/stats',
+    'project/{project_id}/{version}/documentation',
+    'project/{project_id}/{version}',
+    'project/{project_id}'
+)
+
+_NETWORKS = ('devnet', 'mainnet-beta', 'mainnet', 'testnet', 'ropsten')
+_ID_SEGMENT = r'(?:[^/]*[0-9][^/]*|[^/]{32,})'
+
+
+def _compile_template(template: str):
+    pattern = re.escape(template)
+    pattern = pattern.replace(re.escape('{network}'), '(?:' + '|'.join(map(re.escape, _NETWORKS)) + ')')
+    pattern = re.sub(r'\\{[a-z_]+\\}', lambda _: _ID_SEGMENT, pattern)
+    return re.compile(pattern + '$'), template
+
+
+_COMPILED_TEMPLATES = [_compile_template(template) for template in ENDPOINT_TEMPLATES]
+
+
+def get_endpoint_template(endpoint: str) -> str:
+    """
+    :return: The template of a concrete endpoint, e.g. `solana/nft/{network}/{mint_address}` for
+    `solana/nft/mainnet-beta/<mint>`, so that metrics are labelled with a bounded set of values. Unknown endpoints
+    have their ID-like segments replaced with `{id}`.
+    """
+    for pattern, template in _COMPILED_TEMPLATES:
+        if pattern.match(endpoint):
+            return template
+    return '/'.join(
+        '{id}' if re.fullmatch(_ID_SEGMENT, segment) else segment for segment in endpoint.split('/')
+    )
+
+
+class RequestEvent:
+
+    # The phases of `timings`, in seconds:
+    # - queued: waiting for the rate limiter
+    # - server: from sending the request to receiving the response headers (including connecting, TLS and the
+    #   server's own time), summed over attempts
+    # - download: receiving the response body, summed over attempts
+    # - backoff: waiting between retries
+    # - decode: decoding the JSON body
+    # - total: the whole call, as seen by the caller
+    PHASES = ('queued', 'server', 'download', 'backoff', 'decode', 'total')
+
+    __slots__ = (
+        'method', 'endpoint', 'endpoint_template', 'status_code', 'bytes_out', 'bytes_in', 'cache_hit', 'coalesced',
+        'attempts', 'error', 'timings', 'started_at', '_start'
+    )
+
+    def __init__(self, method: str, endpoint: str, bytes_out: int = 0):
+        """
+        What happened during one API call. Passed to every hook of `Instrumentation` once the call is over.
+        """
+        self.method = method
+        self.endpoint = endpoint
+        self.endpoint_template = get_endpoint_template(endpoint)
+        self.status_code: Optional[int] = None
+        self.bytes_out = bytes_out
+        self.bytes_in = 0
+        self.cache_hit = False
+        self.coalesced = False
+        self.attempts = 0
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = dict.fromkeys(RequestEvent.PHASES, 0.0)
+        self.started_at = time.time()
+        self._start = time.monotonic()
+
+    @property
+    def retried(self) -> bool:
+        return self.attempts > 1
+
+    def add(self, phase: str, seconds: float):
+        self.timings[phase] += seconds
+
+    def add_attempt(self, seconds: float, response=None, streamed: bool = False):
+        """
+        Records one attempt that took `seconds` and got `response`, or failed without a response.
+        """
+        self.attempts += 1
+        if response is None:
+            self.timings['server'] += seconds
+            return
+        self.status_code = response.status_code
+        # `elapsed` is the time until the headers arrived. What remains is the body download, unless streamed.
+        server = response.elapsed.total_seconds() if response.elapsed else 0.0
+        server = seconds if not 0 < server <= seconds else server
+        self.timings['server'] += server
+        self.timings['download'] += seconds - server
+        if not streamed:
+            self.bytes_in += len(response.content)
+
+    def finish(self):
+        self.timings['total'] = time.monotonic() - self._start
+
+    def get_labels(self) -> Dict[str, str]:
+        """
+        :return: Low-cardinality labels for metrics backends
+        """
+        return {
+            'endpoint': self.endpoint_template,
+            'method': self.method,
+            'status': str(self.status_code) if self.status_code is not None else self.error or 'none',
+            'cache_hit': str(self.cache_hit).lower(),
+            'retried': str(self.retried).lower()
+        }
+
+    def __repr__(self):
+        timings = ', '.join(f"{phase}={seconds * 1000:.1f}ms" for phase, seconds in self.timings.items() if seconds)
+        return (
+            f"RequestEvent({self.method} {self.endpoint_template}, status={self.status_code}, error={self.error}, "
+            f"attempts={self.attempts}, cache_hit={self.cache_hit}, bytes_out={self.bytes_out}, "
+            f"bytes_in={self.bytes_in}, {timings})"
+        )
+
+
+class Instrumentation:
+
+    def __init__(self, *hooks: Callable[[RequestEvent], None]):
+        """
+        Calls every hook with a `RequestEvent` at the end of each API call, e.g.
+        `Instrumentation(HistogramAggregator(), PrometheusExporter())`. Share one instance between resources to
+        aggregate across them.
+
+        A hook that raises is reported with a warning and does not affect the call.
+
+        :param hooks: Callables taking a `RequestEvent`
+        """
+        for hook in hooks:
+            if not callable(hook):
+                raise Exception("Every hook must be a callable taking a `RequestEvent`.")
+        self.hooks = list(hooks)
+
+    def add_hook(self, hook: Callable[[RequestEvent], None]):
+        if not callable(hook):
+            raise Exception("`hook` must be a callable taking a `RequestEvent`.")
+        self.hooks.append(hook)
+
+    def emit(self, event: RequestEvent):
+        for hook in self.hooks:
+            try:
+                hook(event)
+            except Exception as e:
+                warnings.warn(f"Instrumentation hook `{hook!r}` failed: {e!r}")
+
+
+class Histogram:
+
+    def __init__(self, buckets: Sequence[float]):
+        """
+        A fixed-bucket histogram. Not thread-safe on its own.
+
+        :param buckets: The ascending upper bounds of the buckets. Larger values go to an overflow bucket
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def get_quantile(self, q: float) -> Optional[float]:
+        """
+        :return: The `q` quantile (e.g. 0.99), interpolated within its bucket
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                value = lower + (upper - lower) * (rank - seen) / count
+                return min(max(value, self.min), self.max)
+            seen += count
+        return self.max
+
+
+class HistogramAggregator:
+
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        An in-process hook that keeps a latency histogram per endpoint template, method and status, along with the
+        time spent in each phase, the bytes transferred, cache hits and retries.
+
+        :param buckets: The upper bounds of the latency buckets, in seconds
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.__series = dict()
+        self.__lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        labels = event.get_labels()
+        key = (labels['endpoint'], labels['method'], labels['status'])
+        with self.__lock:
+            series = self.__series.get(key)
+            if series is None:
+                series = self.__series[key] = {
+                    'histogram': Histogram(self.buckets),
+                    'timings': dict.fromkeys(RequestEvent.PHASES, 0.0),
+                    'bytes_out': 0,
+                    'bytes_in': 0,
+                    'cache_hits': 0,
+                    'retried': 0
+                }
+            series['histogram'].observe(event.timings['total'])
+            for phase, seconds in event.timings.items():
+                series['timings'][phase] += seconds
+            series['bytes_out'] += event.bytes_out
+            series['bytes_in'] += event.bytes_in
+            series['cache_hits'] += event.cache_hit
+            series['retried'] += event.retried
+
+    def get_stats(self) -> list:
+        """
+        :return: One dict per endpoint template, method and status, slowest (by total time spent) first
+        """
+        stats = []
+        with self.__lock:
+            for (endpoint, method, status), series in self.__series.items():
+                histogram = series['histogram']
+                stats.append({
+                    'endpoint': endpoint,
+                    'method': method,
+                    'status': status,
+                    'count': histogram.count,
+                    'total_seconds': histogram.sum,
+                    'mean': histogram.sum / histogram.count,
+                    'min': histogram.min,
+                    'max': histogram.max,
+                    'p50': histogram.get_quantile(0.5),
+                    'p90': histogram.get_quantile(0.9),
+                    'p99': histogram.get_quantile(0.99),
+                    'mean_timings': {
+                        phase: seconds / histogram.count for phase, seconds in series['timings'].items()
+                    },
+                    'bytes_out': series['bytes_out'],
+                    'bytes_in': series['bytes_in'],
+                    'cache_hits': series['cache_hits'],
+                    'retried': series['retried']
+                })
+        stats.sort(key=lambda stat: stat['total_seconds'], reverse=True)
+        return stats
+
+    def reset(self):
+        with self.__lock:
+            self.__series.clear()
+
+
+class OpenTelemetryExporter:
+
+    def __init__(self, meter=None):
+        """
+        A hook recording every call with OpenTelemetry metrics: the call duration and the time of each phase as
+        histograms, and the bytes sent and received as counters, labelled as `RequestEvent.get_labels`.
+
+        :param meter: OPTIONAL: The OpenTelemetry `Meter` to use. Defaults to the global meter provider's
+        `theblockchainapi` meter
+        """
+        if otel_metrics is None:
+            raise Exception(
+                "`OpenTelemetryExporter` requires `opentelemetry-api`. Install it with "
+                "`pip install opentelemetry-api`."
+            )
+        if meter is None:
+            meter = otel_metrics.get_meter('theblockchainapi')
+        self.__duration = meter.create_histogram(
+            'blockchainapi.client.request.duration', unit='s', description="The duration of API calls."
+        )
+        self.__phase = meter.create_histogram(
+            'blockchainapi.client.request.phase.duration', unit='s',
+            description="The time spent in each phase of API calls."
+        )
+        self.__bytes_out = meter.create_counter(
+            'blockchainapi.client.request.size', unit='By', description="The bytes sent in request bodies."
+        )
+        self.__bytes_in = meter.create_counter(
+            'blockchainapi.client.response.size', unit='By', description="The bytes received in response bodies."
+        )
+
+    def __call__(self, event: RequestEvent):
+        labels = event.get_labels()
+        self.__duration.record(event.timings['total'], labels)
+        for phase, seconds in event.timings.items():
+            if phase != 'total':
+                self.__phase.record(seconds, dict(labels, phase=phase))
+        self.__bytes_out.add(event.bytes_out, labels)
+        self.__bytes_in.add(event.bytes_in, labels)
+
+
+class PrometheusExporter:
+
+    __LABELS = ('endpoint', 'method', 'status', 'cache_hit', 'retried')
+
+    def __init__(self, registry=None, buckets: Sequence[float] = HistogramAggregator.DEFAULT_BUCKETS):
+        """
+        A hook recording every call with `prometheus_client`: the call duration and the time of each phase as
+        histograms, and the bytes sent and received as counters, labelled as `RequestEvent.get_labels`.
+
+        :param registry: OPTIONAL: The `CollectorRegistry` to register the metrics with. Defaults to the global
+        registry. Create one exporter per registry
+        :param buckets: The upper bounds of the latency buckets, in seconds
+        """
+        if prometheus_client is None:
+            raise Exception(
+                "`PrometheusExporter` requires `prometheus_client`. Install it with `pip install prometheus_client`."
+            )
+        if registry is None:
+            registry = prometheus_client.REGISTRY
+        self.__duration = prometheus_client.Histogram(
+            'blockchainapi_request_duration_seconds', "The duration of API calls.",
+            labelnames=PrometheusExporter.__LABELS, buckets=buckets, registry=registry
+        )
+        self.__phase = prometheus_client.Histogram(
+            'blockchainapi_request_phase_duration_seconds', "The time spent in each phase of API calls.",
+            labelnames=PrometheusExporter.__LABELS + ('phase',), buckets=buckets, registry=registry
+        )
+        self.__bytes_out = prometheus_client.Counter(
+            'blockchainapi_request_bytes', "The bytes sent in request bodies.",
+            labelnames=PrometheusExporter.__LABELS, registry=registry
+        )
+        self.__bytes_in = prometheus_client.Counter(
+            'blockchainapi_response_bytes', "The bytes received in response bodies.",
+            labelnames=PrometheusExporter.__LABELS, registry=registry
+        )
+
+    def __call__(self, event: RequestEvent):
+        labels = event.get_labels()
+        self.__duration.labels(**labels).observe(event.timings['total'])
+        for phase, seconds in event.timings.items():
+            if phase != 'total':
+                self.__phase.labels(phase=phase, **labels).observe(seconds)
+        self.__bytes_out.labels(**labels).inc(event.bytes_out)
+        self.__bytes_in.labels(**labels).inc(event.bytes_in)
@@ -0,0 +1,246 @@
+import sys
+from typing import Any, Iterable, Optional, Tuple
+
+from theblockchainapi import units
+from theblockchainapi.serializer import get_default_serializer
+
+
+def _encode(value: Any) -> Any:
+    """
+    Encodes a nested object or list into compact JSON bytes, which take a fraction of the memory of the decoded
+    objects. Scalars are kept as they are.
+    """
+    if not isinstance(value, (dict, list)):
+        return value
+    encoded = get_default_serializer().dumps(value)
+    return encoded.encode() if isinstance(encoded, str) else encoded
+
+
+def _decode(value: Any) -> Any:
+    # JSON never decodes to `bytes`, so `bytes` always means "still encoded".
+    if isinstance(value, bytes):
+        return get_default_serializer().loads(value)
+    return value
+
+
+class _Lazy:
+
+    def __init__(self, model: Optional[type] = None):
+        """
+        A field holding a nested object that is kept encoded until it is first accessed, then decoded (into a `model`
+        instance if given) and cached.
+
+        :param model: OPTIONAL: The `Model` subclass to decode the nested object into
+        """
+        self.model = model
+        self.name = None
+        self.slot = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.slot = '_' + name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        value = getattr(instance, self.slot)
+        if isinstance(value, bytes):
+            value = _decode(value)
+            if self.model is not None and isinstance(value, dict):
+                value = self.model.from_dict(value)
+            setattr(instance, self.slot, value)
+        return value
+
+
+class Model:
+    """
+    A compact, typed view of a response dict.
+
+    Known top-level fields live in `__slots__`, and those listed in `_INTERNED` are interned, so that e.g. a mint
+    address or a network name repeated across millions of models is stored once. Nested objects (`_Lazy` fields) and
+    unknown fields are kept as compact JSON bytes until first accessed. Unknown fields remain readable as
+    attributes, and `to_dict()` gives back the original dict.
+    """
+
+    __slots__ = ('_absent', '_extra')
+
+    _FIELDS: Tuple[str, ...] = ()
+    _INTERNED: Tuple[str, ...] = ()
+    _LAZY: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, response: dict):
+        """
+        :param response: A response dict, e.g. from `get_nft_metadata`
+        """
+        if not isinstance(response, dict):
+            raise Exception(f"`{cls.__name__}.from_dict` expects a `dict`, got `{type(response).__name__}`.")
+        model = cls.__new__(cls)
+        absent = 0
+        bit = 1
+        for name in cls._FIELDS:
+            if name in response:
+                value = response[name]
+                if name in cls._INTERNED and isinstance(value, str):
+                    value = sys.intern(value)
+            else:
+                value = None
+                absent |= bit
+            setattr(model, name, value)
+            bit <<= 1
+        for name in cls._LAZY:
+            if name in response:
+                value = _encode(response[name])
+            else:
+                value = None
+                absent |= bit
+            setattr(model, '_' + name, value)
+            bit <<= 1
+        model._absent = absent
+        extra = {key: value for key, value in response.items() if key not in cls.__known()}
+        model._extra = _encode(extra) if extra else None
+        return model
+
+    @classmethod
+    def from_list(cls, responses: Iterable[dict]) -> list:
+        return [cls.from_dict(response) for response in responses]
+
+    @classmethod
+    def __known(cls) -> frozenset:
+        known = cls.__dict__.get('_known')
+        if known is None:
+            known = frozenset(cls._FIELDS + cls._LAZY)
+            setattr(cls, '_known', known)
+        return known
+
+    def __getattr__(self, name: str):
+        # Only called for names that are neither slots nor class attributes: look in the unknown fields.
+        if not name.startswith('_'):
+            extra = _decode(object.__getattribute__(self, '_extra'))
+            if extra is not None:
+                object.__setattr__(self, '_extra', extra)
+                if name in extra:
+                    return extra[name]
+        raise AttributeError(f"`{type(self).__name__}` has no field `{name}`.")
+
+    def to_dict(self) -> dict:
+        """
+        :return: The response dict this model was built from
+        """
+        response = dict()
+        bit = 1
+        for name in self._FIELDS:
+            if not self._absent & bit:
+                response[name] = getattr(self, name)
+            bit <<= 1
+        for name in self._LAZY:
+            if not self._absent & bit:
+                value = getattr(self, name)
+                if isinstance(value, Model):
+                    value = value.to_dict()
+                elif isinstance(value, list):
+                    value = [item.to_dict() if isinstance(item, Model) else item for item in value]
+                response[name] = value
+            bit <<= 1
+        extra = _decode(self._extra)
+        if extra is not None:
+            response.update(extra)
+        return response
+
+    def __eq__(self, other):
+        if not isinstance(other, Model):
+            return NotImplemented
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self._FIELDS)
+        return f"{type(self).__name__}({fields})"
+
+
+class Balance(Model):
+
+    __slots__ = ('balance', 'unit', 'public_key', 'blockchain_identifier', 'mint_address', 'network')
+
+    _FIELDS = __slots__
+    _INTERNED = ('unit', 'public_key', 'blockchain_identifier', 'mint_address', 'network')
+
+    def convert(self, unit):
+        """
+        Converts the balance to another unit of its chain exactly, e.g. `balance.convert(SolanaCurrencyUnit.SOL)`, so
+        that a balance fetched once in lamports or wei gives every other unit. See `theblockchainapi.units.convert`.
+        """
+        if self.unit is None:
+            raise Exception("This balance has no `unit` to convert from.")
+        balance = self.balance
+        if isinstance(balance, float):
+            # The shortest repr of a float gives back the number as written in the JSON response.
+            balance = repr(balance)
+        return units.convert(balance, self.unit, unit)
+
+
+class TokenHolding(Model):
+
+    __slots__ = ('mint_address', 'public_key', 'token_account', 'amount', 'decimals', 'ui_amount', 'is_nft', 'network')
+
+    _FIELDS = __slots__
+    _INTERNED = ('mint_address', 'public_key', 'token_account', 'network')
+
+
+class NFTData(Model):
+
+    __slots__ = ('name', 'symbol', 'uri', 'seller_fee_basis_points', 'creators', 'share', 'verified')
+
+    _FIELDS = __slots__
+    _INTERNED = ('symbol',)
+
+    @classmethod
+    def from_dict(cls, response: dict):
+        model = super().from_dict(response)
+        if isinstance(model.creators, list):
+            model.creators = [sys.intern(creator) if isinstance(creator, str) else creator
+                              for creator in model.creators]
+        return model
+
+
+class NFTMetadata(Model):
+
+    __slots__ = (
+        'mint', 'update_authority', 'is_mutable', 'primary_sale_happened', 'edition_nonce', 'explorer_url',
+        'network', '_data', '_off_chain_data'
+    )
+
+    _FIELDS = (
+        'mint', 'update_authority', 'is_mutable', 'primary_sale_happened', 'edition_nonce', 'explorer_url', 'network'
+    )
+    _INTERNED = ('mint', 'update_authority', 'network')
+    _LAZY = ('data', 'off_chain_data')
+
+    data: Optional[NFTData] = _Lazy(NFTData)
+    off_chain_data: Optional[dict] = _Lazy()
+
+
+class Transaction(Model):
+
+    __slots__ = ('slot', 'block_time', 'signature', 'network', '_meta', '_transaction')
+
+    _FIELDS = ('slot', 'block_time', 'signature', 'network')
+    _INTERNED = ('network',)
+    _LAZY = ('meta', 'transaction')
+
+    meta: Optional[dict] = _Lazy()
+    transaction: Optional[dict] = _Lazy()
+
+
+class CandyMachine(Model):
+
+    __slots__ = (
+        'candy_machine_id', 'config_address', 'uuid', 'authority', 'wallet', 'token_mint', 'items_available',
+        'items_redeemed', 'price', 'go_live_date', 'candy_machine_contract_version', 'network'
+    )
+
+    _FIELDS = __slots__
+    _INTERNED = (
+        'candy_machine_id', 'config_address', 'authority', 'wallet', 'token_mint', 'candy_machine_contract_version',
+        'network'
+    )
+
@@ -0,0 +1,132 @@
+import fnmatch
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        """
+        A thread-safe token bucket that hands out reservations instead of blocking.
+
+        `reserve` always succeeds and returns how long the caller must wait before using the tokens. The level may
+        therefore go negative, which means reservations are queued. Because nothing blocks while holding the lock,
+        the same bucket paces threads and asyncio tasks alike.
+
+        :param rate: The number of tokens added per second
+        :param capacity: The maximum number of tokens, i.e. the largest burst. Defaults to `rate`
+        """
+        if not isinstance(rate, (int, float)) or rate <= 0:
+            raise Exception("`rate` must be a number greater than 0.")
+        if capacity is None:
+            capacity = max(float(rate), 1.0)
+        if not isinstance(capacity, (int, float)) or capacity < 1:
+            raise Exception("`capacity` must be a number greater than or equal to 1.")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.__tokens = self.capacity
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def __refill(self, now: float):
+        self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated_at) * self.rate)
+        self.__updated_at = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Takes `tokens` from the bucket.
+        :return: The number of seconds to wait before the tokens may be used
+        """
+        with self.__lock:
+            self.__refill(time.monotonic())
+            self.__tokens -= tokens
+            if self.__tokens >= 0:
+                return 0.0
+            return -self.__tokens / self.rate
+
+    @property
+    def level(self) -> float:
+        """
+        The current number of tokens. Negative when reservations are queued.
+        """
+        with self.__lock:
+            self.__refill(time.monotonic())
+            return self.__tokens
+
+
+class RateLimiter:
+
+    DEFAULT_FAMILY = '*'
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        families: Optional[Dict[str, Tuple[float, Optional[float]]]] = None,
+        costs: Optional[Dict[str, float]] = None
+    ):
+        """
+        A client-side rate limiter for one API key, measured in API credits.
+
+        Every request takes its credit cost from the key's bucket and, if its endpoint belongs to one of `families`,
+        from that family's bucket as well. Share one instance between every resource (and every thread or task)
+        using the same API key, so that they pace each other instead of running into 429s.
+
+        Endpoint patterns are shell-style and matched against the endpoint path, e.g. `solana/nft/*`. The first
+        matching pattern wins.
+
+        :param rate: The credits per second allowed for the API key
+        :param capacity: The largest burst of credits allowed for the API key. Defaults to `rate`
+        :param families: OPTIONAL: Extra limits per endpoint family, as `{pattern: (rate, capacity)}` or
+        `{pattern: rate}`. Example: `{'solana/nft/marketplaces/*': (2, 5)}`
+        :param costs: OPTIONAL: The credit cost of a call per endpoint family, as `{pattern: credits}`. Calls that
+        match no pattern cost 1 credit
+        """
+        if families is not None and not isinstance(families, dict):
+            raise Exception("`families` must be a `dict` mapping an endpoint pattern to `(rate, capacity)`.")
+        if costs is not None and not isinstance(costs, dict):
+            raise Exception("`costs` must be a `dict` mapping an endpoint pattern to a number of credits.")
+
+        self.__buckets = {RateLimiter.DEFAULT_FAMILY: TokenBucket(rate, capacity)}
+        self.__families = []
+        for pattern, limits in (families or dict()).items():
+            if isinstance(limits, (int, float)):
+                limits = (limits, None)
+            self.__buckets[pattern] = TokenBucket(*limits)
+            self.__families.append(pattern)
+        self.__costs = dict(costs or dict())
+
+    @staticmethod
+    def __match(endpoint: str, patterns) -> Optional[str]:
+        for pattern in patterns:
+            if fnmatch.fnmatchcase(endpoint, pattern):
+                return pattern
+        return None
+
+    def get_cost(self, endpoint: str) -> float:
+        """
+        :return: The credit cost of one call to `endpoint`
+        """
+        pattern = self.__match(endpoint, self.__costs)
+        return 1.0 if pattern is None else float(self.__costs[pattern])
+
+    def reserve(self, endpoint: str) -> float:
+        """
+        Takes the credit cost of one call to `endpoint` from the key's bucket and from its family's bucket.
+        :return: The number of seconds to wait before sending the request
+        """
+        cost = self.get_cost(endpoint)
+        delay = self.__buckets[RateLimiter.DEFAULT_FAMILY].reserve(cost)
+        family = self.__match(endpoint, self.__families)
+        if family is not None:
+            delay = max(delay, self.__buckets[family].reserve(cost))
+        return delay
+
+    def get_levels(self) -> Dict[str, float]:
+        """
+        :return: The current number of credits in each bucket, keyed by endpoint pattern (`*` for the API key).
+        A negative level means that many credits of reservations are queued.
+        """
+        return {pattern: bucket.level for pattern, bucket in self.__buckets.items()}
@@ -1,8 +1,26 @@
-import json
+import functools
+import time
 from enum import Enum
+from typing import Optional, List, Union, Iterable, Callable, Any, Sequence, Tuple
 import requests
-from typing import Optional, List, Union
 from requests import Response
+from theblockchainapi import bulk, streaming
+from theblockchainapi.errors import \
+    APIError, NotFoundError, RateLimitError, RequestTimeoutError, DeadlineExceededError, APIConnectionError, \
+    CircuitOpenError, get_error_class
+from theblockchainapi.rate_limit import RateLimiter
+from theblockchainapi.retry import RetryPolicy
+from theblockchainapi.cache import ResponseCache
+from theblockchainapi.singleflight import SingleFlight
+from theblockchainapi.circuit_breaker import CircuitBreaker
+from theblockchainapi.timeouts import TimeoutPolicy
+from theblockchainapi.store import TransactionStore, MemoryTransactionStore, is_final
+from theblockchainapi.derivation import DerivationEngine
+from theblockchainapi.snapshot import SnapshotProgress, _Snapshot
+from theblockchainapi.serializer import Serializer, get_default_serializer
+from theblockchainapi.streaming import JSONItemParser
+from theblockchainapi.metrics import Instrumentation, RequestEvent
+from theblockchainapi.transport import HTTPTransport, AsyncHTTPTransport
 
 
 class SolanaMintAddresses:
@@ -53,6 +71,15 @@ class DerivationPath(Enum):
         return f"m/44/501/{wallet_index}/0"
 
 
+class ScanCheck(Enum):
+    # The SOL balance of each account
+    BALANCE = "balance"
+    # The tokens and NFTs held by each account
+    TOKEN_HOLDINGS = "token_holdings"
+    # Both: an account is empty if it has neither
+    ANY = "any"
+
+
 class SolanaWallet:
 
     def __init__(
@@ -125,10 +152,29 @@ class SolanaWallet:
             raise Exception("Unknown error. Improperly initialized instance of `SolanaWallet`.")
 
 
+def _api_method(method):
+    """
+    Turns a generator of request steps into an API method.
+
+    The decorated method builds its payload, does `response = yield from self._request(...)` and then handles the
+    response. It never performs I/O itself: the resource's `_run` carries out each step, synchronously for
+    `APIResource`, or on the event loop for `AsyncAPIResource`. This way, the sync and async clients share every
+    line of payload-building and error-handling code.
+
+    Every API method also takes a `deadline=` keyword argument: the number of seconds the whole call may take. See
+    `TimeoutPolicy`.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, deadline: Optional[float] = None, **kwargs):
+        return self._run(method(self, *args, **kwargs), deadline=self._get_deadline(method.__name__, deadline))
+    return wrapper
+
+
 class APIResource:
 
     _url = "https://api.blockchainapi.com/v1/"
-    __timeout = 300
+    _transport_class = HTTPTransport
+    _STREAM_CHUNK_SIZE = 64 * 1024
 
     class _RequestMethod(Enum):
         GET = "GET"
@@ -136,7 +182,55 @@ class APIResource:
         PATCH = "PATCH"
         DELETE = "DELETE"
 
-    def __init__(self, api_key_id: str, api_secret_key: str, timeout=None):
+    class _Send:
+        """
+        A request step: send an HTTP request with the given `requests.request` arguments and resume with the
+        `Response`.
+        """
+
+        def __init__(self, **args):
+            self.args = args
+
+    class _Sleep:
+        """
+        A request step: wait for `seconds` and resume with `None`.
+        """
+
+        def __init__(self, seconds: float):
+            self.seconds = seconds
+
+    class _Wait:
+        """
+        A request step: wait for an identical in-flight request (a `singleflight.Call`) and resume with its result.
+        """
+
+        def __init__(self, call):
+            self.call = call
+
+    class _Read:
+        """
+        A request step: read the whole body of a (possibly streamed) `Response` and resume with its bytes.
+        """
+
+        def __init__(self, response: Response):
+            self.response = response
+
+    def __init__(
+        self,
+        api_key_id: str,
+        api_secret_key: str,
+        timeout=None,
+        transport: Optional[Union[HTTPTransport, AsyncHTTPTransport]] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        singleflight: Optional[SingleFlight] = None,
+        serializer: Optional[Serializer] = None,
+        instrumentation: Optional[Instrumentation] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeouts: Optional[TimeoutPolicy] = None,
+        transaction_store: Optional[TransactionStore] = None
+    ):
         """
 
         To get an API key pair, go to https://dashboard.blockchainapi.com/.
@@ -145,6 +239,28 @@ class APIResource:
 
         :param api_key_id: Your API key ID
         :param api_secret_key: Your API secret key
+        :param timeout: OPTIONAL: The connect and read timeout of every request, in seconds. Shorthand for
+        `timeouts=TimeoutPolicy(connect=timeout, read=timeout)`.
+        :param transport: OPTIONAL: A pooled `HTTPTransport` (`AsyncHTTPTransport` for async resources). Pass the same
+        instance to several resources to share their connections. If not provided, the resource creates its own,
+        which is closed by `close()`.
+        :param rate_limiter: OPTIONAL: A `RateLimiter` that paces requests client-side. Share one instance between all
+        resources using the same API key.
+        :param retry_policy: OPTIONAL: The `RetryPolicy` deciding which failed requests are retried. Defaults to
+        `RetryPolicy()`, which retries idempotent requests only. Use `RetryPolicy(max_retries=0)` to disable retries.
+        :param cache: OPTIONAL: A `ResponseCache` for the responses of immutable and slow-changing read endpoints.
+        :param singleflight: OPTIONAL: A `SingleFlight` that makes concurrent identical reads share one request.
+        :param serializer: OPTIONAL: The `Serializer` used to encode payloads and decode responses. Defaults to the
+        fastest one installed (orjson, msgspec, ujson, then `json`).
+        :param instrumentation: OPTIONAL: An `Instrumentation` whose hooks receive a `RequestEvent`, with a timing
+        breakdown, at the end of every call.
+        :param circuit_breaker: OPTIONAL: A `CircuitBreaker` that makes requests to a failing endpoint family fail fast
+        with a `CircuitOpenError`.
+        :param timeouts: OPTIONAL: The `TimeoutPolicy` giving the connect and read timeouts of every attempt, and the
+        default deadlines of calls. Defaults to `TimeoutPolicy()`: a 10 second connect and a 300 second read timeout,
+        and no deadline.
+        :param transaction_store: OPTIONAL: A `TransactionStore` that keeps the transactions fetched, which never
+        change once confirmed. Transaction lookups hit it first, and `sync_wallet` fills it.
         """
         self.__api_key_id = api_key_id
         self.__api_secret_key = api_secret_key
@@ -154,10 +270,127 @@ class APIResource:
             if timeout < 1:
                 raise Exception("`timeout` must be at least 1 second.")
             if timeout > 300:
-                raise Exception("`timeout` must be at most 120 second.")
-            self.__timeout = timeout
+                raise Exception("`timeout` must be at most 300 seconds.")
+            if timeouts is not None:
+                raise Exception("Provide `timeout` OR `timeouts`, not both.")
+            timeouts = TimeoutPolicy(connect=timeout, read=timeout)
+        elif timeouts is None:
+            timeouts = TimeoutPolicy()
+        elif not isinstance(timeouts, TimeoutPolicy):
+            raise Exception(
+                "`timeouts` must be an instance of `TimeoutPolicy`. "
+                "See `from theblockchainapi.timeouts import TimeoutPolicy`."
+            )
+        self._timeouts = timeouts
+
+        if transport is None:
+            self._transport = self._transport_class()
+            self._owns_transport = True
+        elif isinstance(transport, self._transport_class):
+            self._transport = transport
+            self._owns_transport = False
+        else:
+            raise Exception(
+                f"`transport` must be an instance of `{self._transport_class.__name__}`. "
+                f"See `from theblockchainapi.transport import {self._transport_class.__name__}`."
+            )
+
+        if rate_limiter is not None and not isinstance(rate_limiter, RateLimiter):
+            raise Exception(
+                "`rate_limiter` must be an instance of `RateLimiter`. "
+                "See `from theblockchainapi.rate_limit import RateLimiter`."
+            )
+        self._rate_limiter = rate_limiter
+
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+        elif not isinstance(retry_policy, RetryPolicy):
+            raise Exception(
+                "`retry_policy` must be an instance of `RetryPolicy`. "
+                "See `from theblockchainapi.retry import RetryPolicy`."
+            )
+        self._retry_policy = retry_policy
+
+        if cache is not None and not isinstance(cache, ResponseCache):
+            raise Exception(
+                "`cache` must be an instance of `ResponseCache`. "
+                "See `from theblockchainapi.cache import ResponseCache`."
+            )
+        self._cache = cache
+
+        if singleflight is not None and not isinstance(singleflight, SingleFlight):
+            raise Exception(
+                "`singleflight` must be an instance of `SingleFlight`. "
+                "See `from theblockchainapi.singleflight import SingleFlight`."
+            )
+        self._singleflight = singleflight
+
+        if serializer is None:
+            serializer = get_default_serializer()
+        elif not isinstance(serializer, Serializer):
+            raise Exception(
+                "`serializer` must be an instance of `Serializer`. "
+                "See `from theblockchainapi.serializer import Serializer`."
+            )
+        self._serializer = serializer
 
-    def __get_headers(self):
+        if instrumentation is not None and not isinstance(instrumentation, Instrumentation):
+            raise Exception(
+                "`instrumentation` must be an instance of `Instrumentation`. "
+                "See `from theblockchainapi.metrics import Instrumentation`."
+            )
+        self._instrumentation = instrumentation
+
+        if circuit_breaker is not None and not isinstance(circuit_breaker, CircuitBreaker):
+            raise Exception(
+                "`circuit_breaker` must be an instance of `CircuitBreaker`. "
+                "See `from theblockchainapi.circuit_breaker import CircuitBreaker`."
+            )
+        self._circuit_breaker = circuit_breaker
+
+        if transaction_store is not None and not isinstance(transaction_store, TransactionStore):
+            raise Exception(
+                "`transaction_store` must be an instance of `TransactionStore`. "
+                "See `from theblockchainapi.store import TransactionStore`."
+            )
+        self._transaction_store = transaction_store
+
+    def close(self):
+        """
+        Closes the resource's transport. A transport passed in by the caller is left open, since it may be shared
+        with other resources.
+        """
+        if self._owns_transport:
+            self._transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def map_concurrent(
+        self,
+        func: Callable[[Any], Any],
+        items: Iterable,
+        concurrency: int = 10,
+        ordered: bool = True
+    ):
+        """
+        Calls `func(item)` for every item with at most `concurrency` calls in flight, capturing per-item failures.
+        Use it to fan out any resource method, e.g. `resource.map_concurrent(resource.get_nft_owner, mint_addresses)`.
+
+        Keep `concurrency` at or below the transport's `pool_maxsize`, or the extra connections are not reused.
+
+        :param func: A callable taking one item
+        :param items: The inputs
+        :param concurrency: The maximum number of calls in flight
+        :param ordered: If True, yield results in input order. Otherwise, yield them as they complete.
+        :return: An iterator of `BulkResult` (an async iterator for async resources)
+        """
+        return bulk.map_concurrent(func, items, concurrency=concurrency, ordered=ordered)
+
+    def _get_headers(self):
         """
         Get the headers with the appropriate authentication parameters
         :return: The headers
@@ -168,6 +401,108 @@ class APIResource:
             'Language': 'Python'
         }
 
+    def _get_deadline(self, method_name: str, deadline: Optional[float] = None) -> Optional[float]:
+        """
+        :param deadline: OPTIONAL: The number of seconds the call may take. Defaults to the method's default deadline
+        :return: The `time.monotonic()` by which a call of `method_name` must complete, or `None`
+        """
+        if deadline is None:
+            deadline = self._timeouts.get_deadline(method_name)
+            if deadline is None:
+                return None
+        elif not isinstance(deadline, (int, float)) or deadline <= 0:
+            raise Exception("`deadline` must be a number of seconds greater than 0.")
+        return time.monotonic() + deadline
+
+    @staticmethod
+    def _get_remaining(deadline: float) -> float:
+        """
+        :return: The number of seconds left until `deadline`. Raises a `DeadlineExceededError` if there are none
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceededError("The deadline of the call has passed.")
+        return remaining
+
+    def _fit_to_deadline(self, args: dict, deadline: float) -> dict:
+        """
+        :return: The arguments of a request, with the timeouts shortened to what remains until `deadline`
+        """
+        remaining = self._get_remaining(deadline)
+        timeout = args.get('timeout')
+        if timeout is None:
+            timeout = remaining
+        elif isinstance(timeout, tuple):
+            timeout = tuple(remaining if value is None else min(value, remaining) for value in timeout)
+        else:
+            timeout = min(timeout, remaining)
+        return dict(args, timeout=timeout)
+
+    def _check_sleep(self, seconds: float, deadline: Optional[float]):
+        if deadline is not None and seconds >= self._get_remaining(deadline):
+            raise DeadlineExceededError(f"The deadline of the call would pass during a wait of {seconds:.2f}s.")
+
+    def _perform(self, step, deadline: Optional[float] = None):
+        """
+        Carries out a single request step synchronously.
+        :param deadline: OPTIONAL: The `time.monotonic()` by which the call must complete
+        """
+        if isinstance(step, APIResource._Send):
+            args = step.args if deadline is None else self._fit_to_deadline(step.args, deadline)
+            return self._transport.request(**args)
+        elif isinstance(step, APIResource._Sleep):
+            self._check_sleep(step.seconds, deadline)
+            time.sleep(step.seconds)
+            return None
+        elif isinstance(step, APIResource._Wait):
+            if deadline is None:
+                return step.call.wait()
+            try:
+                return step.call.wait(timeout=self._get_remaining(deadline))
+            except TimeoutError:
+                raise DeadlineExceededError("The deadline of the call has passed.")
+        elif isinstance(step, APIResource._Read):
+            return step.response.content
+        raise NotImplementedError(f"Unknown request step: `{type(step).__name__}`.")
+
+    def _run(self, steps, deadline: Optional[float] = None):
+        """
+        Drives a generator of request steps (see `_api_method`) to completion and returns its result.
+        :param deadline: OPTIONAL: The `time.monotonic()` by which the call must complete
+        """
+        try:
+            step = next(steps)
+            while True:
+                try:
+                    result = self._perform(step, deadline)
+                except Exception as e:
+                    step = steps.throw(e)
+                else:
+                    step = steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+    def _get_request_args(self, endpoint, request_method, files=None, headers=None, payload=None, params=None):
+        """
+        :return: The arguments of `requests.request` for an API request
+        """
+        if headers is None:
+            headers = self._get_headers()
+
+        args = {
+            'method': request_method.value,
+            'headers': headers,
+            'url': self._url + endpoint,
+            'timeout': self._timeouts.get_timeout()
+        }
+        if files is not None:
+            args['files'] = files
+        if payload is not None and len(payload) > 0:
+            args['data'] = self._serializer.dumps(payload)
+        if params is not None:
+            args['params'] = params
+        return args
+
     def _request(
         self,
         endpoint,
@@ -175,73 +510,529 @@ class APIResource:
         files=None,
         headers=None,
         payload=None,
-        params=None
+        params=None,
+        idempotent: Optional[bool] = None
     ):
         """
-        Makes an API request.
+        Makes an API request. This is a generator of request steps: use `yield from self._request(...)` inside an
+        `_api_method`.
         :param payload: the payload containing the parameters
         :param endpoint: the desired endpoint
         :param request_method: the method (e.g. POST, GET, PATCH, DELETE)
         :param files: files to send. only used when changing a profile image
         :param headers: headers for the request. only specified when changing a profile image
+        :param idempotent: whether the request is safe to retry. defaults to True for GET requests only, so pass True
+        for read-only POST requests
         :return:
         """
-        if headers is None:
-            headers = self.__get_headers()
+        args = self._get_request_args(
+            endpoint, request_method, files=files, headers=headers, payload=payload, params=params
+        )
 
-        args = {
-            'method': request_method.value,
-            'headers': headers,
-            'url': self._url + endpoint,
-            'timeout': self.__timeout
-        }
-        if files is not None:
-            args['files'] = files
-        if payload is not None and len(payload) > 0:
-            args['data'] = json.dumps(payload)
-        if params is not None:
-            args['params'] = params
+        if idempotent is None:
+            idempotent = request_method == self._RequestMethod.GET
+
+        event = self._start_event(args, endpoint)
+        if event is None:
+            return (yield from self.__request(endpoint, args, files, payload, params, idempotent))
+        try:
+            return (yield from self.__request(endpoint, args, files, payload, params, idempotent, event))
+        except Exception as e:
+            event.error = type(e).__name__
+            raise
+        finally:
+            self._finish_event(event)
+
+    def __request(self, endpoint, args, files, payload, params, idempotent: bool, event: RequestEvent = None):
+        start = time.monotonic()
+        request_key = None
+        if idempotent and files is None and (self._cache is not None or self._singleflight is not None):
+            request_key = ResponseCache.get_key(self.__api_key_id, args['method'], endpoint, payload, params)
+
+        if request_key is not None and self._cache is not None:
+            content = self._cache.lookup(endpoint, request_key)
+            if content is not None:
+                decode_start = time.monotonic()
+                json_content = self._serializer.loads(content)
+                if event is not None:
+                    event.cache_hit = True
+                    event.status_code = 200
+                    event.bytes_in = len(content)
+                    event.add('decode', time.monotonic() - decode_start)
+                return json_content
+
+        leader = True
+        if request_key is not None and self._singleflight is not None:
+            while True:
+                call, leader = self._singleflight.join(request_key)
+                if leader:
+                    try:
+                        r = yield from self._send(endpoint, args, idempotent, event)
+                    except Exception as e:
+                        self._singleflight.finish(request_key, call, error=e)
+                        raise
+                    except BaseException:
+                        # A cancellation or a closed generator belongs to the leader only: its waiters ask again.
+                        self._singleflight.abandon(request_key, call)
+                        raise
+                    self._singleflight.finish(request_key, call, result=r)
+                    break
+                r = yield self._Wait(call)
+                if not call.abandoned:
+                    if event is not None:
+                        event.coalesced = True
+                        event.status_code = r.status_code
+                    break
+        else:
+            r = yield from self._send(endpoint, args, idempotent, event)
 
-        r = requests.request(**args)
+        decode_start = time.monotonic()
         try:
-            json_content = json.loads(r.content)
-        except json.decoder.JSONDecodeError:
+            json_content = self._serializer.loads(r.content)
+        except ValueError:
             return r
+        finally:
+            if event is not None:
+                event.add('decode', time.monotonic() - decode_start)
+        if isinstance(json_content, dict) and 'error_message' in json_content:
+            raise APIError(
+                json_content['error_message'],
+                status_code=r.status_code,
+                endpoint=endpoint,
+                elapsed=time.monotonic() - start
+            )
+        if leader and request_key is not None and self._cache is not None and r.status_code == 200:
+            self._cache.store(endpoint, request_key, r.content, json_content)
         return json_content
 
+    def _start_event(self, args: dict, endpoint) -> Optional[RequestEvent]:
+        """
+        :return: The `RequestEvent` to fill in for a request, or `None` without instrumentation
+        """
+        if self._instrumentation is None:
+            return None
+        data = args.get('data')
+        return RequestEvent(args['method'], endpoint, bytes_out=len(data) if data is not None else 0)
+
+    def _finish_event(self, event: RequestEvent):
+        event.finish()
+        self._instrumentation.emit(event)
+
+    def _send(self, endpoint, args, idempotent: bool, event: RequestEvent = None):
+        """
+        Sends a request, pacing it with the rate limiter and retrying it according to the retry policy. This is a
+        generator of request steps.
+        :param event: OPTIONAL: The `RequestEvent` recording the timings of the attempts
+        :return: The final `Response`. If it failed (status code 400 or more), the matching `APIError` is raised
+        instead.
+        """
+        start = time.monotonic()
+        circuit = self._circuit_breaker.get_circuit(endpoint) if self._circuit_breaker is not None else None
+        self._retry_policy.budget.deposit()
+        attempt = 0
+        try:
+            while True:
+                if self._rate_limiter is not None:
+                    delay = self._rate_limiter.reserve(endpoint)
+                    if delay > 0:
+                        yield self._Sleep(delay)
+                        if event is not None:
+                            event.add('queued', delay)
+
+                # Acquired right before sending, so that a cancelled wait cannot leak a half-open probe.
+                permit = None
+                if circuit is not None:
+                    permit = circuit.acquire()
+                    if permit is None:
+                        raise CircuitOpenError(
+                            f"The circuit of `{circuit.family}` is open: its endpoints are failing, so the request was "
+                            f"not sent.",
+                            family=circuit.family,
+                            retry_after=circuit.get_retry_after(),
+                            endpoint=endpoint,
+                            elapsed=time.monotonic() - start,
+                            retryable=idempotent
+                        )
+
+                sent_at = time.monotonic()
+                try:
+                    r = yield self._Send(**args)
+                except DeadlineExceededError:
+                    if circuit is not None:
+                        circuit.release(permit, None)
+                    raise
+                except RetryPolicy.RETRYABLE_EXCEPTIONS as e:
+                    if circuit is not None:
+                        circuit.release(permit, True, time.monotonic() - sent_at)
+                    if event is not None:
+                        event.add_attempt(time.monotonic() - sent_at)
+                    delay = self._retry_policy.get_retry_delay(attempt, idempotent, error=e)
+                    if delay is None:
+                        error_class = RequestTimeoutError if isinstance(e, requests.Timeout) else APIConnectionError
+                        raise error_class(
+                            str(e), endpoint=endpoint, elapsed=time.monotonic() - start, retryable=idempotent
+                        ) from e
+                except BaseException:
+                    if circuit is not None:
+                        circuit.release(permit, None)
+                    raise
+                else:
+                    if circuit is not None:
+                        circuit.release(permit, r.status_code >= 500, time.monotonic() - sent_at)
+                    if event is not None:
+                        event.add_attempt(time.monotonic() - sent_at, r, streamed=args.get('stream', False))
+                    delay = self._retry_policy.get_retry_delay(attempt, idempotent, response=r)
+                    if delay is None:
+                        if r.status_code >= 400:
+                            read_at = time.monotonic()
+                            content = yield self._Read(r)
+                            r.close()
+                            if event is not None and args.get('stream', False):
+                                event.add('download', time.monotonic() - read_at)
+                                event.bytes_in += len(content)
+                            raise self._get_error(endpoint, r, content, time.monotonic() - start, idempotent)
+                        return r
+                    r.close()
+                attempt += 1
+                yield self._Sleep(delay)
+                if event is not None:
+                    event.add('backoff', delay)
+        except DeadlineExceededError as e:
+            e.endpoint = endpoint
+            e.elapsed = time.monotonic() - start
+            e.retryable = idempotent
+            raise
+
+    def _get_error(self, endpoint, r: Response, content: bytes, elapsed: float, idempotent: bool) -> APIError:
+        """
+        :return: The `APIError` matching a failed response whose body is `content`
+        """
+        try:
+            response = self._serializer.loads(content)
+        except ValueError:
+            response = None
+        if isinstance(response, dict) and 'error_message' in response:
+            message = str(response['error_message'])
+        else:
+            message = f"Unknown error: {r.status_code} {r.reason or ''}".strip()
+
+        error_class = get_error_class(r.status_code, message)
+        kwargs = dict(
+            status_code=r.status_code,
+            endpoint=endpoint,
+            elapsed=elapsed,
+            retryable=idempotent and self._retry_policy.is_retryable(response=r)
+        )
+        if error_class is RateLimitError:
+            kwargs['retry_after'] = self._retry_policy.get_retry_after(r)
+        return error_class(message, **kwargs)
+
+    def _request_transaction(self, network: str, signature: str, endpoint: str):
+        """
+        Requests a transaction, looking it up in the transaction store first and storing it once fetched, if it is
+        confirmed or finalized.
+        :param network: The network key of the store, e.g. `solana/devnet`
+        """
+        store = self._transaction_store
+        if store is not None:
+            transaction = store.get(network, signature)
+            if transaction is not None:
+                return transaction
+        response = yield from self._request(endpoint=endpoint, request_method=self._RequestMethod.GET)
+        if store is not None and is_final(response):
+            store.put(network, signature, response)
+        return response
+
+    def _iter_json_pages(
+        self,
+        endpoint,
+        request_method,
+        path: Sequence[str] = (),
+        payload=None,
+        params=None,
+        idempotent: Optional[bool] = None,
+        deadline: Optional[float] = None
+    ):
+        """
+        Makes an API request and streams the items of a large list in its response, without ever holding the whole
+        body in memory. See `JSONItemParser` for `path`.
+        :param deadline: OPTIONAL: The `time.monotonic()` by which the whole body must be read
+        :return: A generator of pages: the non-empty lists of items completed by each chunk of the body (an async
+        generator for async resources)
+        """
+        args = self._get_request_args(endpoint, request_method, payload=payload, params=params)
+        args['stream'] = True
+        if idempotent is None:
+            idempotent = request_method == self._RequestMethod.GET
+
+        event = self._start_event(args, endpoint)
+        try:
+            r = self._run(self._send(endpoint, args, idempotent, event), deadline=deadline)
+            download_start = time.monotonic()
+            try:
+                parser = JSONItemParser(path, status_code=r.status_code, endpoint=endpoint)
+                for chunk in r.iter_content(chunk_size=self._STREAM_CHUNK_SIZE):
+                    if deadline is not None:
+                        # Every read is bounded by the timeout fitted to the deadline: stop once it has passed.
+                        self._get_remaining(deadline)
+                    if event is not None:
+                        event.bytes_in += len(chunk)
+                    page = parser.feed(chunk)
+                    if page:
+                        yield page
+                    if parser.done:
+                        return
+                page = parser.close()
+                if page:
+                    yield page
+            finally:
+                r.close()
+                if event is not None:
+                    event.add('download', time.monotonic() - download_start)
+        except Exception as e:
+            if event is not None:
+                event.error = type(e).__name__
+            raise
+        finally:
+            if event is not None:
+                self._finish_event(event)
+
+    def _iter_json_items(
+        self,
+        endpoint,
+        request_method,
+        path: Sequence[str] = (),
+        payload=None,
+        params=None,
+        idempotent: Optional[bool] = None,
+        transform: Optional[Callable[[list], Tuple[list, bool]]] = None,
+        prefetch: int = 0,
+        method_name: Optional[str] = None,
+        deadline: Optional[float] = None
+    ):
+        """
+        Streams the items of a large list in a response one at a time. See `_iter_json_pages`. The request is only
+        sent once the first item is asked for, and the connection is closed as soon as the caller stops iterating.
+        :param transform: OPTIONAL: Called with every page. Returns the items to yield and whether to stop there
+        :param prefetch: The number of pages to read ahead in the background while the caller handles the current
+        one. 0 to only read when asked
+        :param method_name: The name of the streaming method, whose default deadline applies. See `TimeoutPolicy`
+        :param deadline: OPTIONAL: The number of seconds the whole stream may take, from the first item asked for
+        :return: A generator of items (an async generator for async resources)
+        """
+        pages = self._iter_json_pages(
+            endpoint,
+            request_method,
+            path=path,
+            payload=payload,
+            params=params,
+            idempotent=idempotent,
+            deadline=self._get_deadline(method_name, deadline)
+        )
+        if prefetch:
+            pages = streaming.prefetch(pages, prefetch)
+        try:
+            for page in pages:
+                done = False
+                if transform is not None:
+                    page, done = transform(page)
+                yield from page
+                if done:
+                    return
+        finally:
+            pages.close()
+
+    def _pipeline(self, tracker: bulk._PipelineTracker, items, func: Callable, concurrency: int, ordered: bool):
+        """
+        Streams the items of a (possibly lazy) iterator through `func` on `map_concurrent`. See `bulk._PipelineTracker`.
+        :param items: A generator (an async generator for async resources). It is closed when the pipeline stops
+        :return: A generator of `BulkResult` (an async generator for async resources)
+        """
+        results = self.map_concurrent(func, filter(tracker.select, items), concurrency=concurrency, ordered=ordered)
+        try:
+            tracker.open()
+            for result in results:
+                tracker.record(result)
+                yield result
+        finally:
+            results.close()
+            items.close()
+            tracker.close()
+        tracker.finish()
+
+
+class _SignatureWindow:
+
+    def __init__(self, since: Optional[str] = None, until: Optional[str] = None, limit: Optional[int] = None):
+        """
+        Selects the signatures strictly between `until` (newer) and `since` (older), at most `limit` of them, from
+        the pages of a newest-first signature list. See `SolanaAPIResource.iter_wallet_transactions`.
+        """
+        self.since = since
+        self.until = until
+        self.limit = limit
+        self.__started = until is None
+        self.__count = 0
+
+    def __call__(self, page: list) -> Tuple[list, bool]:
+        """
+        :return: The signatures of `page` to yield, and whether the window is over
+        """
+        if self.limit is not None and self.__count >= self.limit:
+            return [], True
+        selected = []
+        for signature in page:
+            if not self.__started:
+                self.__started = signature == self.until
+                continue
+            if self.since is not None and signature == self.since:
+                return selected, True
+            selected.append(signature)
+            self.__count += 1
+            if self.limit is not None and self.__count >= self.limit:
+                return selected, True
+        return selected, False
+
+
+class _WalletCrawl(bulk._PipelineTracker):
+
+    def __init__(self, public_key: str, network: str, store: TransactionStore):
+        """
+        The bookkeeping of one `SolanaAPIResource.crawl_wallet_transactions` run.
+
+        :param network: The network key of the store, e.g. `solana/devnet`
+        """
+        self.network = network
+        self.store = store
+        self.checkpoint_key = f"{network}/{public_key}"
+        self.since = store.get_checkpoint(self.checkpoint_key)
+        self.newest = None
+        self.failures = 0
+
+    def select(self, signature: str) -> bool:
+        """
+        :return: Whether `signature` must be hydrated, i.e. it is not in the store yet
+        """
+        if self.newest is None:
+            self.newest = signature
+        return not self.store.contains(self.network, signature)
+
+    def record(self, result: bulk.BulkResult):
+        if result.ok and is_final(result.value):
+            self.store.put(self.network, result.item, result.value)
+        else:
+            # Also keeps the checkpoint, so that a transaction that is not final yet is fetched again next time.
+            self.failures += 1
+
+    def finish(self):
+        """
+        Moves the checkpoint to the newest signature once every signature up to it has been stored.
+        """
+        if self.newest is not None and not self.failures:
+            self.store.set_checkpoint(self.checkpoint_key, self.newest)
+
+
+# The derivation path of each wallet index, for the paths that have one
+_WALLET_INDEX_PATHS = {
+    DerivationPath.PHANTOM_AND_SOLLET_PATH: "m/44/501/{wallet_index}/0",
+    DerivationPath.SOLFLARE_PATH: "m/44/501/{wallet_index}"
+}
+
+
+class _DerivationScan:
+
+    def __init__(self, engine: DerivationEngine, wallet_indices: list, paths: list, gap_limit: int, batch_size: int):
+        """
+        The bookkeeping of one `SolanaAPIResource.scan_derivation_paths` run.
+
+        :param paths: Path templates, with `{wallet_index}` in place of the wallet index, or fixed paths
+        """
+        self.engine = engine
+        self.wallet_indices = wallet_indices
+        self.paths = paths
+        self.gap_limit = gap_limit
+        self.batch_size = batch_size
+        # The number of empty accounts in a row of each path
+        self.gaps = {path: 0 for path in paths}
+        self.__position = 0
+
+    @property
+    def done(self) -> bool:
+        return self.__position >= len(self.wallet_indices) or all(gap >= self.gap_limit for gap in self.gaps.values())
+
+    def next_batch(self) -> list:
+        """
+        :return: The next accounts to check, with their public keys, ordered by wallet index
+        """
+        indices = self.wallet_indices[self.__position:self.__position + self.batch_size]
+        first = self.__position == 0
+        self.__position += len(indices)
+        candidates = []
+        for wallet_index in indices:
+            for path in self.paths:
+                if self.gaps[path] >= self.gap_limit:
+                    continue
+                if '{wallet_index}' in path:
+                    derivation_path = path.format(wallet_index=wallet_index)
+                elif first and wallet_index == indices[0]:
+                    # A fixed path is a single account.
+                    derivation_path = path
+                else:
+                    continue
+                candidates.append({'path': path, 'derivation_path': derivation_path, 'wallet_index': wallet_index})
+        public_keys = self.engine.derive_public_keys(candidate['derivation_path'] for candidate in candidates)
+        for candidate, public_key in zip(candidates, public_keys):
+            candidate['public_key'] = public_key
+            candidate['funded'] = None
+        return candidates
+
+    def record(self, result: bulk.BulkResult):
+        path = result.item['path']
+        if result.ok:
+            value = result.value
+            balance = value.get('balance') if isinstance(value, dict) else None
+            holdings = value.get('token_holdings') if isinstance(value, dict) else value
+            funded = (balance is not None and float(balance) != 0) or bool(holdings)
+            result.item['funded'] = funded
+        if '{wallet_index}' not in path:
+            # A fixed path has no other account to scan.
+            self.gaps[path] = self.gap_limit
+        elif result.ok:
+            self.gaps[path] = 0 if funded else self.gaps[path] + 1
+        # Otherwise unknown: an account that could not be checked does not count towards the gap, nor resets it.
+
 
 class SolanaAPIResource(APIResource):
 
+    @_api_method
     def generate_secret_key(self) -> str:
         """
         More info:
         https://docs.blockchainapi.com/#operation/solanaGenerateSecretRecoveryPhrase
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(),
             endpoint="solana/wallet/generate/secret_recovery_phrase",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['secret_recovery_phrase']
 
+    @_api_method
     def generate_private_key(self) -> dict:
         """
         More info:
         https://docs.blockchainapi.com/#operation/solanaGeneratePrivateKey
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=dict(),
             endpoint="solana/wallet/generate/private_key",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def derive_public_key(self, wallet: SolanaWallet) -> str:
         """
         Derives a public key given the info.
@@ -251,30 +1042,30 @@ class SolanaAPIResource(APIResource):
         :return:
         """
 
-        response = self._request(
+        response = yield from self._request(
             payload=wallet.get_formatted_request_payload(),
             endpoint="solana/wallet/public_key",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['public_key']
 
+    @_api_method
     def derive_private_key(self, wallet: SolanaWallet) -> str:
         """
         More info:
         https://docs.blockchainapi.com/#operation/solanaDerivePrivateKey
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload=wallet.get_formatted_request_payload(),
             endpoint="solana/wallet/private_key",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_balance(
         self,
         public_key: str,
@@ -299,15 +1090,42 @@ class SolanaAPIResource(APIResource):
         if mint_address is not None:
             payload['mint_address'] = mint_address
 
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint="solana/wallet/balance",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    def get_balances(
+        self,
+        public_keys: Iterable[str],
+        unit: SolanaCurrencyUnit = SolanaCurrencyUnit.LAMPORT,
+        network: SolanaNetwork = SolanaNetwork.DEVNET,
+        mint_address: str = None,
+        concurrency: int = 10,
+        ordered: bool = True
+    ):
+        """
+        Calls `get_balance` for many public keys concurrently. A failure for one public key is captured in its
+        `BulkResult` instead of aborting the batch.
+        :param public_keys:
+        :param unit: Ignored if `mint_address` provided
+        :param network:
+        :param mint_address:
+        :param concurrency: The maximum number of requests in flight
+        :param ordered: If True, yield results in input order. Otherwise, yield them as they complete.
+        :return: An iterator of `BulkResult` whose `item` is the public key (an async iterator for async resources)
+        """
+        return self.map_concurrent(
+            lambda public_key: self.get_balance(public_key, unit=unit, network=network, mint_address=mint_address),
+            public_keys,
+            concurrency=concurrency,
+            ordered=ordered
+        )
+
+    @_api_method
     def get_wallet_token_holdings(
         self,
         public_key: str,
@@ -324,7 +1142,7 @@ class SolanaAPIResource(APIResource):
         :param network:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             params={
                 'include_nfts': include_nfts,
                 'include_zero_balance_holdings': include_zero_balance_holdings
@@ -332,11 +1150,10 @@ class SolanaAPIResource(APIResource):
             endpoint=f"solana/wallet/{network.value}/{public_key}/tokens",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
 
         return response
 
+    @_api_method
     def get_wallet_transactions(
         self,
         public_key: str,
@@ -349,14 +1166,230 @@ class SolanaAPIResource(APIResource):
         :param network:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             endpoint=f"solana/wallet/{network.value}/{public_key}/transactions",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    def iter_wallet_transactions(
+        self,
+        public_key: str,
+        network: SolanaNetwork = SolanaNetwork.DEVNET,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        limit: Optional[int] = None,
+        prefetch: int = 0,
+        deadline: Optional[float] = None
+    ):
+        """
+        Like `get_wallet_transactions`, but yields the signatures one at a time, newest first, as the response
+        arrives. Nothing is requested before the first signature is asked for, and the connection is closed as soon
+        as the caller stops iterating or `limit` is reached, so that e.g. the newest 100 signatures of a busy wallet
+        cost a fraction of the full list.
+
+        The API returns the whole list in one response, so the pages are the parts of the body read so far.
+
+        :param public_key:
+        :param network:
+        :param since: OPTIONAL: Only yield signatures newer than this one, e.g. the newest one already synced
+        :param until: OPTIONAL: Only yield signatures older than this one, e.g. to resume an interrupted backfill.
+        Nothing is yielded if it is not in the list
+        :param limit: OPTIONAL: The maximum number of signatures to yield
+        :param prefetch: The number of pages to read ahead in the background while the caller handles the current
+        one, to hide latency. 0 to only read when asked
+        :param deadline: OPTIONAL: The number of seconds the whole stream may take, from the first item asked for.
+        Defaults to the method's default deadline. See `TimeoutPolicy`
+        :return: A generator of signatures (an async generator for async resources)
+        """
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            raise Exception("`limit` must be an integer greater than or equal to 0.")
+        if not isinstance(prefetch, int) or prefetch < 0:
+            raise Exception("`prefetch` must be an integer greater than or equal to 0.")
+        return self._iter_json_items(
+            endpoint=f"solana/wallet/{network.value}/{public_key}/transactions",
+            request_method=self._RequestMethod.GET,
+            transform=_SignatureWindow(since=since, until=until, limit=limit),
+            prefetch=prefetch,
+            method_name='iter_wallet_transactions',
+            deadline=deadline
+        )
+
+    def crawl_wallet_transactions(
+        self,
+        public_key: str,
+        network: SolanaNetwork = SolanaNetwork.DEVNET,
+        store: Optional[TransactionStore] = None,
+        concurrency: int = 10,
+        ordered: bool = True,
+        prefetch: int = 1
+    ):
+        """
+        Fetches every transaction of a wallet: `get_wallet_transactions` followed by `get_solana_transaction` for
+        every signature, as a pipeline. Signatures are streamed from the list as it arrives and hydrated concurrently
+        on `concurrency` workers, so throughput scales with `concurrency` up to the rate limit and the transport's
+        connections per host.
+
+        Transactions are put in `store` as they arrive, and signatures already in it are skipped. Once a crawl
+        completes without failures, the wallet's newest signature is checkpointed in `store`, and the next crawl only
+        lists newer signatures. With a persistent store, an interrupted crawl resumes where it stopped.
+
+        :param public_key:
+        :param network:
+        :param store: OPTIONAL: Where transactions and checkpoints are kept. Defaults to the resource's
+        `transaction_store`, or a new `MemoryTransactionStore()` if it has none. Use `FileTransactionStore` or
+        `SQLiteTransactionStore` to keep them across runs
+        :param concurrency: The maximum number of transactions fetched at once
+        :param ordered: If True, yield results newest first, as listed. Otherwise, yield them as they complete.
+        :param prefetch: The number of pages of the signature list to read ahead. See `iter_wallet_transactions`
+        :return: An iterator of `BulkResult`, one per signature hydrated, whose `item` is the signature and `value` the
+        transaction (an async iterator for async resources)
+        """
+        if store is None:
+            store = self._transaction_store if self._transaction_store is not None else MemoryTransactionStore()
+        elif not isinstance(store, TransactionStore):
+            raise Exception(
+                "`store` must be an instance of `TransactionStore`. "
+                "See `from theblockchainapi.store import TransactionStore`."
+            )
+        crawl = _WalletCrawl(public_key, f"solana/{network.value}", store)
+        signatures = self.iter_wallet_transactions(public_key, network, since=crawl.since, prefetch=prefetch)
+        hydrate = functools.partial(self.get_solana_transaction, network=network)
+        return self._pipeline(crawl, signatures, hydrate, concurrency, ordered)
+
+    def sync_wallet(
+        self,
+        public_key: str,
+        network: SolanaNetwork = SolanaNetwork.DEVNET,
+        concurrency: int = 10
+    ):
+        """
+        Brings the resource's `transaction_store` up to date with a wallet: fetches the transactions of the signatures
+        newer than the last one synced, and skips those already stored. Once a wallet is synced, syncing it again
+        costs a single request for the list of signatures. See `crawl_wallet_transactions`.
+
+        Transactions that fail to be fetched are fetched again by the next sync; the first failure is raised once the
+        others are stored.
+
+        :param public_key:
+        :param network:
+        :param concurrency: The maximum number of transactions fetched at once
+        :return: The signatures synced, newest first (awaitable for async resources)
+        """
+        if self._transaction_store is None:
+            raise Exception(
+                "`sync_wallet` requires a `transaction_store`. "
+                "See `from theblockchainapi.store import SQLiteTransactionStore`."
+            )
+        results = self.crawl_wallet_transactions(
+            public_key, network, store=self._transaction_store, concurrency=concurrency
+        )
+        return self._sync(results)
+
+    def _sync(self, results):
+        signatures = []
+        error = None
+        for result in results:
+            if result.ok:
+                signatures.append(result.item)
+            elif error is None:
+                error = result.error
+        if error is not None:
+            raise error
+        return signatures
+
+    def scan_derivation_paths(
+        self,
+        secret_recovery_phrase: Union[str, DerivationEngine],
+        wallet_indices: Iterable[int] = range(1000),
+        paths: Sequence[Union[DerivationPath, str]] = (
+            DerivationPath.PHANTOM_AND_SOLLET_PATH, DerivationPath.SOLFLARE_PATH, DerivationPath.CLI_PATH
+        ),
+        network: SolanaNetwork = SolanaNetwork.DEVNET,
+        check: ScanCheck = ScanCheck.BALANCE,
+        gap_limit: int = 20,
+        batch_size: int = 20,
+        concurrency: int = 10,
+        passphrase: str = str()
+    ):
+        """
+        Finds the funded accounts of a secret recovery phrase, as wallets do when importing one: for each wallet
+        index, the account of each derivation path is checked, and a path stops being scanned once `gap_limit`
+        accounts in a row are empty (BIP44 gap-limit scanning).
+
+        Accounts are handled a batch of `batch_size` wallet indices at a time. Their public keys are derived locally
+        (see `theblockchainapi.derivation`), so the secret is not sent to the API, and they are checked concurrently.
+
+        :param secret_recovery_phrase: The secret recovery phrase, or a `DerivationEngine` to reuse its seed and cache
+        :param wallet_indices: The wallet indices to scan, in order, each from 0 to 2**31 - 1
+        :param paths: The paths to scan. `DerivationPath.PHANTOM_AND_SOLLET_PATH` and `DerivationPath.SOLFLARE_PATH`
+        have an account per wallet index, e.g. `m/44/501/3/0` and `m/44/501/3` for wallet index 3, and
+        `DerivationPath.CLI_PATH` a single account. Other paths are templates, e.g. `"m/44'/501'/{wallet_index}'"`,
+        or fixed paths
+        :param network:
+        :param check: What makes an account funded. `ScanCheck.ANY` costs two requests per account
+        :param gap_limit: The number of empty accounts in a row after which a path stops being scanned
+        :param batch_size: The number of wallet indices derived and checked at once
+        :param concurrency: The maximum number of requests in flight
+        :param passphrase: OPTIONAL: The BIP39 passphrase. Ignored if a `DerivationEngine` is provided
+        :return: An iterator of `BulkResult`, one per account checked, in the order of the wallet indices, whose `item`
+        is a `dict` with the account's `path`, `derivation_path`, `wallet_index`, `public_key` and whether it is
+        `funded` (None if it could not be checked), and `value` the response of the check (an async iterator for
+        async resources)
+        """
+        if not isinstance(check, ScanCheck):
+            raise Exception(
+                "`check` must be an instance of `ScanCheck`. See `from theblockchainapi.resource import ScanCheck`."
+            )
+        for name, value in (('gap_limit', gap_limit), ('batch_size', batch_size), ('concurrency', concurrency)):
+            if not isinstance(value, int) or value < 1:
+                raise Exception(f"`{name}` must be an integer greater than or equal to 1.")
+        engine = secret_recovery_phrase if isinstance(secret_recovery_phrase, DerivationEngine) \
+            else DerivationEngine(secret_recovery_phrase, passphrase)
+        templates = []
+        for path in paths:
+            if isinstance(path, DerivationPath):
+                path = _WALLET_INDEX_PATHS.get(path, path.value)
+            elif not isinstance(path, str):
+                raise Exception("Each path must be a `str` or instance of the enum `DerivationPath`.")
+            templates.append(path)
+        wallet_indices = list(wallet_indices)
+        for wallet_index in wallet_indices:
+            if not isinstance(wallet_index, int) or isinstance(wallet_index, bool) or not 0 <= wallet_index < 2 ** 31:
+                raise Exception(f"`{wallet_index}` is not a wallet index: it must be an integer from 0 to 2**31 - 1.")
+        scan = _DerivationScan(engine, wallet_indices, templates, gap_limit, batch_size)
+        return self._scan(scan, functools.partial(self._check_account, network=network, check=check), concurrency)
+
+    def _scan(self, scan: _DerivationScan, func: Callable, concurrency: int):
+        """
+        :return: A generator of `BulkResult` (an async generator for async resources). See `scan_derivation_paths`
+        """
+        while not scan.done:
+            results = self.map_concurrent(func, scan.next_batch(), concurrency=concurrency, ordered=True)
+            try:
+                for result in results:
+                    scan.record(result)
+                    yield result
+            finally:
+                results.close()
+
+    @_api_method
+    def _check_account(self, account: dict, network: SolanaNetwork, check: ScanCheck):
+        """
+        :return: The response of `check` for an account of `scan_derivation_paths`
+        """
+        public_key = account['public_key']
+        if check == ScanCheck.BALANCE:
+            return (yield from SolanaAPIResource.get_balance.__wrapped__(self, public_key, network=network))
+        holdings = yield from SolanaAPIResource.get_wallet_token_holdings.__wrapped__(
+            self, public_key, include_nfts=True, network=network
+        )
+        if check == ScanCheck.TOKEN_HOLDINGS:
+            return holdings
+        balance = yield from SolanaAPIResource.get_balance.__wrapped__(self, public_key, network=network)
+        return {'balance': balance.get('balance'), 'token_holdings': holdings}
+
+    @_api_method
     def get_nfts_belonging_to_address(
         self,
         public_key: str,
@@ -369,14 +1402,13 @@ class SolanaAPIResource(APIResource):
         :param network:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             endpoint=f"solana/wallet/{network.value}/{public_key}/nfts",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['nfts_metadata']
 
+    @_api_method
     def get_is_candy_machine(
         self,
         public_key: str,
@@ -389,14 +1421,13 @@ class SolanaAPIResource(APIResource):
         :param network:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             endpoint=f"solana/account/{network.value}/{public_key}/is_candy_machine",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_is_nft(
         self,
         public_key: str,
@@ -409,27 +1440,25 @@ class SolanaAPIResource(APIResource):
         :param network:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             endpoint=f"solana/account/{network.value}/{public_key}/is_nft",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['is_nft']
 
+    @_api_method
     def get_nft_owner(
         self,
         mint_address: str,
         network: SolanaNetwork = SolanaNetwork.DEVNET
     ):
-        response = self._request(
+        response = yield from self._request(
             endpoint=f"solana/nft/{network.value}/{mint_address}/owner",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['nft_owner']
 
+    @_api_method
     def get_associated_token_account_address(
         self,
         mint_address: str,
@@ -447,15 +1476,14 @@ class SolanaAPIResource(APIResource):
             "public_key": public_key
         }
 
-        response = self._request(
+        response = yield from self._request(
             params=payload,
             endpoint=f"solana/wallet/{public_key}/associated_token_account/{mint_address}",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['associated_token_address']
 
+    @_api_method
     def transfer(
         self,
         wallet: Optional[SolanaWallet],
@@ -504,15 +1532,14 @@ class SolanaAPIResource(APIResource):
         if fee_payer_wallet is not None:
             payload["fee_payer_wallet"] = fee_payer_wallet.get_formatted_request_payload()['wallet']
 
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint="solana/wallet/transfer",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['transaction_signature']
 
+    @_api_method
     def create_nft(
         self,
         wallet: SolanaWallet,
@@ -578,15 +1605,14 @@ class SolanaAPIResource(APIResource):
         if mint_to_public_key is not None:
             payload['mint_to_public_key'] = mint_to_public_key
 
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint="solana/nft",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def search_nfts(
         self,
         update_authority: Optional[str] = None,
@@ -619,15 +1645,15 @@ class SolanaAPIResource(APIResource):
         if nft_name is not None:
             payload['name'] = nft_name
             payload['name_search_method'] = nft_name_search_method.value
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint="solana/nft/search",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_nft_metadata(
         self,
         mint_address: str,
@@ -640,19 +1666,39 @@ class SolanaAPIResource(APIResource):
         :param network:
         :return:
         """
-        response = self._request(
-            endpoint=f"solana/nft/{network.value}/{mint_address}",
-            request_method=self._RequestMethod.GET
-        )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
-        if isinstance(response, Response):
-            if response.status_code == 404:
-                return None
-            else:
-                raise Exception("Unknown error: ", response.status_code)
+        try:
+            response = yield from self._request(
+                endpoint=f"solana/nft/{network.value}/{mint_address}",
+                request_method=self._RequestMethod.GET
+            )
+        except NotFoundError:
+            return None
         return response
 
+    def get_nft_metadata_many(
+        self,
+        mint_addresses: Iterable[str],
+        network: SolanaNetwork = SolanaNetwork.DEVNET,
+        concurrency: int = 10,
+        ordered: bool = True
+    ):
+        """
+        Calls `get_nft_metadata` for many mint addresses concurrently. A failure for one mint address is captured in
+        its `BulkResult` instead of aborting the batch.
+        :param mint_addresses:
+        :param network:
+        :param concurrency: The maximum number of requests in flight
+        :param ordered: If True, yield results in input order. Otherwise, yield them as they complete.
+        :return: An iterator of `BulkResult` whose `item` is the mint address (an async iterator for async resources)
+        """
+        return self.map_concurrent(
+            lambda mint_address: self.get_nft_metadata(mint_address, network=network),
+            mint_addresses,
+            concurrency=concurrency,
+            ordered=ordered
+        )
+
+    @_api_method
     def get_nft_mint_fee(
         self
     ) -> dict:
@@ -661,14 +1707,13 @@ class SolanaAPIResource(APIResource):
         https://docs.blockchainapi.com/#operation/solanaGetNFTMintFee
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             endpoint="solana/nft/mint/fee",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_airdrop(
         self,
         recipient_address: str
@@ -680,17 +1725,16 @@ class SolanaAPIResource(APIResource):
         :param recipient_address:
         :return: Transaction signature
         """
-        response = self._request(
+        response = yield from self._request(
             payload={
                 "recipient_address": recipient_address
             },
             endpoint="solana/wallet/airdrop",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['transaction_signature']
 
+    @_api_method
     def get_candy_machine_metadata(
         self,
         candy_machine_id: Optional[str] = None,
@@ -717,15 +1761,15 @@ class SolanaAPIResource(APIResource):
             payload['config_address'] = config_address
         if uuid is not None:
             payload['uuid'] = uuid
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint="solana/nft/candy_machine/metadata",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def mint_from_candy_machine(
         self,
         config_address: str,
@@ -751,28 +1795,42 @@ class SolanaAPIResource(APIResource):
             "candy_machine_contract_version": "v2"
         }
         payload = {**payload, **wallet_payload}
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint="solana/nft/candy_machine/mint",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['transaction_signature']
 
+    @_api_method
     def list_all_candy_machines(self):
         """
 
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             endpoint="solana/nft/candy_machine/list",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    def iter_all_candy_machines(self, deadline: Optional[float] = None):
+        """
+        Like `list_all_candy_machines`, but streams the candy machines one at a time as the response arrives, from
+        every list in the response.
+        :param deadline: OPTIONAL: The number of seconds the whole stream may take, from the first item asked for.
+        Defaults to the method's default deadline. See `TimeoutPolicy`
+        :return: A generator of candy machines (an async generator for async resources)
+        """
+        return self._iter_json_items(
+            endpoint="solana/nft/candy_machine/list",
+            request_method=self._RequestMethod.GET,
+            path=('*',),
+            method_name='iter_all_candy_machines',
+            deadline=deadline
+        )
+
+    @_api_method
     def search_candy_machines(
         self,
         update_authority: Optional[str] = None,
@@ -808,15 +1866,15 @@ class SolanaAPIResource(APIResource):
             payload['nft_name'] = nft_name
             payload['nft_name_index'] = nft_name_index
             payload['nft_name_search_method'] = nft_name_search_method.value
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint="solana/nft/candy_machine/search",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def create_test_candy_machine(
         self,
         wallet: SolanaWallet,
@@ -837,15 +1895,14 @@ class SolanaAPIResource(APIResource):
             "include_gatekeeper": include_gatekeeper
         }
         payload = {**payload, **wallet_payload}
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint="solana/nft/candy_machine",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['candy_machine_id']
 
+    @_api_method
     def get_solana_transaction(
         self,
         tx_signature: str,
@@ -857,14 +1914,14 @@ class SolanaAPIResource(APIResource):
         :param network:
         :return:
         """
-        response = self._request(
-            endpoint=f"solana/transaction/{network.value}/{tx_signature}",
-            request_method=self._RequestMethod.GET
+        response = yield from self._request_transaction(
+            network=f"solana/{network.value}",
+            signature=tx_signature,
+            endpoint=f"solana/transaction/{network.value}/{tx_signature}"
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_all_nfts_from_candy_machine(
         self,
         candy_machine_id,
@@ -880,15 +1937,104 @@ class SolanaAPIResource(APIResource):
         :param network:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             payload={},
             endpoint=f"solana/nft/candy_machine/{network.value}/{candy_machine_id}/nfts",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    def iter_all_nfts_from_candy_machine(
+        self,
+        candy_machine_id,
+        network: SolanaNetwork = SolanaNetwork.DEVNET,
+        nfts: str = 'all_nfts',
+        deadline: Optional[float] = None
+    ):
+        """
+        Like `get_all_nfts_from_candy_machine`, but streams the NFTs one at a time as the response arrives, so that
+        memory stays bounded however large the candy machine is.
+        :param candy_machine_id:
+        :param network:
+        :param nfts: Which list to stream: `all_nfts`, `unminted_nfts` or `minted_nfts`
+        :param deadline: OPTIONAL: The number of seconds the whole stream may take, from the first item asked for.
+        Defaults to the method's default deadline. See `TimeoutPolicy`
+        :return: A generator of NFTs (an async generator for async resources)
+        """
+        return self._iter_json_items(
+            endpoint=f"solana/nft/candy_machine/{network.value}/{candy_machine_id}/nfts",
+            request_method=self._RequestMethod.GET,
+            path=(nfts,),
+            method_name='iter_all_nfts_from_candy_machine',
+            deadline=deadline
+        )
+
+    def snapshot_candy_machine(
+        self,
+        candy_machine_id,
+        network: SolanaNetwork = SolanaNetwork.DEVNET,
+        nfts: str = 'minted_nfts',
+        concurrency: int = 10,
+        ordered: bool = False,
+        output: Optional[str] = None,
+        checkpoint: Optional[str] = None,
+        on_progress: Optional[Callable[[SnapshotProgress], Any]] = None,
+        prefetch: int = 1
+    ):
+        """
+        Takes a snapshot of a collection: enumerates the NFTs of a candy machine and gets the metadata, owner and
+        listing of each, as a pipeline. NFTs are hydrated as the list streams in, on `concurrency` workers.
+
+        Every snapshot record is a `dict` with the keys `mint_address`, `metadata`, `owner` and `listing`, which is
+        `None` if the NFT is not listed.
+
+        With `checkpoint`, the mint address of every completed NFT is appended to that file, and NFTs found in it are
+        skipped, so that an interrupted snapshot resumes where it stopped when run again with the same arguments.
+
+        :param candy_machine_id:
+        :param network:
+        :param nfts: Which NFTs to snapshot: `minted_nfts` or `all_nfts`. Unminted NFTs have no on-chain metadata to
+        get, so `unminted_nfts` is refused, and with `all_nfts` the results of the unminted ones are failures
+        :param concurrency: The maximum number of NFTs hydrated at once
+        :param ordered: If True, yield results in the order of the candy machine. Otherwise, yield them as they
+        complete.
+        :param output: OPTIONAL: The path of a file to append the records to, as JSON lines
+        :param checkpoint: OPTIONAL: The path of the checkpoint file. It is created if it does not exist
+        :param on_progress: OPTIONAL: Called with a `SnapshotProgress`, which includes the throughput, after every NFT
+        :param prefetch: The number of pages of the NFT list to read ahead. See `iter_wallet_transactions`
+        :return: An iterator of `BulkResult` whose `item` is the mint address and `value` the record (an async
+        iterator for async resources). Iterate over it to run the snapshot, even when writing to `output`. The files
+        are opened once it starts
+        """
+        if nfts not in ('minted_nfts', 'all_nfts'):
+            raise Exception(
+                "`nfts` must be `minted_nfts` or `all_nfts`: unminted NFTs have no on-chain metadata to snapshot."
+            )
+        snapshot = _Snapshot(checkpoint=checkpoint, output=output, on_progress=on_progress)
+        mint_addresses = self._iter_json_items(
+            endpoint=f"solana/nft/candy_machine/{network.value}/{candy_machine_id}/nfts",
+            request_method=self._RequestMethod.GET,
+            path=(nfts,),
+            prefetch=prefetch,
+            method_name='iter_all_nfts_from_candy_machine'
+        )
+        hydrate = functools.partial(self._get_nft_snapshot, network=network)
+        return self._pipeline(snapshot, mint_addresses, hydrate, concurrency, ordered)
+
+    @_api_method
+    def _get_nft_snapshot(self, mint_address: str, network: SolanaNetwork = SolanaNetwork.DEVNET) -> dict:
+        """
+        :return: The snapshot record of an NFT. See `snapshot_candy_machine`
+        """
+        metadata = yield from SolanaAPIResource.get_nft_metadata.__wrapped__(self, mint_address, network)
+        owner = yield from SolanaAPIResource.get_nft_owner.__wrapped__(self, mint_address, network)
+        try:
+            listing = yield from SolanaAPIResource.get_nft_listing.__wrapped__(self, mint_address, network)
+        except NotFoundError:
+            listing = None
+        return {'mint_address': mint_address, 'metadata': metadata, 'owner': owner, 'listing': listing}
+
+    @_api_method
     def get_candy_machine_id_from_nft(
         self,
         mint_address,
@@ -904,15 +2050,15 @@ class SolanaAPIResource(APIResource):
             "network": network.value,
             "mint_address": mint_address
         }
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint="solana/nft/candy_machine_id",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_account_info(
         self,
         public_key,
@@ -924,14 +2070,13 @@ class SolanaAPIResource(APIResource):
         :param network:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             endpoint=f"solana/account/{network.value}/{public_key}",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_spl_token(
         self,
         public_key,
@@ -943,14 +2088,13 @@ class SolanaAPIResource(APIResource):
         :param network:
         :return:
         """
-        response = self._request(
+        response = yield from self._request(
             endpoint=f"solana/spl-token/{network.value}/{public_key}",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_nft_listing(
         self,
         mint_address: str,
@@ -959,14 +2103,13 @@ class SolanaAPIResource(APIResource):
         """
         https://docs.blockchainapi.com/#operation/solanaGetAccount
         """
-        response = self._request(
+        response = yield from self._request(
             endpoint=f"solana/nft/marketplaces/listing/{network.value}/{mint_address}",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def list_nft(
         self,
         mint_address: str,
@@ -979,15 +2122,14 @@ class SolanaAPIResource(APIResource):
         """
         payload = wallet.get_formatted_request_payload()
         payload['nft_price'] = nft_price
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint=f"solana/nft/marketplaces/magic-eden/list/{network.value}/{mint_address}",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['transaction_signature']
 
+    @_api_method
     def delist_nft(
         self,
         mint_address: str,
@@ -998,15 +2140,14 @@ class SolanaAPIResource(APIResource):
         https://docs.blockchainapi.com/#operation/solanaGetAccount
         """
         payload = wallet.get_formatted_request_payload()
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint=f"solana/nft/marketplaces/magic-eden/delist/{network.value}/{mint_address}",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['transaction_signature']
 
+    @_api_method
     def buy_nft(
         self,
         mint_address: str,
@@ -1025,15 +2166,14 @@ class SolanaAPIResource(APIResource):
             payload['skip_checks'] = skip_checks
         if seller_public_key is not None:
             payload['seller_public_key'] = seller_public_key
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint=f"solana/nft/marketplaces/magic-eden/buy/{network.value}/{mint_address}",
             request_method=self._RequestMethod.POST
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response['transaction_signature']
 
+    @_api_method
     def get_nft_marketplace_analytics(
         self,
         mint_addresses: List[str],
@@ -1049,31 +2189,28 @@ class SolanaAPIResource(APIResource):
             payload['start_time'] = start_time
         if end_time is not None:
             payload['end_time'] = end_time
-        response = self._request(
+        response = yield from self._request(
             payload=payload,
             endpoint=f"solana/nft/marketplaces/analytics",
-            request_method=self._RequestMethod.POST
+            request_method=self._RequestMethod.POST,
+            idempotent=True
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_recent_nft_transactions(self):
-        response = self._request(
+        response = yield from self._request(
             payload=dict(),
             endpoint=f"solana/nft/marketplaces/analytics/recent_transactions",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
 
+    @_api_method
     def get_nft_market_share(self):
-        response = self._request(
+        response = yield from self._request(
             payload=dict(),
             endpoint=f"solana/nft/marketplaces/analytics/market_share",
             request_method=self._RequestMethod.GET
         )
-        if 'error_message' in response:
-            raise Exception(response['error_message'])
         return response
@@ -0,0 +1,183 @@
+import email.utils
+import random
+import threading
+import time
+from typing import Optional, Tuple
+
+import requests
+from requests import Response
+
+
+class RetryBudget:
+
+    def __init__(self, ratio: float = 0.2, min_retries_per_second: float = 1.0, max_tokens: float = 100.0):
+        """
+        Caps retries to a fraction of the traffic, so that a server outage does not multiply the load.
+
+        Every request deposits `ratio` tokens and every retry withdraws one. On top of that, `min_retries_per_second`
+        tokens are added each second so that a low-traffic client can still retry.
+
+        :param ratio: The number of retries allowed per request, e.g. 0.2 allows 1 retry per 5 requests
+        :param min_retries_per_second: The number of retries always allowed per second
+        :param max_tokens: The largest number of retries that can be saved up
+        """
+        if ratio < 0:
+            raise Exception("`ratio` must be greater than or equal to 0.")
+        if min_retries_per_second < 0:
+            raise Exception("`min_retries_per_second` must be greater than or equal to 0.")
+
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.max_tokens = max_tokens
+        self.__tokens = max_tokens
+        self.__updated_at = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def __refill(self):
+        now = time.monotonic()
+        self.__tokens = min(self.max_tokens, self.__tokens + (now - self.__updated_at) * self.min_retries_per_second)
+        self.__updated_at = now
+
+    def deposit(self):
+        with self.__lock:
+            self.__refill()
+            self.__tokens = min(self.max_tokens, self.__tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        :return: Whether a retry is allowed
+        """
+        with self.__lock:
+            self.__refill()
+            if self.__tokens < 1:
+                return False
+            self.__tokens -= 1
+            return True
+
+    @property
+    def level(self) -> float:
+        with self.__lock:
+            self.__refill()
+            return self.__tokens
+
+
+class RetryPolicy:
+
+    RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+    RETRYABLE_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        retry_status_codes: Tuple[int, ...] = RETRYABLE_STATUS_CODES,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 60.0,
+        retry_non_idempotent: bool = False,
+        budget: Optional[RetryBudget] = None
+    ):
+        """
+        Decides whether and when a failed request is retried.
+
+        Idempotent requests (GETs, and the read-only POSTs such as `get_balance` or `search_nfts`) are retried on
+        connection errors, timeouts and `retry_status_codes`, with exponential backoff and full jitter. A
+        `Retry-After` header takes precedence over the backoff.
+
+        State-changing requests, such as `transfer`, `buy_nft`, `create_nft` or `mint_from_candy_machine`, are never
+        retried unless `retry_non_idempotent` is True: a retry could, e.g., send the same transfer twice.
+
+        :param max_retries: The maximum number of retries per request. 0 disables retries
+        :param backoff_base: The backoff ceiling of the first retry, in seconds. It doubles with each retry
+        :param backoff_max: The largest backoff ceiling, in seconds
+        :param retry_status_codes: The HTTP status codes that are retried
+        :param respect_retry_after: Whether to wait for the time given by a `Retry-After` header
+        :param max_retry_after: Don't retry if `Retry-After` asks to wait longer than this, in seconds
+        :param retry_non_idempotent: Whether to retry state-changing requests too
+        :param budget: OPTIONAL: The `RetryBudget` shared by the requests using this policy. Defaults to a new
+        `RetryBudget()`. Pass the same policy (or budget) to several resources to share it
+        """
+        if not isinstance(max_retries, int) or max_retries < 0:
+            raise Exception("`max_retries` must be an integer greater than or equal to 0.")
+        if backoff_base < 0 or backoff_max < 0:
+            raise Exception("`backoff_base` and `backoff_max` must be greater than or equal to 0.")
+        if budget is not None and not isinstance(budget, RetryBudget):
+            raise Exception("`budget` must be an instance of `RetryBudget`.")
+
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_status_codes = tuple(retry_status_codes)
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+        self.retry_non_idempotent = retry_non_idempotent
+        self.budget = RetryBudget() if budget is None else budget
+
+    def get_backoff(self, attempt: int) -> float:
+        """
+        :param attempt: The number of retries already made
+        :return: A random delay between 0 and the backoff ceiling of the attempt, in seconds
+        """
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def get_retry_after(response: Response) -> Optional[float]:
+        """
+        :return: The delay requested by the `Retry-After` header of `response`, in seconds, if any
+        """
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+        try:
+            date = email.utils.parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date is None:
+            return None
+        return max(0.0, date.timestamp() - time.time())
+
+    def is_retryable(self, response: Optional[Response] = None, error: Optional[BaseException] = None) -> bool:
+        """
+        :return: Whether the outcome of a request is worth retrying, regardless of the request itself
+        """
+        if error is not None:
+            return isinstance(error, self.RETRYABLE_EXCEPTIONS)
+        return response is not None and response.status_code in self.retry_status_codes
+
+    def get_retry_delay(
+        self,
+        attempt: int,
+        idempotent: bool,
+        response: Optional[Response] = None,
+        error: Optional[BaseException] = None
+    ) -> Optional[float]:
+        """
+        Decides whether a request is retried after it got `response` or raised `error`.
+
+        :param attempt: The number of retries already made
+        :param idempotent: Whether the request is safe to repeat
+        :param response: The response received, if any
+        :param error: The exception raised, if any
+        :return: The number of seconds to wait before retrying, or `None` not to retry
+        """
+        if attempt >= self.max_retries:
+            return None
+        if not idempotent and not self.retry_non_idempotent:
+            return None
+        if not self.is_retryable(response=response, error=error):
+            return None
+
+        delay = self.get_backoff(attempt)
+        if response is not None and self.respect_retry_after:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None:
+                if retry_after > self.max_retry_after:
+                    return None
+                delay = retry_after
+
+        if not self.budget.withdraw():
+            return None
+        return delay
@@ -0,0 +1,213 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, List, Tuple
+
+
+def _validate(max_batch_size: int, max_delay: float):
+    if not isinstance(max_batch_size, int) or max_batch_size < 1:
+        raise Exception("`max_batch_size` must be an integer greater than or equal to 1.")
+    if not isinstance(max_delay, (int, float)) or max_delay < 0:
+        raise Exception("`max_delay` must be a number of seconds greater than or equal to 0.")
+
+
+class RPCBatcher:
+
+    def __init__(
+        self,
+        resource,
+        max_batch_size: int = 100,
+        max_delay: float = 0.005,
+        concurrency: int = 4,
+        idempotent: bool = False
+    ):
+        """
+        Coalesces JSON-RPC calls made independently, e.g. from many threads, into batches: a batch is sent with
+        `make_rpc_batch` once it holds `max_batch_size` calls, or `max_delay` seconds after its first call, and every
+        caller gets the result of its own call. Hundreds of small calls per second then cost a few requests.
+
+        Use it as a context manager, or call `close()` to send the pending calls and stop.
+
+        :param resource: The `BlockchainAPIResource` of the chain to call
+        :param max_batch_size: The maximum number of calls per batch
+        :param max_delay: The maximum number of seconds a call waits for its batch to fill up
+        :param concurrency: The maximum number of batches in flight
+        :param idempotent: Whether the calls only read, so that batches are safe to retry
+        """
+        _validate(max_batch_size, max_delay)
+        if not isinstance(concurrency, int) or concurrency < 1:
+            raise Exception("`concurrency` must be an integer greater than or equal to 1.")
+        self.resource = resource
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.idempotent = idempotent
+        self.__pending: List[Tuple[Tuple[str, Any], Future]] = []
+        self.__first_at = None
+        self.__closed = False
+        self.__condition = threading.Condition()
+        self.__executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.__thread = threading.Thread(target=self.__flush_loop, daemon=True)
+        self.__thread.start()
+
+    def submit(self, method: str, params: Any) -> Future:
+        """
+        Queues a call.
+        :return: A `concurrent.futures.Future` of its result. It raises an `RPCError` if the node answered the call
+        with an error, or the error of the whole batch's request
+        """
+        future = Future()
+        with self.__condition:
+            if self.__closed:
+                raise Exception("This `RPCBatcher` has been closed.")
+            if not self.__pending:
+                self.__first_at = time.monotonic()
+            self.__pending.append(((method, params), future))
+            if len(self.__pending) == 1 or len(self.__pending) >= self.max_batch_size:
+                self.__condition.notify()
+        return future
+
+    def call(self, method: str, params: Any) -> Any:
+        """
+        Makes a call as part of a batch, and waits for its result.
+        """
+        return self.submit(method, params).result()
+
+    def __flush_loop(self):
+        while True:
+            with self.__condition:
+                while True:
+                    if self.__pending:
+                        remaining = self.__first_at + self.max_delay - time.monotonic()
+                        if self.__closed or remaining <= 0 or len(self.__pending) >= self.max_batch_size:
+                            break
+                        self.__condition.wait(remaining)
+                    elif self.__closed:
+                        return
+                    else:
+                        self.__condition.wait()
+                batch = self.__pending[:self.max_batch_size]
+                self.__pending = self.__pending[self.max_batch_size:]
+                # The calls left over have waited since `__first_at` at the latest: keep it, so that they are not held
+                # for another `max_delay`. `submit` sets it anew once the queue has emptied.
+            self.__executor.submit(self.__send, batch)
+
+    def __send(self, batch: list):
+        # Leaves out the calls cancelled by their caller.
+        batch = [(call, future) for call, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        calls = [call for call, _ in batch]
+        futures = [future for _, future in batch]
+        try:
+            results = self.resource.make_rpc_batch(calls, idempotent=self.idempotent)
+        except BaseException as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            if result.ok:
+                future.set_result(result.value)
+            else:
+                future.set_exception(result.error)
+
+    def close(self):
+        """
+        Sends the pending calls, waits for every batch to complete, and stops.
+        """
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify()
+        self.__thread.join()
+        self.__executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncRPCBatcher:
+
+    def __init__(self, resource, max_batch_size: int = 100, max_delay: float = 0.005, idempotent: bool = False):
+        """
+        The asyncio version of `RPCBatcher`: coalesces the calls awaited by concurrent tasks on one event loop into
+        batches sent with `make_rpc_batch`.
+
+        :param resource: The `AsyncBlockchainAPIResource` of the chain to call
+        :param max_batch_size: The maximum number of calls per batch
+        :param max_delay: The maximum number of seconds a call waits for its batch to fill up
+        :param idempotent: Whether the calls only read, so that batches are safe to retry
+        """
+        _validate(max_batch_size, max_delay)
+        self.resource = resource
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.idempotent = idempotent
+        self.__pending: List[Tuple[Tuple[str, Any], asyncio.Future]] = []
+        self.__timer = None
+        self.__tasks = set()
+
+    async def call(self, method: str, params: Any) -> Any:
+        """
+        Makes a call as part of a batch, and waits for its result. See `RPCBatcher.submit` for the errors raised.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.__pending.append(((method, params), future))
+        if len(self.__pending) >= self.max_batch_size:
+            self.__flush()
+        elif self.__timer is None:
+            self.__timer = loop.call_later(self.max_delay, self.__flush)
+        return await future
+
+    def __flush(self):
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        batch, self.__pending = self.__pending[:self.max_batch_size], self.__pending[self.max_batch_size:]
+        if self.__pending:
+            self.__timer = asyncio.get_running_loop().call_later(self.max_delay, self.__flush)
+        if batch:
+            task = asyncio.ensure_future(self.__send(batch))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+    async def __send(self, batch: list):
+        calls = [call for call, _ in batch]
+        futures = [future for _, future in batch]
+        try:
+            results = await self.resource.make_rpc_batch(calls, idempotent=self.idempotent)
+        except asyncio.CancelledError:
+            for future in futures:
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            if future.done():
+                # The caller stopped waiting.
+                continue
+            if result.ok:
+                future.set_result(result.value)
+            else:
+                future.set_exception(result.error)
+
+    async def close(self):
+        """
+        Sends the pending calls and waits for every batch to complete.
+        """
+        while self.__pending:
+            self.__flush()
+        if self.__tasks:
+            await asyncio.gather(*self.__tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
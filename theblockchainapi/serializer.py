@@ -0,0 +1,147 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class Serializer:
+    """
+    Encodes request payloads and decodes response bodies. This one uses the standard library's `json`.
+
+    Subclasses must decode to exactly what `json.loads` returns, and raise a `ValueError` (such as
+    `json.JSONDecodeError`) when the body is not JSON.
+    """
+
+    name = 'json'
+
+    def dumps(self, obj: Any) -> Union[str, bytes]:
+        return json.dumps(obj)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+# Maps every digit to b'0' and every other byte to b' ', so that a run of digits can be found with `bytes.find`.
+_DIGITS_TABLE = bytes(ord('0') if ord('0') <= i <= ord('9') else ord(' ') for i in range(256))
+# 19 digits may not fit in 64 bits, which third-party parsers reject or silently turn into floats: e.g. orjson
+# decodes -9223372036854775809, one below the smallest int64, to a float.
+_BIG_INTEGER = b'0' * 19
+
+
+class _FallbackSerializer(Serializer):
+    """
+    A fast third-party parser that hands anything it may not decode like `json` to `json`: bodies containing
+    integers that may not fit in 64 bits (19 digits or more), and bodies it fails to parse. The output is therefore
+    always the one of `json.loads`, or its error. Likewise, objects it fails to encode, such as integers over 64
+    bits, are encoded by `json.dumps`.
+    """
+
+    def _dumps(self, obj: Any) -> Union[str, bytes]:
+        raise NotImplementedError
+
+    def _loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+    def dumps(self, obj: Any) -> Union[str, bytes]:
+        try:
+            return self._dumps(obj)
+        except Exception:
+            return json.dumps(obj, separators=(',', ':'))
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        if isinstance(data, str):
+            data = data.encode()
+        if data.translate(_DIGITS_TABLE).find(_BIG_INTEGER) != -1:
+            return json.loads(data)
+        try:
+            return self._loads(data)
+        except Exception:
+            return json.loads(data)
+
+
+class OrjsonSerializer(_FallbackSerializer):
+
+    name = 'orjson'
+
+    def __init__(self):
+        if orjson is None:
+            raise Exception("`OrjsonSerializer` requires `orjson`. Install it with `pip install orjson`.")
+
+    def _dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    def _loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class MsgspecSerializer(_FallbackSerializer):
+
+    name = 'msgspec'
+
+    def __init__(self):
+        if msgspec is None:
+            raise Exception("`MsgspecSerializer` requires `msgspec`. Install it with `pip install msgspec`.")
+        self.__encoder = msgspec.json.Encoder()
+        self.__decoder = msgspec.json.Decoder()
+
+    def _dumps(self, obj: Any) -> bytes:
+        return self.__encoder.encode(obj)
+
+    def _loads(self, data: bytes) -> Any:
+        return self.__decoder.decode(data)
+
+
+class UjsonSerializer(_FallbackSerializer):
+
+    name = 'ujson'
+
+    def __init__(self):
+        if ujson is None:
+            raise Exception("`UjsonSerializer` requires `ujson`. Install it with `pip install ujson`.")
+
+    def _dumps(self, obj: Any) -> str:
+        return ujson.dumps(obj)
+
+    def _loads(self, data: bytes) -> Any:
+        return ujson.loads(data)
+
+
+def get_available_serializers() -> list:
+    """
+    :return: An instance of every serializer whose library is installed, fastest first
+    """
+    serializers = []
+    if orjson is not None:
+        serializers.append(OrjsonSerializer())
+    if msgspec is not None:
+        serializers.append(MsgspecSerializer())
+    if ujson is not None:
+        serializers.append(UjsonSerializer())
+    serializers.append(Serializer())
+    return serializers
+
+
+_default_serializer = None
+
+
+def get_default_serializer() -> Serializer:
+    """
+    :return: The fastest installed serializer: orjson, then msgspec, then ujson, then the standard library's `json`
+    """
+    global _default_serializer
+    if _default_serializer is None:
+        _default_serializer = get_available_serializers()[0]
+    return _default_serializer
@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+def _copy_error(error: Exception) -> Exception:
+    # Without calling `__init__`, whose signature varies between exception classes.
+    try:
+        copied = type(error).__new__(type(error), *error.args)
+        copied.__dict__.update(error.__dict__)
+        return copied
+    except Exception:
+        return error
+
+
+class Call:
+
+    def __init__(self):
+        """
+        One in-flight request, awaited by every caller that asked for the same thing. Waiters can be threads
+        (`wait`) or asyncio tasks (`wait_async`), on any event loop.
+        """
+        self.__event = threading.Event()
+        self.__lock = threading.Lock()
+        self.__async_waiters = []
+        self.result = None
+        self.error: Optional[Exception] = None
+        # Whether the leader stopped without an outcome, e.g. it was cancelled. Its waiters must ask again.
+        self.abandoned = False
+
+    @property
+    def done(self) -> bool:
+        return self.__event.is_set()
+
+    def finish(self, result: Any = None, error: Optional[Exception] = None, abandoned: bool = False):
+        with self.__lock:
+            self.result = result
+            self.error = error
+            self.abandoned = abandoned
+            self.__event.set()
+            waiters, self.__async_waiters = self.__async_waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(Call.__wake, future)
+
+    @staticmethod
+    def __wake(future: asyncio.Future):
+        if not future.done():
+            future.set_result(None)
+
+    def get(self) -> Any:
+        """
+        :return: The result of the call. If it failed, a copy of its error is raised, so that waiters in different
+        threads and tasks never raise, and add to the traceback of, the same exception
+        """
+        if self.error is not None:
+            error = _copy_error(self.error)
+            if error is self.error:
+                raise error
+            raise error from self.error
+        return self.result
+
+    def wait(self, timeout: Optional[float] = None) -> Any:
+        """
+        :param timeout: OPTIONAL: The maximum number of seconds to wait. `TimeoutError` is raised when it passes
+        """
+        if not self.__event.wait(timeout):
+            raise TimeoutError("The in-flight request did not complete in time.")
+        return self.get()
+
+    async def wait_async(self) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self.__lock:
+            if self.__event.is_set():
+                future.set_result(None)
+            else:
+                self.__async_waiters.append((loop, future))
+        await future
+        return self.get()
+
+
+class SingleFlight:
+
+    def __init__(self):
+        """
+        Coalesces concurrent identical requests: while a request is in flight, callers asking for the same method,
+        endpoint and payload wait for it and share its response instead of sending their own.
+
+        Only idempotent requests are coalesced. Share one instance between resources to coalesce across them.
+        """
+        self.__calls: Dict[str, Call] = dict()
+        self.__lock = threading.Lock()
+        self.shared = 0
+
+    def join(self, key: str) -> Tuple[Call, bool]:
+        """
+        :return: The in-flight call for `key`, and whether the caller is its leader, i.e. must send the request and
+        then `finish` it
+        """
+        with self.__lock:
+            call = self.__calls.get(key)
+            if call is not None:
+                self.shared += 1
+                return call, False
+            call = Call()
+            self.__calls[key] = call
+            return call, True
+
+    def finish(self, key: str, call: Call, result: Any = None, error: Optional[Exception] = None):
+        """
+        Hands the outcome of the leader's request to every waiter and lets the next request for `key` go out.
+        """
+        with self.__lock:
+            if self.__calls.get(key) is call:
+                del self.__calls[key]
+        call.finish(result=result, error=error)
+
+    def abandon(self, key: str, call: Call):
+        """
+        Releases `key` when the leader stops without an outcome, e.g. because it was cancelled or closed. Its waiters
+        wake up with `call.abandoned` set and ask again: one of them becomes the new leader.
+        """
+        with self.__lock:
+            if self.__calls.get(key) is call:
+                del self.__calls[key]
+        call.finish(abandoned=True)
+
+    @property
+    def in_flight(self) -> int:
+        with self.__lock:
+            return len(self.__calls)
@@ -0,0 +1,98 @@
+import json
+import os
+import time
+from typing import Any, Callable, Optional
+
+from theblockchainapi.bulk import BulkResult, _PipelineTracker
+
+
+class SnapshotProgress:
+
+    def __init__(self):
+        """
+        The progress of a `SolanaAPIResource.snapshot_candy_machine` run.
+        """
+        # The number of NFTs enumerated so far, including those skipped.
+        self.enumerated = 0
+        # The number of NFTs skipped because an earlier run completed them.
+        self.skipped = 0
+        self.completed = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """
+        :return: The number of NFTs completed per second in this run
+        """
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return (
+            f"SnapshotProgress(enumerated={self.enumerated}, skipped={self.skipped}, completed={self.completed}, "
+            f"failed={self.failed}, throughput={self.throughput:.1f}/s)"
+        )
+
+
+class _Snapshot(_PipelineTracker):
+
+    def __init__(
+        self,
+        checkpoint: Optional[str] = None,
+        output: Optional[str] = None,
+        on_progress: Optional[Callable[[SnapshotProgress], Any]] = None
+    ):
+        """
+        The bookkeeping of one `SolanaAPIResource.snapshot_candy_machine` run.
+        """
+        self.progress = SnapshotProgress()
+        self.on_progress = on_progress
+        self.checkpoint = checkpoint
+        self.output = output
+        self.__done = set()
+        self.__checkpoint = None
+        self.__output = None
+
+    def open(self):
+        if self.checkpoint is not None:
+            if os.path.exists(self.checkpoint):
+                with open(self.checkpoint) as f:
+                    # A line cut off by a crash has no newline and is not counted.
+                    self.__done = {line[:-1] for line in f if line.endswith('\n')}
+            self.__checkpoint = open(self.checkpoint, 'a')
+        if self.output is not None:
+            self.__output = open(self.output, 'a')
+
+    def select(self, mint_address: str) -> bool:
+        self.progress.enumerated += 1
+        if mint_address in self.__done:
+            self.progress.skipped += 1
+            return False
+        return True
+
+    def record(self, result: BulkResult):
+        if result.ok:
+            # The record goes out before the checkpoint, so that a crash in between repeats the NFT rather than
+            # losing it.
+            if self.__output is not None:
+                self.__output.write(json.dumps(result.value, separators=(',', ':')) + '\n')
+                self.__output.flush()
+            if self.__checkpoint is not None:
+                self.__checkpoint.write(result.item + '\n')
+                self.__checkpoint.flush()
+            self.progress.completed += 1
+        else:
+            self.progress.failed += 1
+        if self.on_progress is not None:
+            self.on_progress(self.progress)
+
+    def close(self):
+        for f in (self.__output, self.__checkpoint):
+            if f is not None:
+                f.close()
+        self.__output = self.__checkpoint = None
@@ -0,0 +1,243 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+def is_final(transaction: Any) -> bool:
+    """
+    :return: Whether `transaction`, a response of `get_solana_transaction` or `get_transaction`, is a confirmed or
+    finalized transaction, which never changes and can be stored
+    """
+    if not isinstance(transaction, dict) or 'error_message' in transaction:
+        return False
+    for key in ('confirmation_status', 'confirmationStatus'):
+        if key in transaction:
+            return transaction[key] in ('confirmed', 'finalized')
+    # A pending EVM transaction is not in a block yet.
+    for key in ('block_number', 'blockNumber', 'block_hash', 'blockHash'):
+        if key in transaction and transaction[key] is None:
+            return False
+    return True
+
+
+class TransactionStore:
+    """
+    Stores confirmed transactions by network and signature, along with crawl checkpoints. Confirmed transactions never
+    change, so a stored transaction never needs to be downloaded again. Subclass it to plug in another store.
+    """
+
+    def get(self, network: str, signature: str) -> Optional[Any]:
+        """
+        :return: The transaction stored under `network` and `signature`, or `None` if it is missing
+        """
+        raise NotImplementedError
+
+    def contains(self, network: str, signature: str) -> bool:
+        return self.get(network, signature) is not None
+
+    def put(self, network: str, signature: str, transaction: Any):
+        """
+        Stores `transaction`, which must be JSON serializable, under `network` and `signature`. Only store
+        transactions for which `is_final` is true.
+        """
+        raise NotImplementedError
+
+    def get_checkpoint(self, key: str) -> Optional[str]:
+        """
+        :return: The signature checkpointed under `key`, e.g. the newest signature of a wallet crawled so far, or
+        `None` if there is none
+        """
+        raise NotImplementedError
+
+    def set_checkpoint(self, key: str, signature: str):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class MemoryTransactionStore(TransactionStore):
+
+    def __init__(self):
+        """
+        A thread-safe, in-process store. Its contents are lost when the process exits.
+        """
+        self.__transactions: Dict[Tuple[str, str], Any] = dict()
+        self.__checkpoints: Dict[str, str] = dict()
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.__transactions)
+
+    def get(self, network: str, signature: str) -> Optional[Any]:
+        return self.__transactions.get((network, signature))
+
+    def contains(self, network: str, signature: str) -> bool:
+        return (network, signature) in self.__transactions
+
+    def put(self, network: str, signature: str, transaction: Any):
+        with self.__lock:
+            self.__transactions[(network, signature)] = transaction
+
+    def get_checkpoint(self, key: str) -> Optional[str]:
+        return self.__checkpoints.get(key)
+
+    def set_checkpoint(self, key: str, signature: str):
+        with self.__lock:
+            self.__checkpoints[key] = signature
+
+
+class FileTransactionStore(TransactionStore):
+
+    def __init__(self, path: str):
+        """
+        A thread-safe store in an append-only file of JSON lines, indexed in memory by network and signature.
+
+        Records are only ever appended, so a crash loses at most the record being written, which is dropped when the
+        file is opened again. Only the index is held in memory; transactions are read from the file on lookup.
+
+        :param path: The path of the file. It is created if it does not exist
+        """
+        self.path = path
+        self.__index: Dict[Tuple[str, str], Tuple[int, int]] = dict()
+        self.__checkpoints: Dict[str, str] = dict()
+        self.__lock = threading.Lock()
+        self.__file = open(path, 'a+b')
+        self.__load()
+
+    def __load(self):
+        self.__file.seek(0)
+        offset = 0
+        for line in self.__file:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            if 'checkpoint' in record:
+                self.__checkpoints[record['checkpoint']] = record['signature']
+            else:
+                self.__index[(record['network'], record['signature'])] = (offset, len(line))
+            offset += len(line)
+        # Drops a record left incomplete by a crash, so that the next one starts on its own line.
+        self.__file.truncate(offset)
+        self.__file.seek(0, os.SEEK_END)
+
+    def __len__(self):
+        return len(self.__index)
+
+    def __append(self, record: dict) -> Tuple[int, int]:
+        line = json.dumps(record, separators=(',', ':')).encode() + b'\n'
+        self.__file.seek(0, os.SEEK_END)
+        offset = self.__file.tell()
+        self.__file.write(line)
+        self.__file.flush()
+        return offset, len(line)
+
+    def get(self, network: str, signature: str) -> Optional[Any]:
+        with self.__lock:
+            location = self.__index.get((network, signature))
+            if location is None:
+                return None
+            offset, length = location
+            self.__file.seek(offset)
+            line = self.__file.read(length)
+        return json.loads(line)['transaction']
+
+    def contains(self, network: str, signature: str) -> bool:
+        return (network, signature) in self.__index
+
+    def put(self, network: str, signature: str, transaction: Any):
+        with self.__lock:
+            if (network, signature) in self.__index:
+                return
+            self.__index[(network, signature)] = self.__append(
+                {'network': network, 'signature': signature, 'transaction': transaction}
+            )
+
+    def get_checkpoint(self, key: str) -> Optional[str]:
+        return self.__checkpoints.get(key)
+
+    def set_checkpoint(self, key: str, signature: str):
+        with self.__lock:
+            if self.__checkpoints.get(key) == signature:
+                return
+            self.__append({'checkpoint': key, 'signature': signature})
+            self.__checkpoints[key] = signature
+
+    def close(self):
+        with self.__lock:
+            self.__file.close()
+
+
+class SQLiteTransactionStore(TransactionStore):
+
+    def __init__(self, path: str):
+        """
+        A store in a SQLite database, so that several worker processes on a machine share their transactions.
+
+        :param path: The path of the database file. It is created if it does not exist
+        """
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS transactions ("
+            "network TEXT NOT NULL, signature TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (network, signature))"
+        )
+        self.__connection.execute(
+            "CREATE TABLE IF NOT EXISTS checkpoints (key TEXT PRIMARY KEY, signature TEXT NOT NULL)"
+        )
+
+    def __len__(self):
+        with self.__lock:
+            return self.__connection.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def get(self, network: str, signature: str) -> Optional[Any]:
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT value FROM transactions WHERE network = ? AND signature = ?", (network, signature)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def contains(self, network: str, signature: str) -> bool:
+        with self.__lock:
+            row = self.__connection.execute(
+                "SELECT 1 FROM transactions WHERE network = ? AND signature = ?", (network, signature)
+            ).fetchone()
+        return row is not None
+
+    def put(self, network: str, signature: str, transaction: Any):
+        value = json.dumps(transaction, separators=(',', ':'))
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT OR IGNORE INTO transactions (network, signature, value) VALUES (?, ?, ?)",
+                (network, signature, value)
+            )
+
+    def get_checkpoint(self, key: str) -> Optional[str]:
+        with self.__lock:
+            row = self.__connection.execute("SELECT signature FROM checkpoints WHERE key = ?", (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def set_checkpoint(self, key: str, signature: str):
+        with self.__lock:
+            self.__connection.execute(
+                "INSERT OR REPLACE INTO checkpoints (key, signature) VALUES (?, ?)", (key, signature)
+            )
+
+    def close(self):
+        with self.__lock:
+            self.__connection.close()
@@ -0,0 +1,324 @@
+import asyncio
+import codecs
+import json
+import queue
+import re
+import threading
+from typing import AsyncIterator, Iterator, Optional, Sequence
+
+from theblockchainapi.errors import get_error_class
+
+_NEED_DATA = object()
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER = re.compile(r'[-+0-9.eE]*')
+
+
+class JSONItemParser:
+
+    def __init__(self, path: Sequence[str] = (), status_code: int = 200, endpoint: Optional[str] = None):
+        """
+        An incremental JSON parser that yields the items of a large array (or the members of a large object) as the
+        body arrives, so that memory stays bounded by the largest item rather than by the whole response.
+
+        Feed it the chunks of the body with `feed`, which returns the items completed so far, then call `close`.
+
+        `path` leads from the top-level value to the collection to iterate:
+        - A key descends into that member of an object, e.g. `('all_nfts',)`.
+        - `'*'` descends into every member of an object, or every element of an array, in turn.
+        Once at the end of the path, an array yields its elements, an object yields `(key, value)` pairs, and any
+        other value is yielded as is. An `error_message` member on the way raises the matching `APIError`, as for
+        a response that is not streamed.
+
+        :param path: The keys leading to the collection to iterate. Empty for the top-level value
+        :param status_code: The status code of the response, for the `APIError`s raised
+        :param endpoint: OPTIONAL: The endpoint requested, for the `APIError`s raised
+        """
+        self.path = tuple(path)
+        self.status_code = status_code
+        self.endpoint = endpoint
+        self.__decoder = codecs.getincrementaldecoder('utf-8')()
+        self.__json = json.JSONDecoder()
+        self.__buffer = ''
+        self.__pos = 0
+        self.__eof = False
+        self.__done = False
+        self.__steps = self.__resolve(self.path)
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether every item has been produced. The rest of the body, if any, can be ignored.
+        """
+        return self.__done
+
+    def feed(self, chunk: bytes) -> list:
+        """
+        :return: The items completed by `chunk`
+        """
+        if self.__done:
+            return []
+        self.__buffer = self.__buffer[self.__pos:] + self.__decoder.decode(chunk)
+        self.__pos = 0
+        return self.__resume()
+
+    def close(self) -> list:
+        """
+        Signals the end of the body.
+        :return: The last items
+        """
+        if self.__done:
+            return []
+        self.__buffer = self.__buffer[self.__pos:] + self.__decoder.decode(b'', final=True)
+        self.__pos = 0
+        self.__eof = True
+        return self.__resume()
+
+    def __resume(self) -> list:
+        items = []
+        try:
+            while True:
+                item = next(self.__steps)
+                if item is _NEED_DATA:
+                    break
+                items.append(item)
+        except StopIteration:
+            self.__done = True
+        return items
+
+    # The methods below are generators that yield `_NEED_DATA` whenever the buffer runs out.
+
+    def __more(self):
+        if self.__eof:
+            raise Exception("The JSON response ended unexpectedly.")
+        yield _NEED_DATA
+
+    def __peek(self):
+        """
+        Skips whitespace.
+        :return: The next character, or '' at the end of the body
+        """
+        while True:
+            self.__pos = _WHITESPACE.match(self.__buffer, self.__pos).end()
+            if self.__pos < len(self.__buffer):
+                return self.__buffer[self.__pos]
+            if self.__eof:
+                return ''
+            yield _NEED_DATA
+
+    def __expect(self, char: str):
+        found = yield from self.__peek()
+        if found != char:
+            raise Exception(f"Invalid JSON response: expected `{char}`, found `{found}`.")
+        self.__pos += 1
+
+    def __value(self):
+        """
+        Decodes the next complete value.
+        """
+        while True:
+            found = yield from self.__peek()
+            if not self.__eof and found in '-0123456789':
+                # A number at the end of the buffer may continue in the next chunk, even where what has arrived
+                # so far would decode, e.g. `2.` or `1e` of `2.5` or `1e5`.
+                if _NUMBER.match(self.__buffer, self.__pos).end() == len(self.__buffer):
+                    yield _NEED_DATA
+                    continue
+            try:
+                value, end = self.__json.raw_decode(self.__buffer, self.__pos)
+            except json.JSONDecodeError:
+                if self.__eof:
+                    raise
+                yield _NEED_DATA
+                continue
+            self.__pos = end
+            return value
+
+    def __next_member(self, closing: str):
+        """
+        Consumes the separator after a member or an element.
+        :return: Whether another one follows
+        """
+        found = yield from self.__peek()
+        if found == ',':
+            self.__pos += 1
+            return True
+        yield from self.__expect(closing)
+        return False
+
+    def __opened(self, opening: str, closing: str):
+        """
+        Consumes `opening`.
+        :return: Whether the collection has any member
+        """
+        yield from self.__expect(opening)
+        found = yield from self.__peek()
+        if found == closing:
+            self.__pos += 1
+            return False
+        return True
+
+    def __key(self):
+        key = yield from self.__value()
+        yield from self.__expect(':')
+        return key
+
+    def __error(self, key):
+        if key == 'error_message':
+            message = str((yield from self.__value()))
+            error_class = get_error_class(self.status_code, message)
+            raise error_class(message, status_code=self.status_code, endpoint=self.endpoint)
+
+    def __skip(self):
+        """
+        Skips the next value one member at a time, so that a large value is never held in memory at once.
+        """
+        found = yield from self.__peek()
+        if found == '[':
+            if (yield from self.__opened('[', ']')):
+                while True:
+                    yield from self.__skip()
+                    if not (yield from self.__next_member(']')):
+                        break
+        elif found == '{':
+            if (yield from self.__opened('{', '}')):
+                while True:
+                    yield from self.__key()
+                    yield from self.__skip()
+                    if not (yield from self.__next_member('}')):
+                        break
+        else:
+            yield from self.__value()
+
+    def __resolve(self, path: tuple):
+        found = yield from self.__peek()
+
+        if not path:
+            if found == '[':
+                if (yield from self.__opened('[', ']')):
+                    while True:
+                        yield (yield from self.__value())
+                        if not (yield from self.__next_member(']')):
+                            break
+            elif found == '{':
+                if (yield from self.__opened('{', '}')):
+                    while True:
+                        key = yield from self.__key()
+                        yield from self.__error(key)
+                        yield key, (yield from self.__value())
+                        if not (yield from self.__next_member('}')):
+                            break
+            else:
+                yield (yield from self.__value())
+            return
+
+        head, rest = path[0], path[1:]
+        if found == '[' and head == '*':
+            if (yield from self.__opened('[', ']')):
+                while True:
+                    yield from self.__resolve(rest)
+                    if not (yield from self.__next_member(']')):
+                        break
+        elif found == '{':
+            if (yield from self.__opened('{', '}')):
+                while True:
+                    key = yield from self.__key()
+                    yield from self.__error(key)
+                    if head == '*':
+                        yield from self.__resolve(rest)
+                    elif key == head:
+                        yield from self.__resolve(rest)
+                        # Everything wanted has been produced; the rest of the body is not needed.
+                        return
+                    else:
+                        yield from self.__skip()
+                    if not (yield from self.__next_member('}')):
+                        break
+            if head != '*':
+                raise Exception(f"`{head}` not found in the response.")
+        else:
+            raise Exception(f"`{head}` not found in the response.")
+
+
+_END = object()
+
+
+def prefetch(items: Iterator, depth: int = 1) -> Iterator:
+    """
+    Iterates `items` in a background thread, keeping up to `depth` of them ready, so that producing the next one
+    (e.g. reading the next page of a response) overlaps with the caller's handling of the current one.
+
+    `items` is only started once the first item is asked for. When the caller stops iterating, the background
+    thread stops after the item it is producing and closes `items`.
+    """
+    if not isinstance(depth, int) or depth < 1:
+        raise Exception("`depth` must be an integer greater than or equal to 1.")
+    ready = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(entry) -> bool:
+        while not stopped.is_set():
+            try:
+                ready.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((_END, None))
+        except BaseException as e:
+            put((_END, e))
+        finally:
+            items.close()
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item, error = ready.get()
+            if error is not None:
+                raise error
+            if item is _END:
+                return
+            yield item
+    finally:
+        stopped.set()
+
+
+async def aprefetch(items: AsyncIterator, depth: int = 1) -> AsyncIterator:
+    """
+    Iterates the async generator `items` in a background task, keeping up to `depth` of them ready. See `prefetch`.
+    """
+    if not isinstance(depth, int) or depth < 1:
+        raise Exception("`depth` must be an integer greater than or equal to 1.")
+    ready = asyncio.Queue(maxsize=depth)
+
+    async def produce():
+        try:
+            async for item in items:
+                await ready.put((item, None))
+            await ready.put((_END, None))
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            await ready.put((_END, e))
+        finally:
+            await items.aclose()
+
+    task = asyncio.ensure_future(produce())
+    try:
+        while True:
+            item, error = await ready.get()
+            if error is not None:
+                raise error
+            if item is _END:
+                return
+            yield item
+    finally:
+        task.cancel()
+        # Waits for `items` to be closed. A cancellation of the caller itself still propagates.
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,370 @@
+import asyncio
+import inspect
+import itertools
+import json
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Set
+
+from theblockchainapi.errors import APIConnectionError, RPCError
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class Overflow(Enum):
+    # Stop reading from the connection until the subscriber catches up, which pauses every subscription of the client.
+    BLOCK = "block"
+    # Discard the oldest queued event to make room for the new one.
+    DROP_OLDEST = "drop_oldest"
+
+
+class Subscription:
+
+    def __init__(
+        self,
+        client: 'SubscriptionClient',
+        method: str,
+        params: list,
+        unsubscribe_method: str,
+        callback: Optional[Callable[[Any], Any]] = None,
+        once: bool = False
+    ):
+        """
+        One subscription of a `SubscriptionClient`. Iterate over it with `async for` to get its events, unless it was
+        created with a callback.
+        """
+        self.client = client
+        self.method = method
+        self.params = params
+        self.unsubscribe_method = unsubscribe_method
+        self.callback = callback
+        self.once = once
+        # The node's ID of the subscription, which changes on every reconnection.
+        self.id = None
+        self.dropped = 0
+        self.error: Optional[BaseException] = None
+        self.__queue = asyncio.Queue(maxsize=client.max_queue)
+        self.__subscribed = asyncio.get_running_loop().create_future()
+        self.__done = False
+        # Set whenever an event is queued or the subscription ends, to wake up the iterators.
+        self.__changed = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self.__done
+
+    @property
+    def subscribed(self) -> bool:
+        """
+        Whether the node has accepted the subscription at least once.
+        """
+        return self.__subscribed.done() and not self.__subscribed.cancelled() and \
+            self.__subscribed.exception() is None
+
+    async def wait_subscribed(self):
+        """
+        Waits until the node has accepted the subscription for the first time.
+        """
+        await asyncio.shield(self.__subscribed)
+
+    def _confirm(self, subscription_id: Any):
+        self.id = subscription_id
+        if not self.__subscribed.done():
+            self.__subscribed.set_result(subscription_id)
+
+    async def _deliver(self, event: Any):
+        if self.callback is not None:
+            result = self.callback(event)
+            if inspect.isawaitable(result):
+                await result
+        elif self.client.overflow == Overflow.BLOCK:
+            await self.__queue.put(event)
+            self.__changed.set()
+        else:
+            if self.__queue.full():
+                self.__queue.get_nowait()
+                self.dropped += 1
+            self.__queue.put_nowait(event)
+            self.__changed.set()
+        if self.once:
+            self._finish()
+
+    def _finish(self, error: Optional[BaseException] = None):
+        if self.__done:
+            return
+        self.__done = True
+        self.error = error
+        if not self.__subscribed.done():
+            if error is not None:
+                self.__subscribed.set_exception(error)
+            else:
+                self.__subscribed.cancel()
+        self.client._discard(self)
+        # The end is not queued, so that it never takes the place of an event.
+        self.__changed.set()
+
+    async def unsubscribe(self):
+        """
+        Ends the subscription. Events already received can still be iterated over.
+        """
+        if self.__done:
+            return
+        subscription_id = self.id
+        self._finish()
+        if subscription_id is not None:
+            await self.client._send_request(self.unsubscribe_method, [subscription_id])
+
+    def __aiter__(self):
+        if self.callback is not None:
+            raise Exception("This subscription delivers its events to its callback.")
+        return self
+
+    async def __anext__(self) -> Any:
+        while True:
+            if not self.__queue.empty():
+                return self.__queue.get_nowait()
+            if self.__done:
+                if self.error is not None:
+                    raise self.error
+                raise StopAsyncIteration
+            self.__changed.clear()
+            await self.__changed.wait()
+
+
+class SubscriptionClient:
+
+    def __init__(
+        self,
+        resource,
+        url: Optional[str] = None,
+        max_queue: int = 1000,
+        overflow: Overflow = Overflow.BLOCK,
+        reconnect_delay: float = 1,
+        max_reconnect_delay: float = 30,
+        heartbeat: Optional[float] = 30
+    ):
+        """
+        Subscribes to the account changes, signature statuses and slots of a chain over a persistent WebSocket to its
+        RPC endpoint, instead of polling `get_balance` or `get_solana_transaction`.
+
+        The connection is opened on the first subscription. When it drops, the client reconnects with exponential
+        backoff and subscribes again to every active subscription. Events sent while it was disconnected are lost.
+
+        Each subscription delivers its events to a callback, which may be a coroutine function, or queues them for
+        `async for`. When a queue is full, `overflow` decides whether to stop reading from the connection until it has
+        room (backpressure) or to drop the oldest event.
+
+        The client is asyncio only, like `aiohttp`: there is no sync version. From sync code, run it on an event loop
+        in a thread of its own.
+
+        :param resource: The `AsyncBlockchainAPIResource` of the chain. Its transport and API key are used
+        :param url: OPTIONAL: The WebSocket URL. Defaults to `resource.get_rpc_websocket_url()`
+        :param max_queue: The maximum number of events queued per subscription
+        :param overflow: What to do when a subscription's queue is full
+        :param reconnect_delay: The number of seconds to wait before the first reconnection attempt
+        :param max_reconnect_delay: The maximum number of seconds between reconnection attempts
+        :param heartbeat: OPTIONAL: The interval, in seconds, of the pings that detect a dead connection
+        """
+        if aiohttp is None:
+            raise Exception("`SubscriptionClient` requires `aiohttp`. Install it with `pip install aiohttp`.")
+        if not isinstance(max_queue, int) or max_queue < 1:
+            raise Exception("`max_queue` must be an integer greater than or equal to 1.")
+        if not isinstance(overflow, Overflow):
+            raise Exception(
+                "`overflow` must be an instance of `Overflow`. "
+                "See `from theblockchainapi.subscriptions import Overflow`."
+            )
+        if reconnect_delay <= 0 or max_reconnect_delay < reconnect_delay:
+            raise Exception("`reconnect_delay` must be greater than 0 and at most `max_reconnect_delay`.")
+
+        self.resource = resource
+        self.url = url if url is not None else resource.get_rpc_websocket_url()
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.heartbeat = heartbeat
+        self.connects = 0
+        self.last_error: Optional[BaseException] = None
+
+        self.__subscriptions: Set[Subscription] = set()
+        self.__by_id: Dict[Any, Subscription] = dict()
+        self.__requests: Dict[int, Optional[Subscription]] = dict()
+        self.__ids = itertools.count(1)
+        self.__ws = None
+        self.__task: Optional[asyncio.Task] = None
+        self.__closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self.__ws is not None
+
+    async def subscribe(
+        self,
+        method: str,
+        params: list,
+        unsubscribe_method: str,
+        callback: Optional[Callable[[Any], Any]] = None,
+        once: bool = False
+    ) -> Subscription:
+        """
+        Subscribes with any JSON-RPC subscription method, e.g.
+        `await client.subscribe('eth_subscribe', ['newHeads'], 'eth_unsubscribe')`.
+
+        :param method: The subscription method
+        :param params: Its parameters
+        :param unsubscribe_method: The method that ends the subscription
+        :param callback: OPTIONAL: Called with every event, instead of queueing it for `async for`
+        :param once: Whether the node ends the subscription after its first event
+        :return: The subscription, once the node has accepted it. Raises an `RPCError` if it refused it, or an
+        `APIConnectionError` if the connection could not be opened
+        """
+        if self.__closed:
+            raise Exception("This `SubscriptionClient` has been closed.")
+        subscription = Subscription(self, method, params, unsubscribe_method, callback=callback, once=once)
+        self.__subscriptions.add(subscription)
+        if self.__task is None:
+            self.__task = asyncio.ensure_future(self.__run())
+        elif self.__ws is not None:
+            await self.__subscribe(subscription)
+        await subscription.wait_subscribed()
+        return subscription
+
+    async def account_subscribe(
+        self,
+        public_key: str,
+        callback: Optional[Callable[[Any], Any]] = None,
+        commitment: Optional[str] = None,
+        encoding: str = 'base64'
+    ) -> Subscription:
+        """
+        Subscribes to the changes of a Solana account, e.g. of its balance.
+        """
+        config = {'encoding': encoding}
+        if commitment is not None:
+            config['commitment'] = commitment
+        return await self.subscribe('accountSubscribe', [public_key, config], 'accountUnsubscribe', callback=callback)
+
+    async def signature_subscribe(
+        self,
+        signature: str,
+        callback: Optional[Callable[[Any], Any]] = None,
+        commitment: Optional[str] = None
+    ) -> Subscription:
+        """
+        Subscribes to the confirmation of a Solana transaction. The subscription ends after its one event.
+        """
+        params = [signature] if commitment is None else [signature, {'commitment': commitment}]
+        return await self.subscribe(
+            'signatureSubscribe', params, 'signatureUnsubscribe', callback=callback, once=True
+        )
+
+    async def slot_subscribe(self, callback: Optional[Callable[[Any], Any]] = None) -> Subscription:
+        """
+        Subscribes to the slots processed by the Solana node.
+        """
+        return await self.subscribe('slotSubscribe', [], 'slotUnsubscribe', callback=callback)
+
+    def _discard(self, subscription: Subscription):
+        self.__subscriptions.discard(subscription)
+        if self.__by_id.get(subscription.id) is subscription:
+            del self.__by_id[subscription.id]
+
+    async def _send_request(self, method: str, params: list, subscription: Optional[Subscription] = None):
+        ws = self.__ws
+        if ws is None:
+            return
+        request_id = next(self.__ids)
+        self.__requests[request_id] = subscription
+        try:
+            await ws.send_str(json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params}))
+        except (aiohttp.ClientError, ConnectionError):
+            # The connection dropped: the subscription is sent again once reconnected.
+            self.__requests.pop(request_id, None)
+
+    async def __subscribe(self, subscription: Subscription):
+        await self._send_request(subscription.method, subscription.params, subscription)
+
+    async def __run(self):
+        delay = self.reconnect_delay
+        while not self.__closed:
+            try:
+                ws = await self.resource._transport.ws_connect(
+                    self.url, headers=self.resource._get_headers(), heartbeat=self.heartbeat
+                )
+            except (aiohttp.ClientError, OSError, asyncio.TimeoutError) as e:
+                self.last_error = APIConnectionError(f"Could not connect to `{self.url}`: {e}", endpoint=self.url)
+                # Subscriptions waiting for their first acceptance fail instead of waiting for a reconnection, which
+                # may never succeed. Those accepted before are subscribed again once reconnected.
+                for subscription in list(self.__subscriptions):
+                    if not subscription.subscribed:
+                        subscription._finish(self.last_error)
+            else:
+                self.__ws = ws
+                self.connects += 1
+                delay = self.reconnect_delay
+                try:
+                    for subscription in list(self.__subscriptions):
+                        await self.__subscribe(subscription)
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            await self.__handle(json.loads(message.data))
+                        elif message.type == aiohttp.WSMsgType.ERROR:
+                            self.last_error = APIConnectionError(str(ws.exception()), endpoint=self.url)
+                            break
+                finally:
+                    self.__ws = None
+                    self.__requests.clear()
+                    self.__by_id.clear()
+                    await ws.close()
+            if self.__closed:
+                break
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def __handle(self, message: Any):
+        if isinstance(message, list):
+            for item in message:
+                await self.__handle(item)
+            return
+        if not isinstance(message, dict):
+            return
+        if 'id' in message and message['id'] in self.__requests:
+            subscription = self.__requests.pop(message['id'])
+            if subscription is None or subscription.done:
+                return
+            error = message.get('error')
+            if error is not None:
+                subscription._finish(RPCError(
+                    str(error.get('message', 'Unknown error')) if isinstance(error, dict) else str(error),
+                    code=error.get('code') if isinstance(error, dict) else None,
+                    endpoint=self.url
+                ))
+            else:
+                self.__by_id[message.get('result')] = subscription
+                subscription._confirm(message.get('result'))
+            return
+        params = message.get('params')
+        if isinstance(params, dict) and 'subscription' in params:
+            subscription = self.__by_id.get(params['subscription'])
+            if subscription is not None and not subscription.done:
+                await subscription._deliver(params.get('result'))
+
+    async def close(self):
+        """
+        Ends every subscription and closes the connection.
+        """
+        self.__closed = True
+        for subscription in list(self.__subscriptions):
+            subscription._finish()
+        if self.__task is not None:
+            self.__task.cancel()
+            await asyncio.gather(self.__task, return_exceptions=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,60 @@
+import fnmatch
+from typing import Dict, Optional, Tuple
+
+
+class TimeoutPolicy:
+
+    def __init__(
+        self,
+        connect: Optional[float] = 10,
+        read: Optional[float] = 300,
+        deadline: Optional[float] = None,
+        deadlines: Optional[Dict[str, Optional[float]]] = None
+    ):
+        """
+        How long requests may take.
+
+        `connect` and `read` bound every attempt: `connect` the time to establish a connection, and `read` the time
+        to wait for the server between bytes. A deadline bounds a whole call, including rate limiting, retries and
+        backoff: every attempt's timeouts are shortened to fit in what remains of it, and the call raises a
+        `DeadlineExceededError` once it is spent. Async resources also cut an attempt off when the deadline is
+        reached.
+
+        A deadline can be given per call with the `deadline=` keyword argument of any API method, e.g.
+        `resource.get_balance(public_key, deadline=2)`, which overrides the defaults below.
+
+        :param connect: The connect timeout of every attempt, in seconds. `None` waits indefinitely
+        :param read: The read timeout of every attempt, in seconds. The API allows at most 300. `None` waits
+        indefinitely
+        :param deadline: OPTIONAL: The default deadline of every call, in seconds. Calls have no deadline by default
+        :param deadlines: OPTIONAL: The default deadline per API method, as `{method name pattern: seconds}`, e.g.
+        `{'get_balance': 2, 'get_*': 10, 'deploy_project': None}`. Patterns are shell-style and the first matching
+        pattern wins. `None` means no deadline.
+        """
+        for name, value in (('connect', connect), ('read', read), ('deadline', deadline)):
+            if value is not None and (not isinstance(value, (int, float)) or value <= 0):
+                raise Exception(f"`{name}` must be a number of seconds greater than 0.")
+        if read is not None and read > 300:
+            raise Exception("`read` must be at most 300 seconds.")
+        if deadlines is not None and not isinstance(deadlines, dict):
+            raise Exception("`deadlines` must be a `dict` mapping a method name pattern to a number of seconds.")
+
+        self.connect = connect
+        self.read = read
+        self.deadline = deadline
+        self.deadlines = dict(deadlines or dict())
+
+    def get_timeout(self) -> Tuple[Optional[float], Optional[float]]:
+        """
+        :return: The `(connect, read)` timeout of an attempt, as `requests` takes it
+        """
+        return self.connect, self.read
+
+    def get_deadline(self, method_name: str) -> Optional[float]:
+        """
+        :return: The default deadline of the API method `method_name`, in seconds, or `None` if it has none
+        """
+        for pattern, deadline in self.deadlines.items():
+            if fnmatch.fnmatchcase(method_name, pattern):
+                return deadline
+        return self.deadline
@@ -0,0 +1,248 @@
+import asyncio
+import datetime
+import threading
+import time
+from typing import Optional, Union
+
+import requests
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class HTTPTransport:
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: Union[int, Retry] = 0,
+        pool_block: bool = False
+    ):
+        """
+        A keep-alive HTTP transport backed by a pooled `requests.Session`.
+
+        One transport can be shared by any number of resources (e.g. a `SolanaAPIResource` and a
+        `BlockchainAPIResource`), so that they all reuse the same TCP+TLS connections to the API.
+
+        Use it as a context manager, or call `close()`, to release the pooled connections.
+
+        :param pool_connections: The number of per-host connection pools to cache
+        :param pool_maxsize: The maximum number of connections kept alive per host
+        :param max_retries: Retries performed by the HTTP adapter on connection failures. Either an `int` or a
+        `urllib3.util.retry.Retry` instance
+        :param pool_block: Whether to block when all `pool_maxsize` connections of a host are in use, instead of
+        opening a connection that is discarded after use
+        """
+        if not isinstance(pool_connections, int) or pool_connections < 1:
+            raise Exception("`pool_connections` must be an integer greater than or equal to 1.")
+        if not isinstance(pool_maxsize, int) or pool_maxsize < 1:
+            raise Exception("`pool_maxsize` must be an integer greater than or equal to 1.")
+        if not isinstance(max_retries, (int, Retry)):
+            raise Exception("`max_retries` must be an integer or an instance of `urllib3.util.retry.Retry`.")
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.pool_block = pool_block
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block
+        )
+        self.session = requests.Session()
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.__lock = threading.Lock()
+        self.__closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    def request(self, **kwargs) -> Response:
+        """
+        Sends a request over the pooled session. Accepts the same arguments as `requests.request`.
+        """
+        if self.__closed:
+            raise Exception("This `HTTPTransport` has been closed.")
+        return self.session.request(**kwargs)
+
+    def close(self):
+        """
+        Closes every pooled connection. The transport cannot be used afterwards.
+        """
+        with self.__lock:
+            if self.__closed:
+                return
+            self.__closed = True
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class AsyncHTTPTransport:
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 15.0
+    ):
+        """
+        The asyncio counterpart of `HTTPTransport`, backed by a pooled `aiohttp.ClientSession`. Requires `aiohttp`
+        (`pip install aiohttp`).
+
+        The session is created lazily on first use and is bound to that event loop, so share a transport only
+        between resources used from the same loop. Use it as an async context manager, or await `close()`.
+
+        :param limit: The maximum number of simultaneous connections
+        :param limit_per_host: The maximum number of simultaneous connections per host
+        :param keepalive_timeout: How long, in seconds, an idle connection is kept alive
+        """
+        if aiohttp is None:
+            raise Exception("`AsyncHTTPTransport` requires `aiohttp`. Install it with `pip install aiohttp`.")
+        if not isinstance(limit, int) or limit < 1:
+            raise Exception("`limit` must be an integer greater than or equal to 1.")
+        if not isinstance(limit_per_host, int) or limit_per_host < 1:
+            raise Exception("`limit_per_host` must be an integer greater than or equal to 1.")
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+
+        self.__session = None
+        self.__closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self.__closed
+
+    def __get_session(self):
+        if self.__closed:
+            raise Exception("This `AsyncHTTPTransport` has been closed.")
+        if self.__session is None:
+            self.__session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.limit,
+                    limit_per_host=self.limit_per_host,
+                    keepalive_timeout=self.keepalive_timeout
+                )
+            )
+        return self.__session
+
+    @staticmethod
+    def _get_client_timeout(timeout):
+        """
+        Translates a `requests` timeout (seconds, or a `(connect, read)` tuple) into an `aiohttp.ClientTimeout`.
+        """
+        if timeout is None:
+            return aiohttp.ClientTimeout(total=None)
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+        else:
+            connect, read = timeout, timeout
+        return aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        timeout=None,
+        data=None,
+        params: dict = None,
+        files: dict = None,
+        stream: bool = False
+    ) -> Response:
+        """
+        Sends a request over the pooled session. Accepts the same arguments as `HTTPTransport.request` and returns a
+        `requests.Response` with its body already read, so response handling is shared with the sync client.
+
+        With `stream=True`, the body is left unread: read it from `response.raw`, the `aiohttp.ClientResponse`, and
+        call `response.close()` when done.
+
+        For the same reason, connection failures and timeouts are raised as `requests.ConnectionError` and
+        `requests.Timeout`.
+        """
+        session = self.__get_session()
+
+        if params is not None:
+            # `requests` sends `True` as "True"; aiohttp refuses non-string query values.
+            params = {key: value if isinstance(value, str) else str(value) for key, value in params.items()}
+        if files is not None:
+            form = aiohttp.FormData(data or dict())
+            for name, file in files.items():
+                form.add_field(name, file)
+            data = form
+
+        start = time.monotonic()
+        try:
+            r = await session.request(
+                method=method,
+                url=url,
+                headers=headers,
+                data=data,
+                params=params,
+                timeout=self._get_client_timeout(timeout)
+            )
+            elapsed = time.monotonic() - start
+            if stream:
+                content = False
+            else:
+                async with r:
+                    content = await r.read()
+        except asyncio.TimeoutError as e:
+            raise requests.Timeout(str(e) or "The request timed out.") from e
+        except aiohttp.ClientConnectionError as e:
+            raise requests.ConnectionError(str(e)) from e
+
+        response = Response()
+        response.status_code = r.status
+        response.reason = r.reason
+        response.headers = CaseInsensitiveDict(r.headers)
+        response.url = str(r.url)
+        # As with `requests`, the time until the headers arrived.
+        response.elapsed = datetime.timedelta(seconds=elapsed)
+        response.raw = r
+        response._content = content
+        response.encoding = r.charset
+        return response
+
+    async def ws_connect(self, url: str, headers: dict = None, heartbeat: Optional[float] = None):
+        """
+        Opens a WebSocket over the pooled session.
+        :param heartbeat: OPTIONAL: The interval, in seconds, of the pings that detect a dead connection
+        :return: An `aiohttp.ClientWebSocketResponse`. Close it when done
+        """
+        session = self.__get_session()
+        return await session.ws_connect(url, headers=headers, heartbeat=heartbeat)
+
+    async def close(self):
+        """
+        Closes every pooled connection. The transport cannot be used afterwards.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        if self.__session is not None:
+            await self.__session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,177 @@
+import decimal
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Iterable, Tuple, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+# The number of decimals of each unit, relative to the smallest unit of its chain, by chain.
+_UNITS = {
+    'lamport': ('solana', 0),
+    'sol': ('solana', 9),
+    'wei': ('ethereum', 0),
+    'gwei': ('ethereum', 9),
+    'ether': ('ethereum', 18)
+}
+
+# Scaling by a power of ten is exact at any precision. `Inexact` is trapped in case that ever stops being true.
+_CONTEXT = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN, traps=[
+    decimal.Inexact, decimal.InvalidOperation
+])
+_ONE = Decimal(1)
+
+Unit = Union[Enum, str]
+Amount = Union[int, str, Decimal]
+
+
+def _get_unit(unit: Unit) -> Tuple[str, int]:
+    value = unit.value if isinstance(unit, Enum) else unit
+    if value not in _UNITS:
+        raise Exception(
+            f"Unknown unit `{unit}`. Use a `SolanaCurrencyUnit` or a `CurrencyUnit`, e.g. "
+            f"`CurrencyUnit.EthereumCurrencyUnit.GWEI`, or one of {', '.join(f'`{name}`' for name in _UNITS)}."
+        )
+    return _UNITS[value]
+
+
+def get_decimals(unit: Unit) -> int:
+    """
+    :param unit: e.g. `SolanaCurrencyUnit.SOL` or `'gwei'`
+    :return: The number of decimals of the unit, i.e. the power of ten of the smallest unit of its chain it is worth,
+    e.g. 9 for SOL and 18 for ether
+    """
+    return _get_unit(unit)[1]
+
+
+def _get_shift(from_unit: Unit, to_unit: Unit) -> int:
+    from_chain, from_decimals = _get_unit(from_unit)
+    to_chain, to_decimals = _get_unit(to_unit)
+    if from_chain != to_chain:
+        raise Exception(f"Cannot convert from `{from_unit}` to `{to_unit}`, which are units of different chains.")
+    return from_decimals - to_decimals
+
+
+def _to_decimal(amount: Any) -> Decimal:
+    if isinstance(amount, (bool, float)) or (numpy is not None and isinstance(amount, numpy.floating)):
+        raise Exception(
+            "`amount` must be an `int`, a `str` or a `Decimal`, not a float, which cannot hold every amount exactly."
+        )
+    if isinstance(amount, Decimal):
+        result = amount
+    elif isinstance(amount, str):
+        try:
+            result = Decimal(amount)
+        except decimal.InvalidOperation:
+            raise Exception(f"`{amount}` is not a number.")
+    else:
+        # `int`, or a NumPy integer
+        result = Decimal(int(amount))
+    if not result.is_finite():
+        raise Exception(f"`amount` must be finite, got `{amount}`.")
+    return result
+
+
+def _convert(amount: Any, shift: int, integral: bool) -> Union[int, Decimal]:
+    if shift == 0 and isinstance(amount, int) and not isinstance(amount, bool):
+        return amount
+    result = _to_decimal(amount).scaleb(shift, context=_CONTEXT)
+    if not integral:
+        if result.as_tuple().exponent > 0:
+            # e.g. `1E+9` gwei for 1 ether
+            result = result.quantize(_ONE, context=_CONTEXT)
+        return result
+    if result != result.to_integral_value():
+        raise Exception(f"`{amount}` is not a whole number of the smallest unit.")
+    return int(result)
+
+
+def convert(amount: Amount, from_unit: Unit, to_unit: Unit) -> Union[int, Decimal]:
+    """
+    Converts an amount between two units of the same chain exactly, with integers and `Decimal`s only, e.g.
+    `convert(1500000000, SolanaCurrencyUnit.LAMPORT, SolanaCurrencyUnit.SOL)` is `Decimal('1.5')`. Fetch balances in
+    the smallest unit, lamports or wei, to get every other unit without another request.
+
+    :param amount: An `int`, a `str` such as `'1.5'`, or a `Decimal`. Floats are refused, since they round
+    :param from_unit: The unit of `amount`. A `SolanaCurrencyUnit`, a `CurrencyUnit` or its value, e.g. `'sol'`
+    :param to_unit: The unit to convert to
+    :return: An `int` when converting to the smallest unit of the chain, otherwise a `Decimal`. Raises if `amount`
+    is not a whole number of the smallest unit
+    """
+    shift = _get_shift(from_unit, to_unit)
+    return _convert(amount, shift, integral=get_decimals(to_unit) == 0)
+
+
+def to_base_units(amount: Amount, unit: Unit) -> int:
+    """
+    :return: `amount` in the smallest unit of the chain of `unit`, e.g. lamports for `sol`
+    """
+    return _convert(amount, get_decimals(unit), integral=True)
+
+
+def from_base_units(amount: Union[int, str], unit: Unit) -> Decimal:
+    """
+    :param amount: An amount in the smallest unit of the chain of `unit`, e.g. lamports for `sol`
+    :return: `amount` in `unit`
+    """
+    return _convert(amount, -get_decimals(unit), integral=False)
+
+
+def convert_many(amounts: Union[Iterable[Amount], 'numpy.ndarray'], from_unit: Unit, to_unit: Unit):
+    """
+    Converts many amounts at once, exactly, e.g. raw balances fetched in lamports or wei.
+
+    NumPy arrays of integers (`numpy` is optional) are converted without a Python loop when the result is a whole
+    number of the smallest unit and fits in their dtype; otherwise the result is an `object` array of `int`s or
+    `Decimal`s. To stay vectorized when converting to a larger unit, see `split_base_units`.
+
+    :param amounts: A list or other iterable of amounts, or a NumPy array
+    :param from_unit: The unit of `amounts`
+    :param to_unit: The unit to convert to
+    :return: A list of the converted amounts, or a NumPy array for a NumPy array
+    """
+    shift = _get_shift(from_unit, to_unit)
+    integral = get_decimals(to_unit) == 0
+    if numpy is None or not isinstance(amounts, numpy.ndarray):
+        return [_convert(amount, shift, integral) for amount in amounts]
+
+    if numpy.issubdtype(amounts.dtype, numpy.floating):
+        raise Exception("`amounts` must not be an array of floats, which cannot hold every amount exactly.")
+    if numpy.issubdtype(amounts.dtype, numpy.integer) and shift >= 0:
+        if shift == 0:
+            return amounts.copy()
+        factor = 10 ** shift
+        limits = numpy.iinfo(amounts.dtype)
+        if amounts.size == 0 or (
+            int(amounts.max()) <= limits.max // factor and int(amounts.min()) >= -(-limits.min // factor)
+        ):
+            return amounts * amounts.dtype.type(factor)
+        # Would overflow the dtype: Python integers do not.
+        return amounts.astype(object) * factor
+    result = numpy.empty(amounts.shape, dtype=object)
+    result.flat = [_convert(amount, shift, integral) for amount in amounts.flat]
+    return result
+
+
+def split_base_units(amounts: 'numpy.ndarray', unit: Unit) -> Tuple['numpy.ndarray', 'numpy.ndarray']:
+    """
+    Splits raw amounts in the smallest unit of a chain into a whole number of `unit` and the remainder, as two
+    integer arrays, without a Python loop, e.g. `[2500000000]` lamports into `[2]` SOL and `[500000000]` lamports.
+    `whole + remainder / 10 ** get_decimals(unit)` is the exact amount in `unit`.
+
+    :param amounts: A NumPy array of integers
+    :param unit: e.g. `SolanaCurrencyUnit.SOL`
+    :return: The `(whole, remainder)` arrays. For negative amounts, `whole` is rounded down and `remainder` is
+    positive
+    """
+    if numpy is None:
+        raise Exception("`split_base_units` requires `numpy`. Install it with `pip install numpy`.")
+    if not isinstance(amounts, numpy.ndarray) or not numpy.issubdtype(amounts.dtype, numpy.integer):
+        raise Exception("`amounts` must be a NumPy array of integers.")
+    factor = 10 ** get_decimals(unit)
+    if factor > numpy.iinfo(amounts.dtype).max:
+        raise Exception(f"`amounts` must be of a dtype that can hold {factor}, e.g. `numpy.int64`.")
+    return numpy.divmod(amounts, amounts.dtype.type(factor))